@@ -0,0 +1,183 @@
+"""Инкрементальная агрегация тренировок по пользователям и видам.
+
+Для каждой пары (пользователь, вид тренировки) хранится кольцо дневных
+корзин за последние `window_days` дней и итоги за всё время. Добавление
+тренировки и запрос итогов за день или окно не зависят от объёма истории.
+Состояние сохраняется в JSON, чтобы после перезапуска не пересчитывать
+всю историю: достаточно дочитать пакеты новее `last_timestamp`.
+"""
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from homework import InfoMessage
+
+SECONDS_IN_DAY: int = 86400
+DEFAULT_WINDOW_DAYS: int = 7
+SNAPSHOT_VERSION: int = 1
+
+# count, distance, duration, calories, speed * duration
+_COUNT, _DISTANCE, _DURATION, _CALORIES, _WEIGHTED_SPEED = range(5)
+_DAY = 5  # номер дня, к которому относится корзина
+
+
+class Totals(NamedTuple):
+    """Итоги по тренировкам за период."""
+    count: int
+    distance: float
+    duration: float
+    calories: float
+    mean_speed: float  # средняя скорость, взвешенная по длительности
+
+
+def _totals(values: List[float]) -> Totals:
+    duration = values[_DURATION]
+    mean_speed = values[_WEIGHTED_SPEED] / duration if duration else 0.0
+    return Totals(int(values[_COUNT]), values[_DISTANCE], duration,
+                  values[_CALORIES], mean_speed)
+
+
+class _Series():
+    """Корзины одного пользователя и вида тренировки."""
+
+    def __init__(self, window_days: int) -> None:
+        self.total = [0, 0.0, 0.0, 0.0, 0.0]
+        self.buckets = [[0, 0.0, 0.0, 0.0, 0.0, None]
+                        for _ in range(window_days)]
+
+    def add(self, day: int, values: Tuple[float, ...]) -> None:
+        total = self.total
+        for index, value in enumerate(values):
+            total[index] += value
+        bucket = self.buckets[day % len(self.buckets)]
+        if bucket[_DAY] != day:
+            if bucket[_DAY] is not None and bucket[_DAY] > day:
+                return  # тренировка старше окна учитывается только в итогах
+            bucket[:] = [0, 0.0, 0.0, 0.0, 0.0, day]
+        for index, value in enumerate(values):
+            bucket[index] += value
+
+    def window(self, first_day: int, last_day: int) -> List[float]:
+        result = [0, 0.0, 0.0, 0.0, 0.0]
+        for bucket in self.buckets:
+            day = bucket[_DAY]
+            if day is not None and first_day <= day <= last_day:
+                for index in range(_DAY):
+                    result[index] += bucket[index]
+        return result
+
+
+class WorkoutAggregator():
+    """Скользящие итоги тренировок по пользователям и видам тренировок."""
+
+    def __init__(self, window_days: int = DEFAULT_WINDOW_DAYS) -> None:
+        if window_days < 1:
+            raise ValueError('Окно агрегации должно быть не меньше дня.')
+        self.window_days = window_days
+        self.last_timestamp: Optional[float] = None
+        # пользователь -> вид тренировки -> корзины
+        self._series: Dict[str, Dict[str, _Series]] = {}
+
+    def add_row(self, user: str, timestamp: float,
+                row: Tuple[str, float, float, float, float]) -> None:
+        """Учесть тренировку в виде строки `report.Row`."""
+        training_type, duration, distance, speed, calories = row
+        user_series = self._series.get(user)
+        if user_series is None:
+            user_series = self._series[user] = {}
+        series = user_series.get(training_type)
+        if series is None:
+            series = user_series[training_type] = _Series(self.window_days)
+        series.add(int(timestamp // SECONDS_IN_DAY),
+                   (1, distance, duration, calories, speed * duration))
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+    def add(self, user: str, timestamp: float, info: InfoMessage) -> None:
+        """Учесть результат `show_training_info()`."""
+        self.add_row(user, timestamp, (info.training_type, info.duration,
+                                       info.distance, info.speed,
+                                       info.calories))
+
+    def add_rows(self, rows: Iterable[Tuple[str, float, Tuple]]) -> None:
+        """Учесть поток `(user, timestamp, row)`, например из `batch`."""
+        for user, timestamp, row in rows:
+            self.add_row(user, timestamp, row)
+
+    def _select(self, user: str,
+                training_type: Optional[str]) -> List[_Series]:
+        user_series = self._series.get(user, {})
+        if training_type is None:
+            return list(user_series.values())
+        series = user_series.get(training_type)
+        return [] if series is None else [series]
+
+    def total(self, user: str,
+              training_type: Optional[str] = None) -> Totals:
+        """Итоги за всё время; без `training_type` - по всем видам."""
+        result = [0, 0.0, 0.0, 0.0, 0.0]
+        for series in self._select(user, training_type):
+            for index, value in enumerate(series.total):
+                result[index] += value
+        return _totals(result)
+
+    def window(self, user: str, timestamp: float, days: int = 0,
+               training_type: Optional[str] = None) -> Totals:
+        """Итоги за `days` дней, заканчивающихся днём `timestamp`.
+
+        По умолчанию берётся всё окно `window_days`.
+        """
+        days = days or self.window_days
+        if not 1 <= days <= self.window_days:
+            raise ValueError(f'Период должен быть от 1 до '
+                             f'{self.window_days} дней.')
+        last_day = int(timestamp // SECONDS_IN_DAY)
+        result = [0, 0.0, 0.0, 0.0, 0.0]
+        for series in self._select(user, training_type):
+            values = series.window(last_day - days + 1, last_day)
+            for index, value in enumerate(values):
+                result[index] += value
+        return _totals(result)
+
+    def daily(self, user: str, timestamp: float,
+              training_type: Optional[str] = None) -> Totals:
+        """Итоги за день, в который попадает `timestamp`."""
+        return self.window(user, timestamp, 1, training_type)
+
+    def save(self, path: str) -> None:
+        """Атомарно сохранить состояние в JSON-файл."""
+        state = {
+            'version': SNAPSHOT_VERSION,
+            'window_days': self.window_days,
+            'last_timestamp': self.last_timestamp,
+            'series': [[user, training_type, series.total, series.buckets]
+                       for user, user_series in self._series.items()
+                       for training_type, series in user_series.items()],
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        descriptor, temporary = tempfile.mkstemp(dir=directory,
+                                                 suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as output:
+                json.dump(state, output)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> 'WorkoutAggregator':
+        """Восстановить состояние из файла, сохранённого `save`."""
+        with open(path, encoding='utf-8') as source:
+            state: Dict[str, Any] = json.load(source)
+        if state.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f'Неподдерживаемая версия снимка в {path}.')
+        aggregator = cls(state['window_days'])
+        aggregator.last_timestamp = state['last_timestamp']
+        for user, training_type, total, buckets in state['series']:
+            series = _Series(aggregator.window_days)
+            series.total = total
+            series.buckets = buckets
+            aggregator._series.setdefault(user, {})[training_type] = series
+        return aggregator
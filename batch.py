@@ -0,0 +1,97 @@
+"""Пакетный (колоночный) расчёт показателей тренировок на NumPy."""
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from homework import WORKOUT_TYPES, Kernel, Training
+
+
+class BatchResult(NamedTuple):
+    """Результат пакетного расчёта: массивы в порядке входных пакетов."""
+    distance: np.ndarray
+    speed: np.ndarray
+    calories: np.ndarray
+
+
+def batch_formulas() -> Dict[str, Tuple[Kernel, int]]:
+    """Код тренировки: (ядро расчёта, количество дополнительных полей).
+
+    Берутся зарегистрированные тренировки, которые считают показатели
+    ядром (`uses_kernel`), поэтому пакетный и скалярный расчёт используют
+    одни и те же ядра. Ядра берутся при каждом вызове и следуют за
+    изменениями классов.
+    """
+    return {code: (cls.kernel, len(cls.FIELDS) - len(Training.FIELDS))
+            for code, cls in WORKOUT_TYPES.items() if cls.uses_kernel}
+
+
+def compute_batch(workout_types: Sequence[str],
+                  actions: Sequence[float],
+                  durations: Sequence[float],
+                  weights: Sequence[float],
+                  *extra: Sequence[float]) -> BatchResult:
+    """Рассчитать дистанцию, скорость и калории для массива пакетов.
+
+    Пакеты группируются по коду тренировки, и для каждой группы
+    вызывается то же ядро `kernel`, что и в классах `Training`, поэтому
+    результат побитово совпадает со скалярным.
+    В `extra` передаются колонки дополнительных полей: рост для `WLK`,
+    длина и количество бассейнов для `SWM`. Для строк, где поле не нужно,
+    значение колонки игнорируется. Нулевая длительность или рост дают
+    `inf`/`nan` вместо `ZeroDivisionError`.
+    """
+    codes = np.asarray(workout_types)
+    columns = [np.asarray(column, dtype=np.float64)
+               for column in (actions, durations, weights, *extra)]
+    size = codes.shape[0]
+    distance = np.empty(size, dtype=np.float64)
+    speed = np.empty(size, dtype=np.float64)
+    calories = np.empty(size, dtype=np.float64)
+
+    matched = np.zeros(size, dtype=bool)
+    for code, (kernel, extra_count) in batch_formulas().items():
+        mask = codes == code
+        if not mask.any():
+            continue
+        if len(extra) < extra_count:
+            raise ValueError(f'Для тренировки "{code}" требуется '
+                             f'{extra_count} дополнительных колонок.')
+        index = np.flatnonzero(mask)
+        group = [column[index] for column in columns[:3 + extra_count]]
+        (distance[index], speed[index],
+         calories[index]) = kernel(*group)
+        matched |= mask
+
+    if not matched.all():
+        unknown = codes[np.argmin(matched)]
+        raise ValueError(f'Данный тип тренировки "{unknown}"'
+                         ' не поддерживается.')
+    return BatchResult(distance, speed, calories)
+
+
+def packages_to_columns(
+        packages: Iterable[Tuple[str, List[Any]]]) -> List[List[Any]]:
+    """Разложить пакеты `(workout_type, data)` по колонкам.
+
+    Колонок полей столько, сколько `FIELDS` у самой длинной
+    зарегистрированной тренировки; поля, которых у типа нет, заполняются
+    нулями. Число полей пакета зарегистрированного типа должно совпадать
+    с его `FIELDS`, иначе выбрасывается `TypeError`; неизвестные коды
+    пропускаются до `compute_batch`.
+    """
+    arities = {code: len(cls.FIELDS) for code, cls in WORKOUT_TYPES.items()}
+    width = max(arities.values())
+    workout_types: List[str] = []
+    fields: List[List[float]] = [[] for _ in range(width)]
+    for workout_type, data in packages:
+        arity = arities.get(workout_type, len(data))
+        if len(data) != arity:
+            raise TypeError(f'Пакет тренировки "{workout_type}" должен '
+                            f'содержать {arity} полей, получено '
+                            f'{len(data)}.')
+        workout_types.append(workout_type)
+        for column, value in zip(fields, data):
+            column.append(value)
+        for column in fields[len(data):]:
+            column.append(0)
+    return [workout_types, *fields]
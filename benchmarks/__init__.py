@@ -0,0 +1,4 @@
+"""Бенчмарки модуля фитнес-трекера.
+
+Запуск из корня репозитория: `python -m benchmarks.<имя_модуля>`.
+"""
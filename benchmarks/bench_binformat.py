@@ -0,0 +1,41 @@
+"""Текстовый архив с `pipeline` против двоичного архива с `batch`."""
+import argparse
+import io
+import os
+import tempfile
+
+import binformat
+import pipeline
+from benchmarks.common import best_of, generate_packages, package_line
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, 'packages.txt')
+        binary_path = os.path.join(directory, 'packages.bin')
+        with open(text_path, 'w', encoding='utf-8') as output:
+            output.writelines(package_line(*package)
+                              for package in generate_packages(args.count))
+        binformat.write_packages(binary_path, generate_packages(args.count))
+        print(f'размер: текст {os.path.getsize(text_path):,} Б, '
+              f'двоичный {os.path.getsize(binary_path):,} Б')
+
+        def text() -> None:
+            pipeline.process_file(text_path, io.StringIO())
+
+        def binary() -> None:
+            with binformat.PacketReader(binary_path) as reader:
+                reader.compute()
+
+        for name, func in (('text + pipeline', text),
+                           ('mmap + batch', binary)):
+            elapsed = best_of(func, repeat=1)
+            print(f'{name:>16}: {args.count / elapsed:14,.0f} пакетов/с')
+
+
+if __name__ == '__main__':
+    main()
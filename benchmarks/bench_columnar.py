@@ -0,0 +1,59 @@
+"""Загрузка результатов из колоночной выгрузки против разбора текста.
+
+Одни и те же строки записываются текстовым отчётом `report.render_text`
+и через `columnar.write_columns`; затем замеряется, за сколько аналитика
+получает колонку калорий из каждого представления.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import columnar
+import report
+from benchmarks.common import best_of, generate_packages
+from homework import read_packages
+
+
+def parse_text_calories(path: str) -> list:
+    """Вытащить калории из текстового отчёта, как делают сейчас."""
+    with open(path, encoding='utf-8') as source:
+        return [float(line.rsplit(': ', 1)[1].rstrip('.\n'))
+                for line in source]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=1_000_000)
+    parser.add_argument('--row-group-size', type=int,
+                        default=columnar.DEFAULT_ROW_GROUP_SIZE)
+    parser.add_argument('--backend', choices=columnar.BACKENDS)
+    args = parser.parse_args()
+
+    rows = list(report.message_rows(
+        training.show_training_info()
+        for training in read_packages(generate_packages(args.count))))
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, 'report.txt')
+        export_path = os.path.join(directory, 'export')
+        if (args.backend or columnar.default_backend()) == 'arrow':
+            export_path += '.arrow'
+
+        start = time.perf_counter()
+        with open(text_path, 'w', encoding='utf-8') as output:
+            report.write_report(rows, output)
+        print(f'запись текста: {time.perf_counter() - start:8.3f} с')
+        start = time.perf_counter()
+        columnar.write_columns(export_path, rows, args.row_group_size,
+                               args.backend)
+        print(f'запись колонок: {time.perf_counter() - start:7.3f} с')
+
+        elapsed = best_of(lambda: parse_text_calories(text_path), repeat=1)
+        print(f'разбор текста: {elapsed * 1000:10.1f} мс')
+        elapsed = best_of(
+            lambda: float(columnar.read_columns(export_path).calories.sum()))
+        print(f'чтение колонок: {elapsed * 1000:9.1f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Обработка потока с повторно присланными пакетами с `DedupCache` и без.
+
+Повтор - это копия одного из последних `--spread` уникальных пакетов с
+тем же устройством и временем, как при повторной отправке.
+"""
+import argparse
+import random
+from typing import List
+
+from benchmarks.common import best_of, generate_package
+from dedup import DedupCache, Packet
+from homework import read_package
+
+
+def generate_stream(count: int, duplicate_ratio: float, spread: int,
+                    seed: int = 0) -> List[Packet]:
+    """Поток пакетов с долей повторов `duplicate_ratio`."""
+    rnd = random.Random(seed)
+    stream: List[Packet] = []
+    recent: List[Packet] = []
+    for timestamp in range(count):
+        if recent and rnd.random() < duplicate_ratio:
+            workout_type, data, device, sent = rnd.choice(recent)
+            stream.append((workout_type, list(data), device, sent))
+            continue
+        workout_type, data = generate_package(rnd)
+        packet = (workout_type, data, f'device-{rnd.randrange(1000)}',
+                  timestamp)
+        stream.append(packet)
+        recent.append(packet)
+        if len(recent) > spread:
+            recent.pop(0)
+    return stream
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200_000)
+    parser.add_argument('--ratios', type=float, nargs='+',
+                        default=[0.0, 0.2, 0.5, 0.8])
+    parser.add_argument('--spread', type=int, default=100)
+    parser.add_argument('--maxsize', type=int, default=4096)
+    args = parser.parse_args()
+
+    for ratio in args.ratios:
+        stream = generate_stream(args.count, ratio, args.spread)
+
+        def plain() -> None:
+            for workout_type, data, _, _ in stream:
+                read_package(workout_type, data).show_training_info()
+
+        cache = DedupCache(args.maxsize)
+
+        def deduplicated() -> None:
+            cache.clear()
+            for _ in cache.iter_messages(stream):
+                pass
+
+        baseline = best_of(plain) / args.count * 1e9
+        elapsed = best_of(deduplicated) / args.count * 1e9
+        info = cache.info()
+        hit_rate = info['hits'] / (info['hits'] + info['misses'])
+        print(f'повторы {ratio:4.0%}: без кэша {baseline:7.0f} нс/пакет, '
+              f'с кэшем {elapsed:7.0f} нс/пакет, попадания {hit_rate:4.0%}, '
+              f'память {info["memory_bytes"] / 1024:,.0f} КиБ')
+
+
+if __name__ == '__main__':
+    main()
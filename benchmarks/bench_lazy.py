@@ -0,0 +1,33 @@
+"""Экономия `LazyInfoMessage` для потребителей одного поля."""
+import argparse
+
+import homework
+from benchmarks.common import best_of, generate_packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200_000)
+    args = parser.parse_args()
+
+    packages = list(generate_packages(args.count))
+
+    def consumer(method: str, field: str):
+        def run() -> None:
+            for training in homework.read_packages(packages):
+                getattr(getattr(training, method)(), field)
+
+        return run
+
+    # время создания объектов вычитается, чтобы сравнивать только расчёт
+    construct = best_of(lambda: homework.read_packages(packages))
+    for field in ('distance', 'calories'):
+        eager = best_of(consumer('show_training_info', field)) - construct
+        lazy = best_of(consumer('show_lazy_training_info', field)) - construct
+        print(f'только {field:>8}: eager {eager / args.count * 1e9:7.1f} '
+              f'нс, lazy {lazy / args.count * 1e9:7.1f} нс '
+              f'({1 - lazy / eager:.0%} экономии)')
+
+
+if __name__ == '__main__':
+    main()
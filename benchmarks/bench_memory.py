@@ -0,0 +1,53 @@
+"""Сравнение расхода памяти на одну тренировку."""
+import argparse
+import tracemalloc
+from typing import Callable, List
+
+import compact
+import homework
+from benchmarks.common import generate_packages
+
+
+def measure(build: Callable[[], object]) -> int:
+    """Сколько байт удерживает в памяти результат `build`."""
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    result = build()
+    size = sum(stat.size_diff for stat in
+               tracemalloc.take_snapshot().compare_to(snapshot, 'filename'))
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200_000)
+    args = parser.parse_args()
+
+    packages = list(generate_packages(args.count))
+
+    def objects(module) -> Callable[[], List[object]]:
+        classes = {'SWM': module.Swimming, 'WLK': module.SportsWalking,
+                   'RUN': module.Running}
+        return lambda: [classes[workout_type](*data)
+                        for workout_type, data in packages]
+
+    def messages(module) -> Callable[[], List[object]]:
+        return lambda: [module.InfoMessage('Running', data[1], data[0] / 1e3,
+                                           data[0] / 1e4, data[2] * 4.5)
+                        for _, data in packages]
+
+    cases = {
+        'homework.Training': objects(homework),
+        'compact.Training': objects(compact),
+        'compact.TrainingBatch': lambda: compact.TrainingBatch(packages),
+        'homework.InfoMessage': messages(homework),
+        'compact.InfoMessage': messages(compact),
+    }
+    for name, build in cases.items():
+        print(f'{name:>22}: {measure(build) / args.count:8.1f} байт/шт.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Расчёт показателей `homework` в сравнении с исходными классами.
+
+Исходные классы считают показатели цепочкой методов, `homework` -
+функциями, собранными по формулам класса: все показатели сообщения за
+один проход по атрибутам, отдельный показатель - одним вызовом.
+"""
+import argparse
+from typing import Any, Callable, Dict, List, Tuple
+
+import homework
+from benchmarks.common import best_of, generate_packages
+
+
+class LegacyTraining():
+    """Исходная версия `Training` без ядер и кэша показателей."""
+    HOUR_IN_MIN: int = 60
+    LEN_STEP: float = 0.65
+    M_IN_KM: int = 1000
+
+    def __init__(self, action: int, duration: int, weight: int) -> None:
+        self.action = action
+        self.duration = duration
+        self.weight = weight
+
+    def get_distance(self) -> float:
+        return self.action * self.LEN_STEP / self.M_IN_KM
+
+    def get_mean_speed(self) -> float:
+        return self.get_distance() / self.duration
+
+    def show_training_info(self) -> homework.InfoMessage:
+        return homework.InfoMessage(self.__class__.__name__, self.duration,
+                                    self.get_distance(),
+                                    self.get_mean_speed(),
+                                    self.get_spent_calories())
+
+
+class LegacyRunning(LegacyTraining):
+    PHYSICAL_ACTIVITY_COEF: int = 18
+    CALORIE_COEF: int = 20
+
+    def get_spent_calories(self) -> float:
+        return ((self.PHYSICAL_ACTIVITY_COEF * self.get_mean_speed()
+                - self.CALORIE_COEF)
+                * self.weight / self.M_IN_KM * self.duration
+                * self.HOUR_IN_MIN)
+
+
+class LegacySportsWalking(LegacyTraining):
+    ACTIVITY_LEVEL_COEF: float = 0.035
+    TRAINING_COEF: float = 0.029
+
+    def __init__(self, action: int, duration: int, weight: int,
+                 height: int) -> None:
+        super().__init__(action, duration, weight)
+        self.height = height
+
+    def get_spent_calories(self) -> float:
+        return ((self.ACTIVITY_LEVEL_COEF * self.weight
+                + (self.get_mean_speed()**2 // self.height)
+                * self.TRAINING_COEF * self.weight)
+                * self.duration * self.HOUR_IN_MIN)
+
+
+class LegacySwimming(LegacyTraining):
+    PHYSICAL_ACTIVITY_COEF: float = 1.1
+    CALORIE_COEF: int = 2
+    LEN_STEP: float = 1.38
+
+    def __init__(self, action: int, duration: int, weight: int,
+                 length_pool: int, count_pool: int) -> None:
+        super().__init__(action, duration, weight)
+        self.length_pool = length_pool
+        self.count_pool = count_pool
+
+    def get_mean_speed(self) -> float:
+        return ((self.length_pool * self.count_pool) / self.M_IN_KM
+                / self.duration)
+
+    def get_spent_calories(self) -> float:
+        return ((self.get_mean_speed() + self.PHYSICAL_ACTIVITY_COEF)
+                * self.CALORIE_COEF * self.weight)
+
+
+LEGACY_TYPES: Dict[str, type] = {'SWM': LegacySwimming,
+                                 'WLK': LegacySportsWalking,
+                                 'RUN': LegacyRunning}
+
+
+def cases(packages: List[Tuple[str, List[int]]],
+          types: Dict[str, type]) -> Dict[str, Callable[[], Any]]:
+    """Сценарии замера для классов тренировок из `types`."""
+    trainings = [types[t](*d) for t, d in packages]
+
+    def repeated() -> None:
+        for training in trainings:
+            training.get_spent_calories()
+
+    return {
+        'конструктор': lambda: [types[t](*d) for t, d in packages],
+        'новый объект + show_training_info': lambda: [
+            types[t](*d).show_training_info() for t, d in packages],
+        'get_spent_calories': repeated,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    packages = list(generate_packages(args.count))
+    legacy = cases(packages, LEGACY_TYPES)
+    current = cases(packages, homework.WORKOUT_TYPES)
+    for name in legacy:
+        # замеры чередуются, чтобы фоновая нагрузка доставалась обоим
+        before = after = float('inf')
+        for _ in range(args.repeat):
+            before = min(before, best_of(legacy[name], 1))
+            after = min(after, best_of(current[name], 1))
+        before, after = (elapsed / args.count * 1e9
+                         for elapsed in (before, after))
+        print(f'{name:>34}: исходный {before:7.1f} нс, '
+              f'homework {after:7.1f} нс ({before / after:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
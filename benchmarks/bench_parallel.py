@@ -0,0 +1,45 @@
+"""Масштабирование параллельной обработки по числу процессов."""
+import argparse
+import io
+import os
+import tempfile
+
+import parallel
+import pipeline
+from benchmarks.common import best_of, generate_packages, package_line
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200_000)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--workers', type=int, nargs='*')
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    workers = args.workers or sorted({1, 2, 4, cpu_count})
+    with tempfile.NamedTemporaryFile('w', suffix='.txt',
+                                     delete=False) as source:
+        source.writelines(package_line(*package)
+                          for package in generate_packages(args.count))
+    try:
+        def sequential() -> None:
+            pipeline.process_file(source.name, io.StringIO(),
+                                  args.chunk_size)
+
+        elapsed = best_of(sequential, repeat=1)
+        print(f'{"sequential":>12}: {args.count / elapsed:12,.0f} пакетов/с')
+        for count in workers:
+            def run() -> None:
+                parallel.process_file(source.name, io.StringIO(), count,
+                                      args.chunk_size)
+
+            elapsed = best_of(run, repeat=1)
+            print(f'{count:>4} workers: {args.count / elapsed:12,.0f} '
+                  'пакетов/с')
+    finally:
+        os.unlink(source.name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Сравнение диспетчеризации пакетов с исходной `read_package`."""
+import argparse
+from typing import Any, Dict, List, Type
+
+import homework
+from benchmarks.common import best_of, generate_packages
+
+
+def legacy_read_package(workout_type: str, data: List[int]) -> Any:
+    """Исходная версия: словарь типов собирается при каждом вызове."""
+    trainings_type: Dict[str, Type[homework.Training]] = {
+        'SWM': homework.Swimming,
+        'WLK': homework.SportsWalking,
+        'RUN': homework.Running
+    }
+
+    if workout_type in trainings_type:
+        return trainings_type[workout_type](*data)
+
+    raise ValueError(f'Данный тип тренировки "{workout_type}"'
+                     ' не поддерживается.')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=300_000)
+    args = parser.parse_args()
+
+    packages = list(generate_packages(args.count))
+    read_package = homework.read_package
+    cases = {
+        'legacy read_package': lambda: [legacy_read_package(t, d)
+                                        for t, d in packages],
+        'read_package': lambda: [read_package(t, d) for t, d in packages],
+        'read_packages': lambda: homework.read_packages(packages),
+    }
+    for name, func in cases.items():
+        elapsed = best_of(func)
+        print(f'{name:>20}: {elapsed / args.count * 1e9:8.1f} нс/пакет')
+
+
+if __name__ == '__main__':
+    main()
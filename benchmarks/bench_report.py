@@ -0,0 +1,35 @@
+"""Сравнение построчного `print` с пакетным формированием отчёта."""
+import argparse
+import contextlib
+import os
+
+import homework
+import report
+from benchmarks.common import best_of, generate_packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200_000)
+    args = parser.parse_args()
+
+    messages = [training.show_training_info() for training in
+                homework.read_packages(generate_packages(args.count))]
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        def print_each() -> None:
+            with contextlib.redirect_stdout(devnull):
+                for message in messages:
+                    print(message.get_message())
+
+        cases = {'print(get_message())': print_each}
+        for fmt in report.FORMATS:
+            cases[f'write_report({fmt})'] = (
+                lambda fmt=fmt: report.write_report(
+                    report.message_rows(messages), devnull, fmt))
+        for name, func in cases.items():
+            elapsed = best_of(func)
+            print(f'{name:>22}: {elapsed / args.count * 1e9:8.1f} нс/строка')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Индекс результатов: загрузка 10M тренировок и запросы top-K/перцентилей.
+
+Тренировки генерируются и считаются `batch.compute_batch` порциями по
+`--chunk` и загружаются в `WorkoutIndex.add_columns` со временем за
+`--weeks` недель и идентификатором пользователя в качестве ключа.
+Запросы сравниваются с полным просмотром колонок на NumPy; отдельно
+замеряется построчная загрузка `ShardedIndex.add` из нескольких потоков.
+"""
+import argparse
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from batch import compute_batch
+from benchmarks.common import WORKOUT_TYPES, best_of
+from homework import WORKOUT_TYPES as CLASSES
+from resultindex import ShardedIndex, WorkoutIndex
+
+WEEK: int = 7 * 24 * 3600
+NAMES = [CLASSES[code].__name__ for code in WORKOUT_TYPES]
+SCAN_COLUMNS = ('type', 'timestamp', 'distance', 'speed', 'calories')
+Columns = Dict[str, np.ndarray]
+
+
+def generate_chunk(rng: np.random.Generator, size: int):
+    """Номера видов в `WORKOUT_TYPES` и колонки пакетов для них."""
+    numbers = rng.integers(0, len(WORKOUT_TYPES), size).astype(np.uint8)
+    codes = np.array(WORKOUT_TYPES)[numbers]
+    actions = rng.integers(500, 40001, size)
+    durations = rng.integers(1, 4, size)
+    weights = rng.integers(45, 121, size)
+    extra = np.where(codes == 'WLK', rng.integers(140, 211, size),
+                     rng.choice((25, 50), size))
+    count_pool = rng.integers(10, 81, size)
+    return numbers, codes, (actions, durations, weights, extra, count_pool)
+
+
+def load(args: argparse.Namespace) -> Tuple[WorkoutIndex, Columns]:
+    """Загрузить тренировки в индекс и сохранить колонки для просмотра."""
+    rng = np.random.default_rng(0)
+    index = WorkoutIndex(max_k=args.k, period=WEEK)
+    parts: Dict[str, List[np.ndarray]] = {name: [] for name in SCAN_COLUMNS}
+    elapsed = 0.0
+    for start in range(0, args.count, args.chunk):
+        size = min(args.chunk, args.count - start)
+        types, codes, packages = generate_chunk(rng, size)
+        result = compute_batch(codes, *packages)
+        timestamps = rng.uniform(0, args.weeks * WEEK, size)
+        users = rng.integers(0, 1_000_000, size)
+        begin = time.perf_counter()
+        index.add_columns(types, *result, keys=users, timestamps=timestamps,
+                          dictionary=NAMES)
+        elapsed += time.perf_counter() - begin
+        for name, column in zip(SCAN_COLUMNS,
+                                (types, timestamps, *result)):
+            parts[name].append(column)
+    print(f'загрузка колонками: {elapsed / args.count * 1e9:6.0f} '
+          f'нс/тренировка ({args.count:,} тренировок)')
+    return index, {name: np.concatenate(column)
+                   for name, column in parts.items()}
+
+
+def query(args: argparse.Namespace, index: WorkoutIndex,
+          columns: Columns) -> None:
+    """Запросы к индексу против полного просмотра колонок."""
+    now = (args.weeks - 0.5) * WEEK
+    week = int(now // WEEK)
+    swimming = columns['type'] == NAMES.index('Swimming')
+
+    def top_index() -> None:
+        index.top('calories', args.k, 'Running', timestamp=now)
+
+    def top_scan() -> None:
+        mask = ((columns['type'] == NAMES.index('Running'))
+                & (columns['timestamp'] // WEEK == week))
+        calories = columns['calories'][mask]
+        best = np.argpartition(-calories, args.k - 1)[:args.k]
+        calories[best[np.argsort(-calories[best])]]
+
+    def p95_index() -> None:
+        index.quantile('speed', 0.95, 'Swimming')
+
+    def p95_scan() -> None:
+        np.quantile(columns['speed'][swimming], 0.95)
+
+    for title, indexed, scanned in (
+            (f'top-{args.k} калорий Running за неделю', top_index, top_scan),
+            ('p95 скорости Swimming', p95_index, p95_scan)):
+        print(f'{title}: индекс {best_of(indexed) * 1e3:8.3f} мс, '
+              f'просмотр {best_of(scanned) * 1e3:8.3f} мс')
+    estimate = index.quantile('speed', 0.95, 'Swimming')
+    exact = np.quantile(columns['speed'][swimming], 0.95, method='lower')
+    print(f'погрешность p95: {abs(estimate - exact) / exact:.3%}')
+
+
+def load_threads(args: argparse.Namespace, columns: Columns) -> None:
+    """Построчная загрузка `ShardedIndex` из нескольких потоков."""
+    types, distance, speed, calories = (
+        columns[name][:args.rows].tolist()
+        for name in ('type', 'distance', 'speed', 'calories'))
+    rows = list(zip(map(NAMES.__getitem__, types), [1.0] * len(types),
+                    distance, speed, calories))
+    sharded = ShardedIndex(shards=args.threads, max_k=args.k)
+
+    def worker(first: int) -> None:
+        for number in range(first, len(rows), args.threads):
+            sharded.add(rows[number], key=number)
+
+    threads = [threading.Thread(target=worker, args=(first,))
+               for first in range(args.threads)]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - begin
+    print(f'построчная загрузка, {args.threads} потока: '
+          f'{elapsed / len(rows) * 1e9:6.0f} нс/строка')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=10_000_000)
+    parser.add_argument('--chunk', type=int, default=1_000_000)
+    parser.add_argument('--weeks', type=int, default=8)
+    parser.add_argument('--k', type=int, default=100)
+    parser.add_argument('--rows', type=int, default=200_000,
+                        help='строк для построчной загрузки')
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    index, columns = load(args)
+    query(args, index, columns)
+    load_threads(args, columns)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Потоковые сессии: стоимость отсчёта и сообщения при тысячах сессий.
+
+Отсчёты всех сессий приходят вперемешку, как от множества устройств
+одновременно; после каждого `--info-every` отсчётов сессии запрашивается
+её текущее сообщение. Для сравнения приведён пересчёт по всей истории
+отсчётов при каждом запросе.
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import WORKOUT_TYPES
+from homework import read_package
+from session import SessionStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', type=int, default=10_000)
+    parser.add_argument('--samples', type=int, default=60,
+                        help='отсчётов на сессию')
+    parser.add_argument('--info-every', type=int, default=10)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    store = SessionStore()
+    history = {}
+    # постоянные параметры сессии после веса, в порядке полей пакета
+    params = {'RUN': {}, 'WLK': {'height': 180}, 'SWM': {'length_pool': 25}}
+    for session_id in range(args.sessions):
+        workout_type = rnd.choice(WORKOUT_TYPES)
+        weight = rnd.randint(45, 120)
+        store.start(session_id, workout_type, weight, **params[workout_type])
+        history[session_id] = (workout_type, weight, [])
+    samples = [(session_id, second, rnd.randint(0, 3), second % 30 == 29)
+               for second in range(args.samples)
+               for session_id in range(args.sessions)]
+
+    start = time.perf_counter()
+    for session_id, second, action, lap in samples:
+        store.add_sample(session_id, second, action, lap)
+        if second % args.info_every == args.info_every - 1:
+            store.info(session_id)
+    elapsed = time.perf_counter() - start
+    print(f'сессии: {elapsed / len(samples) * 1e9:8.0f} нс/отсчёт '
+          f'({args.sessions:,} сессий, {len(samples):,} отсчётов)')
+
+    start = time.perf_counter()
+    for session_id, second, action, lap in samples:
+        workout_type, weight, session_history = history[session_id]
+        session_history.append((second, action, lap))
+        if second % args.info_every == args.info_every - 1:
+            data = [sum(sample[1] for sample in session_history),
+                    (session_history[-1][0] - session_history[0][0]) / 3600,
+                    weight, *params[workout_type].values()]
+            if workout_type == 'SWM':
+                data.append(sum(sample[2] for sample in session_history))
+            read_package(workout_type, data).show_training_info()
+    elapsed = time.perf_counter() - start
+    print(f'пересчёт по истории: {elapsed / len(samples) * 1e9:8.0f} '
+          'нс/отсчёт')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Возврат результатов через общую память против сериализации InfoMessage.
+
+Оба варианта рассчитывают одни и те же пакеты в пуле процессов; разница
+только в том, как результаты попадают к родителю: списком `InfoMessage`
+через pickle или записью в колонки `sharedmem.ResultBuffer`.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import parallel
+from benchmarks.common import generate_packages
+from homework import InfoMessage, read_packages
+from pipeline import Package
+
+
+def compute_messages(packages: List[Package]) -> List[InfoMessage]:
+    """Задача рабочего процесса, возвращающая сообщения целиком."""
+    return [training.show_training_info()
+            for training in read_packages(packages)]
+
+
+def pickled(packages: List[Package], workers: int,
+            chunk_size: int) -> float:
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = (packages[offset:offset + chunk_size]
+                  for offset in range(0, len(packages), chunk_size))
+        calories = 0.0
+        for messages in parallel.ordered_map(executor, compute_messages,
+                                             chunks, workers * 2):
+            for message in messages:
+                calories += message.calories
+    return time.perf_counter() - start
+
+
+def shared(packages: List[Package], workers: int, chunk_size: int) -> float:
+    start = time.perf_counter()
+    buffer = parallel.compute_shared(packages, workers, chunk_size)
+    calories = 0.0
+    for row in buffer:
+        calories += row[4]
+    elapsed = time.perf_counter() - start
+    buffer.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=20_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    packages = list(generate_packages(args.count))
+    for name, run in (('pickle InfoMessage', pickled),
+                      ('shared memory', shared)):
+        elapsed = run(packages, args.workers, args.chunk_size)
+        print(f'{name:>20}: {elapsed:7.3f} с, '
+              f'{args.count / elapsed:12,.0f} пакетов/с')
+
+
+if __name__ == '__main__':
+    main()
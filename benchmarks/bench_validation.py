@@ -0,0 +1,48 @@
+"""Поштучный перехват исключений против пакетной проверки `validation`."""
+import argparse
+import random
+
+import homework
+import validation
+from benchmarks.common import best_of, generate_packages
+
+BAD_PACKAGES = [
+    ('BOX', [1, 1, 1]),
+    ('RUN', [15000, 1]),
+    ('RUN', [15000, 0, 75]),
+    ('WLK', [9000, 1, 75, 0]),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200_000)
+    parser.add_argument('--bad-ratio', type=float, default=0.5,
+                        help='доля некорректных пакетов')
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    packages = [rnd.choice(BAD_PACKAGES) if rnd.random() < args.bad_ratio
+                else package for package in generate_packages(args.count)]
+
+    def one_by_one() -> None:
+        for workout_type, data in packages:
+            try:
+                homework.read_package(workout_type,
+                                      data).show_training_info()
+            except (ValueError, TypeError, ZeroDivisionError):
+                pass
+
+    def validated() -> None:
+        result = validation.validate(packages)
+        for training in homework.read_packages(result.valid):
+            training.show_training_info()
+
+    for name, func in (('try/except', one_by_one),
+                       ('validate', validated)):
+        elapsed = best_of(func)
+        print(f'{name:>12}: {elapsed / args.count * 1e9:8.1f} нс/пакет')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Общие генераторы синтетических пакетов и замер времени."""
+import random
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+
+WORKOUT_TYPES = ('SWM', 'WLK', 'RUN')
+
+
+def generate_package(rnd: random.Random,
+                     workout_type: Optional[str] = None
+                     ) -> Tuple[str, List[int]]:
+    """Сгенерировать один правдоподобный пакет датчиков."""
+    workout_type = workout_type or rnd.choice(WORKOUT_TYPES)
+    data = [rnd.randint(500, 40000), rnd.randint(1, 3), rnd.randint(45, 120)]
+    if workout_type == 'WLK':
+        data.append(rnd.randint(140, 210))
+    elif workout_type == 'SWM':
+        data.extend([rnd.choice((25, 50)), rnd.randint(10, 80)])
+    return workout_type, data
+
+
+def generate_packages(count: int, seed: int = 0,
+                      workout_type: Optional[str] = None
+                      ) -> Iterator[Tuple[str, List[int]]]:
+    """Сгенерировать `count` пакетов, воспроизводимо по `seed`."""
+    rnd = random.Random(seed)
+    for _ in range(count):
+        yield generate_package(rnd, workout_type)
+
+
+def package_line(workout_type: str, data: List[int]) -> str:
+    """Записать пакет в текстовом формате `'RUN', [15000, 1, 75]`."""
+    return f'{workout_type!r}, {data!r}\n'
+
+
+def best_of(func: Callable[[], object], repeat: int = 3) -> float:
+    """Лучшее время выполнения `func` в секундах из `repeat` запусков."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
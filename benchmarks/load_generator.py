@@ -0,0 +1,102 @@
+"""Нагрузочный клиент для `server.PacketServer`.
+
+Открывает несколько соединений, в каждом отправляет пакеты по одному и
+ждёт ответа, после чего выводит пропускную способность и задержки p50/p99.
+С флагом `--spawn` локальный сервер запускается в отдельном процессе.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import random
+import time
+from typing import List, Optional
+
+import server
+from benchmarks.common import generate_package, package_line
+
+
+async def open_connection(host: str, port: int, path: Optional[str]):
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def client(args: argparse.Namespace, seed: int,
+                 latencies: List[float]) -> None:
+    rnd = random.Random(seed)
+    lines = [package_line(*generate_package(rnd)).encode()
+             for _ in range(args.requests)]
+    reader, writer = await open_connection(args.host, args.port, args.path)
+    for line in lines:
+        start = time.perf_counter()
+        writer.write(line)
+        await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def wait_for_server(args: argparse.Namespace,
+                          timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await open_connection(args.host, args.port,
+                                              args.path)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+        else:
+            writer.close()
+            await writer.wait_closed()
+            return
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    await wait_for_server(args)
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args, seed, latencies)
+                           for seed in range(args.connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f'соединений: {args.connections}, пакетов: {len(latencies)}')
+    print(f'пропускная способность: {len(latencies) / elapsed:,.0f} '
+          'пакетов/с')
+    print(f'p50: {percentile(latencies, 0.50) * 1e3:.3f} мс, '
+          f'p99: {percentile(latencies, 0.99) * 1e3:.3f} мс')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--path', help='путь к Unix-сокету')
+    parser.add_argument('--connections', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--spawn', action='store_true',
+                        help='запустить локальный сервер')
+    args = parser.parse_args()
+
+    process = None
+    if args.spawn:
+        process = multiprocessing.Process(
+            target=server.serve, args=(args.host, args.port, args.path),
+            daemon=True)
+        process.start()
+    try:
+        asyncio.run(run(args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.join()
+
+
+if __name__ == '__main__':
+    main()
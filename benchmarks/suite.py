@@ -0,0 +1,119 @@
+"""Набор бенчмарков для всех видов тренировок и цикла `main`.
+
+Результаты (секунды на один пакет) сохраняются в JSON; в режиме
+`--compare` текущие замеры сравниваются с сохранённым базовым файлом,
+и при замедлении больше порога скрипт завершается с кодом 1.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import homework
+from benchmarks.common import WORKOUT_TYPES, best_of, generate_packages
+
+DEFAULT_SIZES: Tuple[int, ...] = (1_000, 10_000, 100_000)
+DEFAULT_THRESHOLD: float = 0.10  # допустимое замедление, доля
+
+Packages = List[Tuple[str, List[int]]]
+Case = Callable[[], object]
+
+
+def _metric_case(packages: Packages, method: str) -> Case:
+    # объекты строятся до замера: показатели не запоминаются в объекте,
+    # поэтому каждый запуск измеряет только вызов метода
+    trainings = list(homework.read_packages(packages))
+
+    def run() -> None:
+        for training in trainings:
+            getattr(training, method)()
+
+    return run
+
+
+def _main_loop(packages: Packages, output) -> Case:
+    def run() -> None:
+        with contextlib.redirect_stdout(output):
+            for workout_type, data in packages:
+                homework.main(homework.read_package(workout_type, data))
+
+    return run
+
+
+def build_cases(packages: Packages, output) -> Dict[str, Case]:
+    """Сценарии замеров для одного набора пакетов."""
+    messages = [training.show_training_info()
+                for training in homework.read_packages(packages)]
+    return {
+        'construct': lambda: [homework.read_package(workout_type, data)
+                              for workout_type, data in packages],
+        'get_distance': _metric_case(packages, 'get_distance'),
+        'get_mean_speed': _metric_case(packages, 'get_mean_speed'),
+        'get_spent_calories': _metric_case(packages, 'get_spent_calories'),
+        'show_training_info': _metric_case(packages, 'show_training_info'),
+        'get_message': lambda: [message.get_message()
+                                for message in messages],
+        'main': _main_loop(packages, output),
+    }
+
+
+def run_suite(sizes: Iterable[int] = DEFAULT_SIZES, repeat: int = 3,
+              workout_types: Iterable[str] = WORKOUT_TYPES
+              ) -> Dict[str, float]:
+    """Выполнить все замеры; ключ - `тип/сценарий/размер`."""
+    results: Dict[str, float] = {}
+    with open(os.devnull, 'w', encoding='utf-8') as output:
+        for workout_type in workout_types:
+            for size in sizes:
+                packages = list(generate_packages(size, seed=size,
+                                                  workout_type=workout_type))
+                for name, case in build_cases(packages, output).items():
+                    elapsed = best_of(case, repeat)
+                    results[f'{workout_type}/{name}/{size}'] = elapsed / size
+    return results
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float],
+            threshold: float = DEFAULT_THRESHOLD
+            ) -> List[Tuple[str, float, float]]:
+    """Сценарии, замедлившиеся относительно базовых больше порога."""
+    return [(name, baseline[name], value)
+            for name, value in current.items()
+            if name in baseline and value > baseline[name] * (1 + threshold)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='bench_results.json',
+                        help='куда сохранить результаты')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='сравнить с сохранёнными результатами')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.repeat)
+    for name, value in results.items():
+        print(f'{name:>36}: {value * 1e9:10.1f} нс/пакет')
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump({'python': sys.version, 'platform': platform.platform(),
+                   'results': results}, output, indent=2)
+
+    if args.compare is None:
+        return 0
+    with open(args.compare, encoding='utf-8') as source:
+        baseline = json.load(source)['results']
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, after in regressions:
+        print(f'ЗАМЕДЛЕНИЕ {name}: {before * 1e9:.1f} -> '
+              f'{after * 1e9:.1f} нс/пакет ({after / before - 1:+.0%})')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
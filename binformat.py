@@ -0,0 +1,195 @@
+"""Компактный двоичный формат архивов пакетов и чтение через `mmap`.
+
+Файл начинается с заголовка `HEADER` (16 байт): сигнатура `WKPK`, версия
+формата и размер записи. Далее идут записи фиксированной длины
+`RECORD` (24 байта, little-endian):
+
+====== ======= ===============================================
+смещ.  тип     поле
+====== ======= ===============================================
+0      uint8   код тренировки - индекс в `compact.WORKOUT_CODES`
+1      1 байт  выравнивание
+2      uint16  weight
+4      uint32  action
+8      float64 duration
+16     uint16  height или length_pool, иначе 0
+18     uint16  count_pool, иначе 0
+20     4 байта выравнивание
+====== ======= ===============================================
+
+Длительность хранится как `float64`, чтобы результаты расчёта побитово
+совпадали с расчётом по исходным пакетам; остальные поля - целые.
+Фиксированная длина записи (под самую длинную тренировку) позволяет
+обращаться к записи по номеру и читать файл как один массив NumPy без
+разбора отдельных записей.
+"""
+import mmap
+import struct
+from typing import IO, Any, Iterable, Iterator, List, Optional, Tuple
+
+from compact import EXTRA_FIELDS, TRAINING_ARITY, WORKOUT_CODES
+
+MAGIC: bytes = b'WKPK'
+VERSION: int = 1
+HEADER = struct.Struct('<4sHH8x')
+RECORD = struct.Struct('<BxHId2H4x')
+FIELD_NAMES: Tuple[str, ...] = ('action', 'duration', 'weight', 'extra1',
+                                'extra2')
+BUFFER_RECORDS: int = 4096  # записей в буфере писателя
+
+Package = Tuple[str, List[Any]]
+
+
+def numpy_dtype() -> Any:
+    """Структурный тип NumPy, совпадающий с `RECORD`."""
+    import numpy as np
+
+    return np.dtype({'names': ('code', *FIELD_NAMES),
+                     'formats': ('u1', '<u4', '<f8', '<u2', '<u2', '<u2'),
+                     'offsets': (0, 4, 8, 2, 16, 18),
+                     'itemsize': RECORD.size})
+
+
+def _package(code: int, weight: int, action: int, duration: float,
+             *extra: int) -> Package:
+    data = [action, duration, weight, *extra]
+    return WORKOUT_CODES[code], data[:TRAINING_ARITY[code]]
+
+
+class PacketWriter():
+    """Запись пакетов в двоичный архив с буферизацией."""
+
+    def __init__(self, path: str) -> None:
+        self._file: IO[bytes] = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self._buffer = bytearray(RECORD.size * BUFFER_RECORDS)
+        self._buffered = 0
+        self.written = 0
+
+    def __enter__(self) -> 'PacketWriter':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def write(self, workout_type: str, data: List[Any]) -> None:
+        """Добавить пакет в архив."""
+        try:
+            code = WORKOUT_CODES.index(workout_type)
+        except ValueError:
+            raise ValueError(f'Данный тип тренировки "{workout_type}"'
+                             ' не поддерживается.') from None
+        if len(data) != TRAINING_ARITY[code]:
+            raise TypeError(f'Пакет тренировки "{workout_type}" должен '
+                            f'содержать {TRAINING_ARITY[code]} полей, '
+                            f'получено {len(data)}.')
+        action, duration, weight, *extra = data
+        extra += [0] * (EXTRA_FIELDS - len(extra))
+        try:
+            RECORD.pack_into(self._buffer, self._buffered * RECORD.size,
+                             code, weight, action, duration, *extra)
+        except struct.error as error:
+            raise ValueError(f'Пакет {data} не помещается в формат '
+                             f'записи: {error}.') from None
+        self._buffered += 1
+        self.written += 1
+        if self._buffered == BUFFER_RECORDS:
+            self.flush()
+
+    def write_many(self, packages: Iterable[Package]) -> None:
+        """Добавить несколько пакетов."""
+        for workout_type, data in packages:
+            self.write(workout_type, data)
+
+    def flush(self) -> None:
+        """Сбросить буфер в файл."""
+        self._file.write(
+            memoryview(self._buffer)[:self._buffered * RECORD.size])
+        self._buffered = 0
+
+    def close(self) -> None:
+        """Дописать буфер и закрыть файл."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class PacketReader():
+    """Чтение двоичного архива через `mmap` без копирования данных.
+
+    Массивы из `as_numpy` и `records` ссылаются на отображённую память,
+    поэтому до `close` их нужно освободить.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as source:
+            self._mmap = mmap.mmap(source.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        magic, version, record_size = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f'Файл {path} не является архивом пакетов '
+                             f'версии {VERSION}.')
+        if record_size != RECORD.size:
+            self._mmap.close()
+            raise ValueError(f'Неожиданный размер записи: {record_size}.')
+        payload = len(self._mmap) - HEADER.size
+        if payload % RECORD.size:
+            self._mmap.close()
+            raise ValueError(f'Архив {path} обрезан.')
+        self._count = payload // RECORD.size
+
+    def __enter__(self) -> 'PacketReader':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def records(self) -> memoryview:
+        """Байты всех записей без заголовка."""
+        return memoryview(self._mmap)[HEADER.size:]
+
+    def __getitem__(self, index: int) -> Package:
+        if not -self._count <= index < self._count:
+            raise IndexError('Номер записи вне архива.')
+        index %= self._count
+        return _package(*RECORD.unpack_from(
+            self._mmap, HEADER.size + index * RECORD.size))
+
+    def __iter__(self) -> Iterator[Package]:
+        """Пакеты в формате `(workout_type, data)` для `read_package`."""
+        for record in RECORD.iter_unpack(self.records):
+            yield _package(*record)
+
+    def as_numpy(self) -> Any:
+        """Структурный массив NumPy поверх отображённого файла."""
+        import numpy as np
+
+        return np.frombuffer(self._mmap, dtype=numpy_dtype(),
+                             count=self._count, offset=HEADER.size)
+
+    def compute(self, start: int = 0, stop: Optional[int] = None) -> Any:
+        """Рассчитать показатели записей `[start, stop)` через `batch`."""
+        import numpy as np
+
+        from batch import compute_batch
+
+        records = self.as_numpy()[start:stop]
+        codes = np.array(WORKOUT_CODES)[records['code']]
+        return compute_batch(codes, *(records[name]
+                                      for name in FIELD_NAMES))
+
+    def close(self) -> None:
+        """Закрыть отображение файла."""
+        self._mmap.close()
+
+
+def write_packages(path: str, packages: Iterable[Package]) -> int:
+    """Записать пакеты в двоичный архив, вернуть их количество."""
+    with PacketWriter(path) as writer:
+        writer.write_many(packages)
+        return writer.written
@@ -0,0 +1,183 @@
+"""Командная строка фитнес-трекера.
+
+Подкоманды:
+
+* `process` - обработать файлы с пакетами (или стандартный ввод) и
+  вывести сообщения `InfoMessage.get_message`, CSV, JSON Lines или
+  колоночную выгрузку;
+* `serve` - запустить сервис приёма пакетов (`server`);
+* `bench` - запустить бенчмарк из пакета `benchmarks`.
+
+Модули подкоманд импортируются только при их вызове, поэтому текстовая
+обработка не загружает NumPy, asyncio и пул процессов.
+"""
+import argparse
+import sys
+from typing import IO, Iterable, Iterator, List, Optional
+
+# форматы `process`, которые собираются через `report.render`
+REPORT_FORMATS = ('csv', 'jsonl')
+FORMATS = ('text', *REPORT_FORMATS, 'columnar')
+# модули пакета `benchmarks`, которые не являются бенчмарками
+BENCH_HELPERS = ('common',)
+
+
+def _iter_rows(lines: Iterable[str], workers: int,
+               chunk_size: int) -> Iterator[tuple]:
+    if workers > 1:
+        import parallel
+
+        yield from parallel.iter_rows(lines, workers, chunk_size,
+                                      parallel.compute_lines)
+        return
+    from homework import read_package
+    from pipeline import iter_packages
+
+    for workout_type, data in iter_packages(lines):
+        info = read_package(workout_type, data).show_training_info()
+        yield (info.training_type, info.duration, info.distance, info.speed,
+               info.calories)
+
+
+def _write(args: argparse.Namespace, lines: Iterable[str],
+           output: IO[str]) -> None:
+    if args.format == 'text' and args.workers == 1:
+        from pipeline import process_stream
+
+        process_stream(lines, output, args.chunk_size)
+        return
+    rows = _iter_rows(lines, args.workers, args.chunk_size)
+    if args.format == 'text':
+        from homework import InfoMessage
+        from pipeline import write_messages
+
+        write_messages(map(InfoMessage.MESSAGE.__mod__, rows), output,
+                       args.chunk_size)
+    else:
+        from report import write_report
+
+        write_report(rows, output, args.format)
+
+
+def process(args: argparse.Namespace) -> int:
+    """Подкоманда `process`."""
+    import fileinput
+
+    with fileinput.input(args.paths, encoding='utf-8') as lines:
+        if args.format == 'columnar':
+            from columnar import write_columns
+
+            write_columns(args.output,
+                          _iter_rows(lines, args.workers, args.chunk_size),
+                          backend=args.backend)
+        elif args.output is None:
+            _write(args, lines, sys.stdout)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as output:
+                _write(args, lines, output)
+    return 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Подкоманда `serve`."""
+    import server
+
+    server.serve(args.host, args.port, args.path, max_batch=args.max_batch,
+                 batch_delay=args.batch_delay, queue_size=args.queue_size,
+                 max_pending=args.max_pending)
+    return 0
+
+
+def bench_names() -> List[str]:
+    """Имена бенчмарков из пакета `benchmarks`."""
+    import pkgutil
+
+    import benchmarks
+
+    return sorted(module.name
+                  for module in pkgutil.iter_modules(benchmarks.__path__)
+                  if module.name not in BENCH_HELPERS)
+
+
+def bench(args: argparse.Namespace) -> int:
+    """Подкоманда `bench`: запустить `benchmarks.<name>` с аргументами."""
+    import runpy
+
+    if args.name not in bench_names():
+        print(f'Неизвестный бенчмарк "{args.name}", доступны: '
+              f'{", ".join(bench_names())}.', file=sys.stderr)
+        return 2
+    module = f'benchmarks.{args.name}'
+    argv = sys.argv
+    sys.argv = [module, *args.args]
+    try:
+        runpy.run_module(module, run_name='__main__', alter_sys=True)
+    except SystemExit as error:
+        code = error.code
+        return code if isinstance(code, int) else int(code is not None)
+    finally:
+        sys.argv = argv
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Парсер аргументов со всеми подкомандами."""
+    parser = argparse.ArgumentParser(
+        prog='cli.py', description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_process = commands.add_parser(
+        'process', help='обработать файлы с пакетами')
+    parser_process.add_argument(
+        'paths', nargs='*', default=['-'],
+        help="файлы с пакетами, '-' - стандартный ввод")
+    parser_process.add_argument('-f', '--format', choices=FORMATS,
+                                default='text')
+    parser_process.add_argument(
+        '-o', '--output', help='файл результата, для columnar - путь '
+        'выгрузки; по умолчанию стандартный вывод')
+    parser_process.add_argument('-w', '--workers', type=int, default=1,
+                                help='число процессов обработки')
+    parser_process.add_argument('--chunk-size', type=int, default=1000)
+    parser_process.add_argument('--backend', choices=('arrow', 'npy'),
+                                help='формат колоночной выгрузки')
+    parser_process.set_defaults(handler=process)
+
+    parser_serve = commands.add_parser('serve',
+                                       help='запустить сервис приёма пакетов')
+    parser_serve.add_argument('--host', default='127.0.0.1')
+    parser_serve.add_argument('--port', type=int, default=8765)
+    parser_serve.add_argument('--path', help='Unix-сокет вместо TCP')
+    parser_serve.add_argument('--max-batch', type=int, default=256)
+    parser_serve.add_argument('--batch-delay', type=float, default=0.0)
+    parser_serve.add_argument('--queue-size', type=int, default=4096)
+    parser_serve.add_argument('--max-pending', type=int, default=64)
+    parser_serve.set_defaults(handler=serve)
+
+    parser_bench = commands.add_parser('bench', help='запустить бенчмарк')
+    parser_bench.add_argument('name', help='модуль из пакета benchmarks, '
+                              'например suite')
+    parser_bench.add_argument('args', nargs=argparse.REMAINDER,
+                              help='аргументы бенчмарка')
+    parser_bench.set_defaults(handler=bench)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'process':
+        if args.workers < 1:
+            parser.error('--workers должно быть положительным')
+        if args.format == 'columnar' and args.output is None:
+            parser.error('для --format columnar нужен --output')
+    try:
+        return args.handler(args)
+    except (ValueError, TypeError, ArithmeticError, OSError) as error:
+        print(f'Ошибка: {error}', file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Колоночная выгрузка результатов тренировок для аналитики.
+
+Строки `report.Row` копятся в группы по `row_group_size` строк, и каждая
+группа дописывается в файл целиком. Вид тренировки хранится словарным
+кодом: номером названия в `dictionary` (зарегистрированные тренировки
+на момент создания писателя).
+
+Поддерживаются два формата:
+
+* `arrow` - файл Arrow IPC, одна группа - один `RecordBatch`; доступен,
+  если установлен `pyarrow`;
+* `npy` - каталог с файлами `.npy` (формат NumPy 1.0) по одному на
+  колонку: `training_type.npy` (`uint8`), `duration.npy`,
+  `distance.npy`, `speed.npy`, `calories.npy` (`float64`) и
+  `metadata.json` со словарём видов тренировок и размерами групп.
+  Заголовок `.npy` имеет фиксированную длину `NPY_HEADER_SIZE` и
+  перезаписывается при закрытии, когда известно число строк; колонки
+  можно читать через `numpy.load(..., mmap_mode='r')` без копирования.
+"""
+import json
+import os
+import sys
+from array import array
+from importlib.util import find_spec
+from typing import IO, Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from homework import WORKOUT_TYPES
+from report import Row
+
+VALUE_COLUMNS: Tuple[str, ...] = ('duration', 'distance', 'speed',
+                                  'calories')
+TYPE_COLUMN: str = 'training_type'
+DEFAULT_ROW_GROUP_SIZE: int = 65536
+BACKENDS: Tuple[str, ...] = ('arrow', 'npy')
+METADATA_FILE: str = 'metadata.json'
+METADATA_VERSION: int = 1
+
+NPY_MAGIC: bytes = b'\x93NUMPY\x01\x00'
+NPY_HEADER_SIZE: int = 128  # магия, длина заголовка и словарь с отступами
+FLOAT_DESCR: str = '<f8' if sys.byteorder == 'little' else '>f8'
+CODE_DESCR: str = '|u1'
+
+
+class Columns(NamedTuple):
+    """Прочитанные колонки: коды видов тренировок и значения."""
+    dictionary: Tuple[str, ...]
+    training_type: Any
+    duration: Any
+    distance: Any
+    speed: Any
+    calories: Any
+
+
+def default_backend() -> str:
+    """`arrow`, если установлен `pyarrow`, иначе `npy`."""
+    return 'arrow' if find_spec('pyarrow') is not None else 'npy'
+
+
+def _npy_header(descr: str, rows: int) -> bytes:
+    header = ("{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }"
+              % (descr, rows))
+    size = NPY_HEADER_SIZE - len(NPY_MAGIC) - 2
+    return (NPY_MAGIC + size.to_bytes(2, 'little')
+            + header.ljust(size - 1).encode('latin1') + b'\n')
+
+
+class ColumnarWriter():
+    """Запись результатов по колонкам группами строк."""
+
+    def __init__(self, path: str,
+                 row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                 backend: Optional[str] = None) -> None:
+        if row_group_size < 1:
+            raise ValueError('Размер группы строк должен быть '
+                             'положительным.')
+        backend = backend or default_backend()
+        if backend not in BACKENDS:
+            raise ValueError(f'Неизвестный формат выгрузки "{backend}".')
+        self.path = path
+        self.row_group_size = row_group_size
+        self.backend = backend
+        self.dictionary: Tuple[str, ...] = tuple(
+            cls.__name__ for cls in WORKOUT_TYPES.values())
+        self.row_groups: List[int] = []
+        self.written = 0
+        self._codes = {name: code for code, name in enumerate(self.dictionary)}
+        self._group: List[Row] = []
+        self._closed = False
+        if backend == 'arrow':
+            self._open_arrow()
+        else:
+            self._open_npy()
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _open_arrow(self) -> None:
+        import pyarrow as pa
+
+        self._schema = pa.schema(
+            [(TYPE_COLUMN, pa.dictionary(pa.int8(), pa.string()))]
+            + [(name, pa.float64()) for name in VALUE_COLUMNS])
+        self._arrow_dictionary = pa.array(self.dictionary, pa.string())
+        self._sink = pa.OSFile(self.path, 'wb')
+        self._arrow = pa.ipc.new_file(self._sink, self._schema)
+
+    def _open_npy(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        self._files: Dict[str, IO[bytes]] = {}
+        for name in (TYPE_COLUMN, *VALUE_COLUMNS):
+            descr = CODE_DESCR if name == TYPE_COLUMN else FLOAT_DESCR
+            column = open(os.path.join(self.path, f'{name}.npy'), 'wb')
+            column.write(_npy_header(descr, 0))
+            self._files[name] = column
+
+    def write_row(self, row: Row) -> None:
+        """Добавить строку `report.Row`."""
+        self._group.append(row)
+        if len(self._group) >= self.row_group_size:
+            self.flush()
+
+    def write_rows(self, rows: Iterable[Row]) -> None:
+        """Добавить несколько строк."""
+        group = self._group
+        size = self.row_group_size
+        for row in rows:
+            group.append(row)
+            if len(group) >= size:
+                self.flush()
+                group = self._group
+
+    def flush(self) -> None:
+        """Записать накопленные строки отдельной группой."""
+        if not self._group:
+            return
+        training_types, *values = zip(*self._group)
+        try:
+            codes = bytes(map(self._codes.__getitem__, training_types))
+        except KeyError as error:
+            raise ValueError(f'Неизвестный вид тренировки {error}.') from None
+        columns = [array('d', column) for column in values]
+        if self.backend == 'arrow':
+            self._write_arrow(codes, columns)
+        else:
+            self._files[TYPE_COLUMN].write(codes)
+            for name, column in zip(VALUE_COLUMNS, columns):
+                self._files[name].write(column.tobytes())
+        self.row_groups.append(len(self._group))
+        self.written += len(self._group)
+        self._group = []
+
+    def _write_arrow(self, codes: bytes, columns: List[array]) -> None:
+        import pyarrow as pa
+
+        size = len(codes)
+        types = pa.DictionaryArray.from_arrays(
+            pa.Array.from_buffers(pa.int8(), size,
+                                  [None, pa.py_buffer(codes)]),
+            self._arrow_dictionary)
+        values = [pa.Array.from_buffers(pa.float64(), size,
+                                        [None, pa.py_buffer(column)])
+                  for column in columns]
+        self._arrow.write_batch(pa.record_batch([types, *values],
+                                                schema=self._schema))
+
+    def close(self) -> None:
+        """Записать последнюю группу и завершить файлы."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        if self.backend == 'arrow':
+            self._arrow.close()
+            self._sink.close()
+            return
+        for name, column in self._files.items():
+            descr = CODE_DESCR if name == TYPE_COLUMN else FLOAT_DESCR
+            column.seek(0)
+            column.write(_npy_header(descr, self.written))
+            column.close()
+        metadata = {
+            'version': METADATA_VERSION,
+            'rows': self.written,
+            'row_groups': self.row_groups,
+            'dictionary': list(self.dictionary),
+            'columns': [TYPE_COLUMN, *VALUE_COLUMNS],
+        }
+        with open(os.path.join(self.path, METADATA_FILE), 'w',
+                  encoding='utf-8') as output:
+            json.dump(metadata, output)
+
+
+def write_columns(path: str, rows: Iterable[Row],
+                  row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                  backend: Optional[str] = None) -> int:
+    """Выгрузить строки по колонкам, вернуть их количество."""
+    with ColumnarWriter(path, row_group_size, backend) as writer:
+        writer.write_rows(rows)
+    return writer.written
+
+
+def read_columns(path: str) -> Columns:
+    """Прочитать выгрузку: каталог `npy` или файл Arrow IPC.
+
+    Колонки `npy` отображаются в память без копирования.
+    """
+    if os.path.isdir(path):
+        import numpy as np
+
+        with open(os.path.join(path, METADATA_FILE),
+                  encoding='utf-8') as source:
+            metadata = json.load(source)
+        if metadata.get('version') != METADATA_VERSION:
+            raise ValueError(f'Неподдерживаемая версия выгрузки в {path}.')
+        columns = [np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+                   for name in (TYPE_COLUMN, *VALUE_COLUMNS)]
+        return Columns(tuple(metadata['dictionary']), *columns)
+
+    import pyarrow as pa
+
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    types = table.column(TYPE_COLUMN).combine_chunks()
+    return Columns(tuple(types.dictionary.to_pylist()),
+                   types.indices.to_numpy(),
+                   *(table.column(name).to_numpy() for name in VALUE_COLUMNS))
@@ -0,0 +1,187 @@
+"""Компактные представления тренировок для хранения в памяти."""
+from array import array
+from dataclasses import dataclass
+from typing import Any, ClassVar, Iterable, List, Tuple, Type
+
+import homework
+
+WORKOUT_CODES: Tuple[str, ...] = ('SWM', 'WLK', 'RUN')  # индекс - код типа
+EXTRA_FIELDS: int = 2  # максимум дополнительных полей у тренировки
+
+
+@dataclass(slots=True)
+class InfoMessage():
+    """Информационное сообщение о тренировке без `__dict__`."""
+    training_type: str
+    duration: float
+    distance: float
+    speed: float
+    calories: float
+    MESSAGE: ClassVar[str] = homework.InfoMessage.MESSAGE
+
+    get_message = homework.InfoMessage.get_message
+
+
+class Training():
+    """Базовый класс тренировки без `__dict__`.
+
+    Показатели считает ядро класса `SOURCE` из `homework`; оно берётся
+    при каждом расчёте и поэтому следует за изменениями класса.
+    Показатели не запоминаются: для этого понадобилось бы лишнее поле в
+    каждом объекте.
+    """
+    __slots__ = ('action', 'duration', 'weight')
+    SOURCE: ClassVar[Type[homework.Training]] = homework.Training
+
+    def __init__(self, action: int, duration: int, weight: int) -> None:
+        self.action = action
+        self.duration = duration
+        self.weight = weight
+
+    def get_metrics(self) -> homework.Metrics:
+        """Получить дистанцию, скорость и калории одним расчётом."""
+        source = self.SOURCE
+        fields = source._field_values(self)
+        if source.uses_kernel:
+            return source.kernel(*fields)
+        # методы-показатели `SOURCE` переопределены: считает его объект
+        return source(*fields).get_metrics()
+
+    def get_distance(self) -> float:
+        """Получить дистанцию в км."""
+        return self.get_metrics()[0]
+
+    def get_mean_speed(self) -> float:
+        """Получить среднюю скорость движения."""
+        return self.get_metrics()[1]
+
+    def get_spent_calories(self) -> float:
+        """Получить количество затраченных калорий."""
+        return self.get_metrics()[2]
+
+    def show_training_info(self) -> InfoMessage:
+        """Вернуть информационное сообщение о выполненной тренировке."""
+        distance, speed, calories = self.get_metrics()
+        return InfoMessage(self.__class__.__name__, self.duration,
+                           distance, speed, calories)
+
+
+class Running(Training):
+    """Тренировка: бег."""
+    __slots__ = ()
+    SOURCE = homework.Running
+
+
+class SportsWalking(Training):
+    """Тренировка: спортивная ходьба."""
+    __slots__ = ('height',)
+    SOURCE = homework.SportsWalking
+
+    def __init__(self, action: int, duration: int, weight: int,
+                 height: int) -> None:
+        Training.__init__(self, action, duration, weight)
+        self.height = height
+
+
+class Swimming(Training):
+    """Тренировка: плавание."""
+    __slots__ = ('length_pool', 'count_pool')
+    SOURCE = homework.Swimming
+
+    def __init__(self, action: int, duration: int, weight: int,
+                 length_pool: int, count_pool: int) -> None:
+        Training.__init__(self, action, duration, weight)
+        self.length_pool = length_pool
+        self.count_pool = count_pool
+
+
+TRAINING_CLASSES: Tuple[type, ...] = (Swimming, SportsWalking, Running)
+# количество полей пакета для каждого класса из `TRAINING_CLASSES`
+TRAINING_ARITY: Tuple[int, ...] = tuple(
+    sum(len(base.__dict__.get('__slots__', ())) for base in cls.__mro__)
+    for cls in TRAINING_CLASSES
+)
+
+
+class TrainingBatch():
+    """Хранилище тренировок в виде колонок (struct-of-arrays).
+
+    Код тренировки занимает один байт (индекс в `WORKOUT_CODES`),
+    показания датчиков хранятся в колонках `array('d')`. Число полей
+    пакета должно совпадать с типом тренировки (`TRAINING_ARITY`), а
+    дополнительные колонки, которых у типа нет, заполняются нулями.
+    """
+
+    def __init__(self, packages: Iterable[Tuple[str, List[Any]]] = ()
+                 ) -> None:
+        self.codes = array('B')
+        self.actions = array('d')
+        self.durations = array('d')
+        self.weights = array('d')
+        self.extra = tuple(array('d') for _ in range(EXTRA_FIELDS))
+        self.extend(packages)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def append(self, workout_type: str, data: List[Any]) -> None:
+        """Добавить пакет в хранилище."""
+        try:
+            code = WORKOUT_CODES.index(workout_type)
+        except ValueError:
+            raise ValueError(f'Данный тип тренировки "{workout_type}"'
+                             ' не поддерживается.') from None
+        if len(data) != TRAINING_ARITY[code]:
+            raise TypeError(f'Пакет тренировки "{workout_type}" должен '
+                            f'содержать {TRAINING_ARITY[code]} полей, '
+                            f'получено {len(data)}.')
+        action, duration, weight, *extra = data
+        self.codes.append(code)
+        self.actions.append(action)
+        self.durations.append(duration)
+        self.weights.append(weight)
+        extra += [0] * (EXTRA_FIELDS - len(extra))
+        for column, value in zip(self.extra, extra):
+            column.append(value)
+
+    def extend(self, packages: Iterable[Tuple[str, List[Any]]]) -> None:
+        """Добавить несколько пакетов."""
+        for workout_type, data in packages:
+            self.append(workout_type, data)
+
+    def __getitem__(self, index: int) -> Training:
+        """Восстановить объект тренировки по номеру строки."""
+        code = self.codes[index]
+        fields = [self.actions[index], self.durations[index],
+                  self.weights[index],
+                  *(column[index] for column in self.extra)]
+        return TRAINING_CLASSES[code](*fields[:TRAINING_ARITY[code]])
+
+    @property
+    def nbytes(self) -> int:
+        """Размер буферов с данными в байтах."""
+        return sum(column.buffer_info()[1] * column.itemsize
+                   for column in (self.codes, self.actions, self.durations,
+                                  self.weights, *self.extra))
+
+    def as_numpy(self) -> Tuple[Any, ...]:
+        """Вернуть колонки как массивы NumPy без копирования данных.
+
+        Пока живы возвращённые массивы, добавлять пакеты нельзя: `array`
+        не позволяет менять размер экспортированного буфера.
+        """
+        import numpy as np
+
+        return (np.frombuffer(self.codes, dtype=np.uint8),
+                *(np.frombuffer(column, dtype=np.float64)
+                  for column in (self.actions, self.durations,
+                                 self.weights, *self.extra)))
+
+    def compute(self) -> Any:
+        """Рассчитать показатели всех тренировок через `batch`."""
+        import numpy as np
+
+        from batch import compute_batch
+
+        codes, *columns = self.as_numpy()
+        return compute_batch(np.array(WORKOUT_CODES)[codes], *columns)
@@ -0,0 +1,113 @@
+"""Устранение повторно присланных пакетов на входе обработки.
+
+Устройства с неустойчивой связью присылают один и тот же пакет по
+нескольку раз. `DedupCache` запоминает сообщения по ключу
+`(workout_type, data, device, timestamp)` и для повтора возвращает уже
+рассчитанное `InfoMessage`, не создавая тренировку заново. Память
+ограничена числом записей (вытесняются давно не встречавшиеся) и,
+при необходимости, временным окном.
+"""
+import sys
+import time
+from collections import OrderedDict
+from typing import (Any, Callable, Dict, Hashable, Iterable, Iterator, List,
+                    Optional, Tuple)
+
+from homework import InfoMessage, read_package
+
+# workout_type, data, device, timestamp
+Packet = Tuple[str, List[Any], Hashable, Any]
+
+DEFAULT_MAXSIZE: int = 65536
+
+
+class DedupCache():
+    """Кэш сообщений для повторно присланных пакетов.
+
+    Повторы получают тот же объект `InfoMessage`, что и первый пакет.
+    С `window` запись забывается, если пакет не встречался дольше
+    `window` секунд по часам `clock`.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE,
+                 window: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if maxsize < 1:
+            raise ValueError('Размер кэша должен быть положительным.')
+        if window is not None and window <= 0:
+            raise ValueError('Окно должно быть положительным.')
+        self.maxsize = maxsize
+        self.window = window
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.expired = 0
+        # ключ -> (время последнего появления, сообщение), от давних к новым
+        self._entries: 'OrderedDict[Hashable, Tuple[float, InfoMessage]]' = (
+            OrderedDict())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expire(self, now: float) -> None:
+        entries = self._entries
+        deadline = now - self.window
+        while entries:
+            key, (seen, _) = next(iter(entries.items()))
+            if seen >= deadline:
+                return
+            del entries[key]
+            self.expired += 1
+
+    def get_message(self, workout_type: str, data: List[Any],
+                    device: Hashable = None,
+                    timestamp: Any = None) -> InfoMessage:
+        """Сообщение для пакета; для повтора - из кэша без расчёта."""
+        key = (workout_type, tuple(data), device, timestamp)
+        entries = self._entries
+        now = 0.0
+        if self.window is not None:
+            now = self.clock()
+            self._expire(now)
+        entry = entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            entries[key] = (now, entry[1])
+            entries.move_to_end(key)
+            return entry[1]
+        self.misses += 1
+        message = read_package(workout_type, data).show_training_info()
+        entries[key] = (now, message)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evicted += 1
+        return message
+
+    def iter_messages(self, packets: Iterable[Packet]
+                      ) -> Iterator[InfoMessage]:
+        """Сообщения для потока пакетов `Packet` в исходном порядке."""
+        get_message = self.get_message
+        for workout_type, data, device, timestamp in packets:
+            yield get_message(workout_type, data, device, timestamp)
+
+    def memory_bytes(self) -> int:
+        """Оценка памяти, занятой записями кэша, в байтах."""
+        size = sys.getsizeof(self._entries)
+        for key, entry in self._entries.items():
+            size += (sys.getsizeof(key) + sys.getsizeof(key[1])
+                     + sys.getsizeof(entry) + sys.getsizeof(entry[1]))
+        return size
+
+    def info(self) -> Dict[str, Any]:
+        """Счётчики попаданий, вытеснений и оценка памяти."""
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evicted': self.evicted, 'expired': self.expired,
+                'size': len(self._entries), 'maxsize': self.maxsize,
+                'memory_bytes': self.memory_bytes()}
+
+    def clear(self) -> None:
+        """Забыть все пакеты, счётчики сохраняются."""
+        self._entries.clear()
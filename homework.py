@@ -1,5 +1,10 @@
+import inspect
+import re
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Type
+from operator import attrgetter
+from typing import (Any, Callable, ClassVar, Dict, Hashable, Iterable, List,
+                    Optional, Tuple, Type)
 
 
 @dataclass
@@ -10,20 +15,251 @@ class InfoMessage():
     distance: float
     speed: float
     calories: float
+    # шаблон сообщения, значения подставляются в порядке полей
+    MESSAGE: ClassVar[str] = ('Тип тренировки: %s; '
+                              'Длительность: %.3f ч.; '
+                              'Дистанция: %.3f км; '
+                              'Ср. скорость: %.3f км/ч; '
+                              'Потрачено ккал: %.3f.')
 
     def get_message(self) -> str:
-        return (f'Тип тренировки: {self.training_type}; '
-                f'Длительность: {self.duration:.3f} ч.; '
-                f'Дистанция: {self.distance:.3f} км; '
-                f'Ср. скорость: {self.speed:.3f} км/ч; '
-                f'Потрачено ккал: {self.calories:.3f}.')
+        return self.MESSAGE % (self.training_type, self.duration,
+                               self.distance, self.speed, self.calories)
 
 
-class Training():
+Metrics = Tuple[Any, Any, Any]
+
+
+class MetricsCache():
+    """LRU-кэш показателей, общий для тренировок с одинаковыми данными.
+
+    Ключ - ядро класса тренировки и значения полей, значение - кортеж
+    `(distance, speed, calories)`, посчитанный этим ядром.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize < 1:
+            raise ValueError('Размер кэша должен быть положительным.')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Metrics]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Metrics]:
+        """Показатели для ключа или `None` при промахе."""
+        entries = self._entries
+        metrics = entries.get(key)
+        if metrics is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entries.move_to_end(key)
+        return metrics
+
+    def add(self, key: Hashable, metrics: Metrics) -> None:
+        """Запомнить показатели, вытеснив самую старую запись."""
+        entries = self._entries
+        entries[key] = metrics
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+    def info(self) -> Dict[str, int]:
+        """Счётчики попаданий и промахов."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._entries), 'maxsize': self.maxsize}
+
+
+_shared_cache: Optional[MetricsCache] = None
+
+
+def enable_shared_cache(maxsize: int = 4096) -> MetricsCache:
+    """Включить общий кэш показателей для одинаковых пакетов."""
+    global _shared_cache
+    _shared_cache = MetricsCache(maxsize)
+    return _shared_cache
+
+
+def disable_shared_cache() -> None:
+    """Выключить общий кэш показателей."""
+    global _shared_cache
+    _shared_cache = None
+
+
+def shared_cache_info() -> Optional[Dict[str, int]]:
+    """Счётчики общего кэша или `None`, если он выключен."""
+    return None if _shared_cache is None else _shared_cache.info()
+
+
+Kernel = Callable[..., Metrics]
+
+# имя константы класса в формуле ядра и любое имя в формуле
+_CONSTANT = re.compile(r'\b[A-Z][A-Z0-9_]*\b')
+_NAME = re.compile(r'\b[A-Za-z_]\w*\b')
+
+# методы-показатели в порядке результатов ядра и их формулы
+KERNEL_METRICS: Tuple[str, ...] = ('get_distance', 'get_mean_speed',
+                                   'get_spent_calories')
+KERNEL_FORMULAS: Tuple[str, ...] = ('DISTANCE_FORMULA', 'SPEED_FORMULA',
+                                    'CALORIES_FORMULA')
+# имена показателей внутри формул
+KERNEL_LOCALS: Tuple[str, ...] = ('distance', 'speed', 'calories')
+
+
+def _read_from_self(formula: str, fields: Tuple[str, ...],
+                    names: Dict[str, str]) -> str:
+    """Формула, в которой поля и константы читаются из `self`."""
+    def replace(match: 're.Match[str]') -> str:
+        name = match.group()
+        if name in names:
+            return names[name]
+        if name in fields or _CONSTANT.fullmatch(name):
+            return f'self.{name}'
+        return name
+
+    return _NAME.sub(replace, formula)
+
+
+def compile_kernel(cls: type) -> Kernel:
+    """Собрать ядро расчёта показателей с подставленными константами.
+
+    Ядро - функция `(action, duration, weight, *extra) -> (distance,
+    speed, calories)` по формулам `*_FORMULA` класса, в которых имена
+    констант заменены их значениями. Порядок операций сохраняется,
+    поэтому результат побитово совпадает с расчётом через атрибуты, а
+    аргументами могут быть и числа, и массивы NumPy. Без формулы калорий
+    вместо них возвращается `None`. `kernel.distance` с теми же
+    аргументами считает только дистанцию - она не делится на
+    длительность и определена и при нулевой.
+
+    Из тех же формул собираются функции от экземпляра, читающие поля и
+    константы из `self`, - так учитываются и свойства, и константы,
+    переопределённые в экземпляре: `kernel.evaluate` считает все
+    показатели сразу, `kernel.inlined` - по одному (нужные `distance` и
+    `speed` вычисляются в той же функции), а `kernel.methods` - цепочкой
+    методов, беря `distance` и `speed` из `get_distance` и
+    `get_mean_speed`. Функции показателей идут в порядке
+    `KERNEL_METRICS`, без формулы калорий последняя - `None`.
+    `kernel.constants` - имена констант, встречающихся в формулах.
+    """
+    def fold(match: 're.Match[str]') -> str:
+        return f'({getattr(cls, match.group())!r})'
+
+    fields = cls.FIELDS
+    formulas = [getattr(cls, name) for name in KERNEL_FORMULAS]
+    folded = [_CONSTANT.sub(fold, formula or 'None')
+              for formula in formulas]
+    attributes = [_read_from_self(formula or 'None', fields, {})
+                  for formula in formulas]
+    calls = {'distance': 'self.get_distance()',
+             'speed': 'self.get_mean_speed()'}
+    arguments = ", ".join(fields)
+    source = (f'def kernel({arguments}):\n'
+              f'    distance = {folded[0]}\n'
+              f'    speed = {folded[1]}\n'
+              f'    calories = {folded[2]}\n'
+              f'    return distance, speed, calories\n'
+              f'def distance({arguments}):\n'
+              f'    return {folded[0]}\n')
+    instance = (f'def evaluate(self):\n'
+                f'    distance = {attributes[0]}\n'
+                f'    speed = {attributes[1]}\n'
+                f'    calories = {attributes[2]}\n'
+                f'    return distance, speed, calories\n')
+    methods = ''
+    for position, name in enumerate(KERNEL_METRICS):
+        formula = formulas[position]
+        if formula is None:
+            continue
+        methods += (f'def {name}(self):\n'
+                    f'    return {_read_from_self(formula, fields, calls)}\n')
+        # промежуточные `distance` и `speed`, от которых зависит формула
+        used = set(_NAME.findall(formula))
+        lines = [f'    return {attributes[position]}\n']
+        for previous in reversed(range(position)):
+            if KERNEL_LOCALS[previous] in used:
+                lines.insert(0, f'    {KERNEL_LOCALS[previous]} = '
+                             f'{attributes[previous]}\n')
+                used.update(_NAME.findall(formulas[previous]))
+        instance += f'def inlined_{name}(self):\n' + ''.join(lines)
+    namespace: Dict[str, Any] = {}
+    exec(compile(source + instance, f'<kernel {cls.__qualname__}>',
+                 'exec'), namespace)
+    chain: Dict[str, Any] = {}
+    exec(compile(methods, f'<methods {cls.__qualname__}>', 'exec'), chain)
+    kernel = namespace['kernel']
+    kernel.__qualname__ = f'{cls.__qualname__}.kernel'
+    kernel.distance = namespace['distance']
+    kernel.evaluate = namespace['evaluate']
+    kernel.inlined = tuple(namespace.get(f'inlined_{name}')
+                           for name in KERNEL_METRICS)
+    kernel.methods = tuple(chain.get(name) for name in KERNEL_METRICS)
+    kernel.constants = frozenset(
+        name for formula in formulas if formula is not None
+        for name in _CONSTANT.findall(formula))
+    kernel.source = source
+    return kernel
+
+
+def kernel_matches_methods(cls: type) -> bool:
+    """Можно ли считать показатели класса ядром из его формул.
+
+    Нельзя, если в классе нет формулы калорий или метод из
+    `KERNEL_METRICS` переопределён: тогда показатели считаются цепочкой
+    методов, как без ядер, а методы, которые не переопределены, -
+    по формулам класса.
+    """
+    return cls.CALORIES_FORMULA is not None and all(
+        getattr(cls, name) is getattr(Training, name)
+        for name in KERNEL_METRICS)
+
+
+def _rebuilds_kernel(name: str) -> bool:
+    return name in KERNEL_METRICS or _CONSTANT.fullmatch(name) is not None
+
+
+class TrainingMeta(type):
+    """Метакласс тренировок: ядро следует за изменениями класса.
+
+    Присваивание или удаление константы класса (имени в верхнем
+    регистре, в том числе формулы и `FIELDS`) или метода-показателя
+    пересобирает ядра класса и его подклассов.
+    """
+
+    def __setattr__(cls, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if _rebuilds_kernel(name):
+            cls.build_kernel()
+
+    def __delattr__(cls, name: str) -> None:
+        super().__delattr__(name)
+        if _rebuilds_kernel(name):
+            cls.build_kernel()
+
+
+def _calories_not_implemented(self: Any) -> float:
+    raise NotImplementedError(f'В классе {self.__class__.__name__} '
+                              'не переопределена функция подсчета '
+                              'каллорий, данный тип тренировки не '
+                              'поддерживается')
+
+
+class Training(metaclass=TrainingMeta):
     """Базовый класс тренировки."""
     HOUR_IN_MIN: int = 60  # константа для перевода часов в минуты
     LEN_STEP: float = 0.65  # константа: длина шага
     M_IN_KM: int = 1000
+    FIELDS: Tuple[str, ...] = ('action', 'duration', 'weight')
+    # формулы показателей: выражения от полей из `FIELDS`, констант
+    # класса и уже посчитанных `distance` и `speed`; по ним собираются и
+    # ядро, и методы-показатели
+    DISTANCE_FORMULA: str = 'action * LEN_STEP / M_IN_KM'
+    SPEED_FORMULA: str = 'distance / duration'
+    CALORIES_FORMULA: Optional[str] = None
+    kernel: ClassVar[Kernel]
+    uses_kernel: ClassVar[bool]
 
     def __init__(self,
                  action: int,
@@ -35,45 +271,226 @@ class Training():
         self.duration = duration
         self.weight = weight
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.build_kernel()
+
+    @classmethod
+    def build_kernel(cls) -> Kernel:
+        """Пересобрать ядро класса по его формулам и константам.
+
+        Вызывается сам при создании класса и при смене его констант или
+        методов-показателей (см. `TrainingMeta`). Ядра подклассов
+        пересобираются тоже, а записи общего кэша со старым ядром больше
+        не используются.
+        """
+        kernel = compile_kernel(cls)
+        cls.kernel = staticmethod(kernel)
+        cls.uses_kernel = kernel_matches_methods(cls)
+        cls._field_values = attrgetter(*cls.FIELDS)
+        cls._constants = kernel.constants
+        cls._evaluate = kernel.evaluate
+        # функции показателей для `get_distance`, `get_mean_speed` и
+        # `get_spent_calories`
+        cls._distance, cls._speed, cls._calories = (
+            kernel.inlined if cls.uses_kernel else kernel.methods)
+        if cls._calories is None:
+            cls._calories = _calories_not_implemented
+        for subclass in cls.__subclasses__():
+            subclass.build_kernel()
+        return kernel
+
+    def get_metrics(self) -> Metrics:
+        """Получить дистанцию, скорость и калории одним расчётом.
+
+        Если класс считает показатели по формулам, они вычисляются за
+        один проход по атрибутам экземпляра (`kernel.evaluate`), иначе
+        вызываются методы-показатели. С общим кэшем показатели для
+        одинаковых полей берутся из него; экземпляры с переопределёнными
+        константами считаются мимо кэша.
+        """
+        if not self.uses_kernel:
+            return (self.get_distance(), self.get_mean_speed(),
+                    self.get_spent_calories())
+        if (_shared_cache is None
+                or not self._constants.isdisjoint(self.__dict__)):
+            return self._evaluate()
+        key = (self.kernel, self._field_values(self))
+        metrics = _shared_cache.get(key)
+        if metrics is None:
+            metrics = self._evaluate()
+            _shared_cache.add(key, metrics)
+        return metrics
+
+    # методы-показатели вызывают функции, собранные по формулам класса
+    # (`kernel.inlined`, а если методы переопределены - `kernel.methods`)
+
     def get_distance(self) -> float:
         """Получить дистанцию в км."""
-        return self.action * self.LEN_STEP / self.M_IN_KM
+        if _shared_cache is not None and self.uses_kernel:
+            return self.get_metrics()[0]
+        return self._distance()
 
     def get_mean_speed(self) -> float:
         """Получить среднюю скорость движения."""
-        return self.get_distance() / self.duration
+        if _shared_cache is not None and self.uses_kernel:
+            return self.get_metrics()[1]
+        return self._speed()
 
-    def get_spent_calories(self):
+    def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
-        raise NotImplementedError(f'В классе {self.__class__.__name__} '
-                                  'не переопределена функция подсчета '
-                                  'каллорий, данный тип тренировки не '
-                                  'поддерживается')
+        if _shared_cache is not None and self.uses_kernel:
+            return self.get_metrics()[2]
+        return self._calories()
 
     def show_training_info(self) -> InfoMessage:
         """Вернуть информационное сообщение о выполненной тренировке."""
+        distance, speed, calories = self.get_metrics()
         return InfoMessage(self.__class__.__name__, self.duration,
-                           self.get_distance(),
-                           self.get_mean_speed(), self.get_spent_calories())
+                           distance, speed, calories)
+
+    def show_lazy_training_info(self) -> 'LazyInfoMessage':
+        """Вернуть сообщение, показатели которого считаются при чтении."""
+        return LazyInfoMessage(self)
+
+
+Training.build_kernel()
+
+
+class _LazyField():
+    """Поле сообщения, которое при первом чтении берётся из тренировки."""
+
+    def __init__(self, method: str) -> None:
+        self.method = method
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, message: Any, owner: Optional[type] = None) -> Any:
+        if message is None:
+            return self
+        # значение кладётся в __dict__ и дальше читается без дескриптора
+        value = message.__dict__[self.name] = getattr(
+            message._training, self.method)()
+        return value
+
+
+# значения полей InfoMessage в порядке объявления
+_message_fields = attrgetter('training_type', 'duration', 'distance',
+                             'speed', 'calories')
+
+
+class LazyInfoMessage(InfoMessage):
+    """Информационное сообщение с отложенным расчётом показателей.
+
+    Хранит ссылку на тренировку и вызывает соответствующий метод при
+    первом чтении поля `distance`, `speed` или `calories`; результат
+    запоминается в экземпляре.
+    """
+    distance = _LazyField('get_distance')
+    speed = _LazyField('get_mean_speed')
+    calories = _LazyField('get_spent_calories')
+
+    def __init__(self, training: Training) -> None:
+        self.training_type = training.__class__.__name__
+        self.duration = training.duration
+        self._training = training
+
+    def __eq__(self, other: object) -> bool:
+        # равно любому InfoMessage с теми же значениями полей; сравнение
+        # читает, а значит и рассчитывает, отложенные поля
+        if not isinstance(other, InfoMessage):
+            return NotImplemented
+        return _message_fields(self) == _message_fields(other)
+
+
+Constructor = Callable[[Iterable[Any]], Training]
+
+# код пакета -> класс тренировки
+WORKOUT_TYPES: Dict[str, Type[Training]] = {}
+
+
+class ConstructorRegistry(Dict[str, Constructor]):
+    """Код пакета -> конструктор с заранее вычисленным числом полей."""
 
+    def __missing__(self, workout_type: str) -> Constructor:
+        raise ValueError(f'Данный тип тренировки "{workout_type}"'
+                         ' не поддерживается.')
 
+
+_CONSTRUCTORS: ConstructorRegistry = ConstructorRegistry()
+
+
+def _make_constructor(code: str, cls: Type[Training]) -> Constructor:
+    arity = len(cls.FIELDS)
+
+    def construct(data: Iterable[Any]) -> Training:
+        try:
+            size = len(data)
+        except TypeError:
+            # генератор или другой итератор без длины читается один раз
+            data = tuple(data)
+            size = len(data)
+        if size != arity:
+            raise TypeError(f'Пакет тренировки "{code}" должен содержать '
+                            f'{arity} полей, получено {size}.')
+        return cls(*data)
+
+    return construct
+
+
+def _check_fields(cls: Type[Training]) -> None:
+    parameters = list(inspect.signature(cls.__init__).parameters)[1:]
+    if tuple(parameters) != cls.FIELDS:
+        raise TypeError(f'Параметры __init__ класса {cls.__name__} '
+                        f'({", ".join(parameters)}) не совпадают с FIELDS '
+                        f'({", ".join(cls.FIELDS)}): дополнительные поля '
+                        'пакета нужно перечислить в FIELDS.')
+
+
+def register_workout(code: str) -> Callable[[Type[Training]],
+                                            Type[Training]]:
+    """Декоратор: зарегистрировать класс тренировки под кодом пакета.
+
+    Поля пакета - это `FIELDS` класса: по ним проверяется число значений
+    в пакете и строится ключ общего кэша. Поэтому `FIELDS` должен
+    перечислять параметры `__init__` в том же порядке, иначе регистрация
+    выбрасывает `TypeError`.
+    """
+    def decorator(cls: Type[Training]) -> Type[Training]:
+        _check_fields(cls)
+        WORKOUT_TYPES[code] = cls
+        _CONSTRUCTORS[code] = _make_constructor(code, cls)
+        return cls
+
+    return decorator
+
+
+def get_constructor(workout_type: str) -> Constructor:
+    """Конструктор тренировки по коду пакета."""
+    return _CONSTRUCTORS[workout_type]
+
+
+@register_workout('RUN')
 class Running(Training):
     """Тренировка: бег."""
     # коэфициенты необходимые для подсчета каллорий потраченных во время бега
     PHYSICAL_ACTIVITY_COEF: int = 18  # коэффициент физической активности
     CALORIE_COEF: int = 20  # еще один коэффициент физической активности
-
-    def get_spent_calories(self) -> float:
-        return ((self.PHYSICAL_ACTIVITY_COEF * self.get_mean_speed()
-                - self.CALORIE_COEF)
-                * self.weight / self.M_IN_KM * self.duration
-                * self.HOUR_IN_MIN)
+    CALORIES_FORMULA: str = ('(PHYSICAL_ACTIVITY_COEF * speed - CALORIE_COEF)'
+                             ' * weight / M_IN_KM * duration * HOUR_IN_MIN')
 
 
+@register_workout('WLK')
 class SportsWalking(Training):
     """Тренировка: спортивная ходьба."""
     ACTIVITY_LEVEL_COEF: float = 0.035  # коэффициент физической активности
     TRAINING_COEF: float = 0.029  # еще один коэффициент физической активности
+    FIELDS: Tuple[str, ...] = Training.FIELDS + ('height',)
+    CALORIES_FORMULA: str = ('(ACTIVITY_LEVEL_COEF * weight'
+                             ' + (speed**2 // height)'
+                             ' * TRAINING_COEF * weight)'
+                             ' * duration * HOUR_IN_MIN')
 
     def __init__(self,
                  action: int,
@@ -83,18 +500,17 @@ class SportsWalking(Training):
         super().__init__(action, duration, weight)
         self.height = height
 
-    def get_spent_calories(self) -> float:
-        return ((self.ACTIVITY_LEVEL_COEF * self.weight
-                + (self.get_mean_speed()**2 // self.height)
-                * self.TRAINING_COEF * self.weight)
-                * self.duration * self.HOUR_IN_MIN)
-
 
+@register_workout('SWM')
 class Swimming(Training):
     """Тренировка: плавание."""
     PHYSICAL_ACTIVITY_COEF: float = 1.1  # коэффициент физической активности
     CALORIE_COEF: int = 2  # еще один коэффициент физической активности
     LEN_STEP: float = 1.38  # константа: расстояние проходимое за один гребок
+    FIELDS: Tuple[str, ...] = Training.FIELDS + ('length_pool', 'count_pool')
+    SPEED_FORMULA: str = '(length_pool * count_pool) / M_IN_KM / duration'
+    CALORIES_FORMULA: str = ('(speed + PHYSICAL_ACTIVITY_COEF)'
+                             ' * CALORIE_COEF * weight')
 
     def __init__(self, action, duration, weight, length_pool: int,
                  count_pool: int, ) -> None:
@@ -102,31 +518,19 @@ class Swimming(Training):
         self.length_pool = length_pool
         self.count_pool = count_pool
 
-    def get_distance(self) -> float:
-        return self.action * self.LEN_STEP / self.M_IN_KM
-
-    def get_mean_speed(self) -> float:
-        return ((self.length_pool * self.count_pool) / self.M_IN_KM
-                / self.duration)
-
-    def get_spent_calories(self) -> float:
-        return ((self.get_mean_speed() + self.PHYSICAL_ACTIVITY_COEF)
-                * self.CALORIE_COEF * self.weight)
-
 
-def read_package(workout_type: str, data: List[int]) -> Any:
+def read_package(workout_type: str, data: Iterable[int]) -> Any:
     """Прочитать данные полученные от датчиков."""
-    trainings_type: Dict[str, Type[Training]] = {
-        'SWM': Swimming,
-        'WLK': SportsWalking,
-        'RUN': Running
-    }
+    # для неизвестного кода реестр выбрасывает ValueError
+    return _CONSTRUCTORS[workout_type](data)
 
-    if workout_type in trainings_type:
-        return trainings_type[workout_type](*data)
 
-    raise ValueError(f'Данный тип тренировки "{workout_type}"'
-                     ' не поддерживается.')
+def read_packages(packages: Iterable[Tuple[str, List[int]]]
+                  ) -> List[Training]:
+    """Прочитать сразу несколько пакетов."""
+    constructors = _CONSTRUCTORS
+    return [constructors[workout_type](data)
+            for workout_type, data in packages]
 
 
 def main(training: Training) -> None:
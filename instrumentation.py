@@ -0,0 +1,213 @@
+"""Необязательная инструментовка горячих участков обработки пакетов.
+
+При включении (`enable`) функции и методы этапов подменяются обёртками,
+которые замеряют время и считают вызовы по этапам и видам тренировок;
+`disable` возвращает исходные объекты, поэтому выключенная инструментовка
+ничего не стоит. Этапы:
+
+* `parse` - разбор строки пакета (`pipeline.parse_record`);
+* `dispatch` - создание тренировки по коду (`read_package`);
+* `metrics` - расчёт дистанции, скорости и калорий
+  (`Training.get_metrics`, через него работает и `show_training_info`).
+  Метод не зависит от ядер классов, поэтому пересборка ядра при
+  включённой инструментовке ничего не ломает, а `disable` не
+  возвращает устаревших ядер;
+* `format` - `InfoMessage.get_message`.
+
+Пакеты с неизвестным кодом тренировки учитываются как отклонённые.
+"""
+import sys
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Deque, Dict, Iterator, List, Tuple
+
+import homework
+
+SAMPLE_SIZE: int = 1024  # сколько последних замеров хранить для перцентилей
+QUANTILES: Tuple[float, ...] = (0.5, 0.9, 0.99)
+# модули, импортирующие `parse_record` под собственным именем
+PARSE_MODULES: Tuple[str, ...] = ('pipeline', 'server')
+# сколько разных неизвестных кодов учитывать отдельно, остальные - в `other`
+MAX_REJECTED_LABELS: int = 256
+
+
+class StageStats():
+    """Счётчик вызовов и времени одного этапа для одного вида тренировки."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.samples: Deque[float] = deque(maxlen=SAMPLE_SIZE)
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.samples.append(elapsed)
+
+    def quantile(self, fraction: float) -> float:
+        """Перцентиль по последним `SAMPLE_SIZE` замерам."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+_stages: Dict[Tuple[str, str], StageStats] = {}
+_rejected: Dict[str, int] = {}
+# (объект, имя атрибута, исходное значение) для восстановления
+_patches: List[Tuple[Any, str, Any]] = []
+
+
+def _record(stage: str, label: str, elapsed: float) -> None:
+    key = (stage, label)
+    stats = _stages.get(key)
+    if stats is None:
+        stats = _stages[key] = StageStats()
+    stats.add(elapsed)
+
+
+def _patch(target: Any, name: str, wrapper: Any) -> None:
+    original = (target.get(name) if isinstance(target, dict)
+                else target.__dict__[name])
+    _patches.append((target, name, original))
+    if isinstance(target, dict):
+        target[name] = wrapper
+    else:
+        setattr(target, name, wrapper)
+
+
+def _timed_parse(parse: Callable) -> Callable:
+    def wrapper(line: str) -> Any:
+        start = perf_counter()
+        package = parse(line)
+        elapsed = perf_counter() - start
+        cls = homework.WORKOUT_TYPES.get(package[0])
+        _record('parse', cls.__name__ if cls else package[0], elapsed)
+        return package
+
+    return wrapper
+
+
+def _timed_constructor(construct: Callable, label: str) -> Callable:
+    def wrapper(data: List[Any]) -> Any:
+        start = perf_counter()
+        training = construct(data)
+        _record('dispatch', label, perf_counter() - start)
+        return training
+
+    return wrapper
+
+
+def _timed_method(method: Callable, stage: str,
+                  label: Callable[[Any], str]) -> Callable:
+    @wraps(method)
+    def wrapper(self: Any) -> Any:
+        start = perf_counter()
+        result = method(self)
+        _record(stage, label(self), perf_counter() - start)
+        return result
+
+    return wrapper
+
+
+def _rejecting_missing(missing: Callable) -> Callable:
+    def wrapper(registry: Any, workout_type: str) -> Any:
+        label = workout_type
+        if label not in _rejected and len(_rejected) >= MAX_REJECTED_LABELS:
+            label = 'other'
+        _rejected[label] = _rejected.get(label, 0) + 1
+        return missing(registry, workout_type)
+
+    return wrapper
+
+
+def is_enabled() -> bool:
+    """Включена ли инструментовка."""
+    return bool(_patches)
+
+
+def enable() -> None:
+    """Подменить функции этапов замеряющими обёртками."""
+    if _patches:
+        return
+    for module_name in PARSE_MODULES:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            _patch(module, 'parse_record', _timed_parse(module.parse_record))
+    constructors = homework._CONSTRUCTORS
+    for code, construct in list(constructors.items()):
+        label = homework.WORKOUT_TYPES[code].__name__
+        _patch(constructors, code, _timed_constructor(construct, label))
+    _patch(homework.ConstructorRegistry, '__missing__', _rejecting_missing(
+        homework.ConstructorRegistry.__missing__))
+    _patch(homework.Training, 'get_metrics', _timed_method(
+        homework.Training.get_metrics, 'metrics',
+        lambda training: training.__class__.__name__))
+    _patch(homework.InfoMessage, 'get_message', _timed_method(
+        homework.InfoMessage.get_message, 'format',
+        lambda message: message.training_type))
+
+
+def disable() -> None:
+    """Вернуть исходные функции и методы."""
+    while _patches:
+        target, name, original = _patches.pop()
+        if isinstance(target, dict):
+            target[name] = original
+        else:
+            setattr(target, name, original)
+
+
+def reset() -> None:
+    """Обнулить накопленную статистику."""
+    _stages.clear()
+    _rejected.clear()
+
+
+@contextmanager
+def instrumented() -> Iterator[None]:
+    """Включить инструментовку на время блока `with`."""
+    enable()
+    try:
+        yield
+    finally:
+        disable()
+
+
+def snapshot() -> Dict[str, Any]:
+    """Снимок статистики: этап -> вид тренировки -> показатели."""
+    stages: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for (stage, label), stats in sorted(_stages.items()):
+        entry = {'count': stats.count, 'total_seconds': stats.total}
+        for fraction in QUANTILES:
+            entry[f'p{fraction * 100:g}'] = stats.quantile(fraction)
+        stages.setdefault(stage, {})[label] = entry
+    return {'stages': stages, 'rejected': dict(_rejected)}
+
+
+def _escape(value: str) -> str:
+    return (value.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def to_prometheus(prefix: str = 'fitness') -> str:
+    """Статистика в текстовом формате экспозиции Prometheus."""
+    lines = [f'# TYPE {prefix}_stage_seconds summary']
+    for (stage, label), stats in sorted(_stages.items()):
+        labels = f'stage="{stage}",workout="{_escape(label)}"'
+        for fraction in QUANTILES:
+            lines.append(f'{prefix}_stage_seconds{{{labels},'
+                         f'quantile="{fraction:g}"}} '
+                         f'{stats.quantile(fraction)!r}')
+        lines.append(f'{prefix}_stage_seconds_sum{{{labels}}} '
+                     f'{stats.total!r}')
+        lines.append(f'{prefix}_stage_seconds_count{{{labels}}} '
+                     f'{stats.count}')
+    lines.append(f'# TYPE {prefix}_rejected_packets_total counter')
+    for workout_type, count in sorted(_rejected.items()):
+        lines.append(f'{prefix}_rejected_packets_total'
+                     f'{{workout_type="{_escape(workout_type)}"}} {count}')
+    lines.append('')
+    return '\n'.join(lines)
@@ -0,0 +1,118 @@
+"""Параллельная обработка архивов пакетов в пуле процессов."""
+import os
+from collections import deque
+from functools import partial
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import (IO, Callable, Iterable, Iterator, List, Optional,
+                    Sequence, TypeVar)
+
+from homework import InfoMessage, read_packages
+from pipeline import DEFAULT_CHUNK_SIZE, Package, iter_packages, write_messages
+from report import Row
+from sharedmem import ResultBuffer, compute_into
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def _chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def compute_rows(packages: Iterable[Package]) -> List[Row]:
+    """Рассчитать показатели пакетов в компактном виде кортежей."""
+    rows = []
+    for training in read_packages(packages):
+        info = training.show_training_info()
+        rows.append((info.training_type, info.duration, info.distance,
+                     info.speed, info.calories))
+    return rows
+
+
+def compute_lines(lines: List[str]) -> List[Row]:
+    """Разобрать строки с пакетами и рассчитать их показатели."""
+    return compute_rows(iter_packages(lines))
+
+
+def ordered_map(executor: Executor, func: Callable[[T], R],
+                chunks: Iterable[T], window: int) -> Iterator[R]:
+    """Выполнить `func` над блоками, сохраняя порядок результатов.
+
+    В работе одновременно находится не более `window` блоков, поэтому
+    входной поток не вычитывается в память целиком.
+    """
+    pending: deque = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(func, chunk))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_rows(packages: Iterable[Package], workers: Optional[int] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              compute: Callable[[List], List[Row]] = compute_rows,
+              ) -> Iterator[Row]:
+    """Распределить пакеты по процессам и вернуть строки результатов.
+
+    Порядок результатов совпадает с порядком входных пакетов.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for rows in ordered_map(executor, compute,
+                                _chunked(packages, chunk_size), workers * 2):
+            yield from rows
+
+
+def compute_shared(packages: Sequence[Package],
+                   workers: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> ResultBuffer:
+    """Рассчитать пакеты в пуле процессов в буфер разделяемой памяти.
+
+    Рабочие процессы записывают показатели в общий `ResultBuffer` по
+    номеру строки и возвращают только количество записанных строк.
+    Буфер нужно закрыть после использования.
+    """
+    workers = workers or os.cpu_count() or 1
+    buffer = ResultBuffer(len(packages))
+    chunks = ((offset, packages[offset:offset + chunk_size])
+              for offset in range(0, len(packages), chunk_size))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for _ in ordered_map(executor,
+                                 partial(compute_into, buffer.name,
+                                         buffer.capacity),
+                                 chunks, workers * 2):
+                pass
+    except BaseException:
+        buffer.close()
+        raise
+    return buffer
+
+
+def iter_messages(packages: Iterable[Package],
+                  workers: Optional[int] = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Параллельный аналог `pipeline.iter_messages`."""
+    for row in iter_rows(packages, workers, chunk_size):
+        yield InfoMessage(*row).get_message()
+
+
+def process_file(path: str, output: IO[str], workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Обработать файл с пакетами в нескольких процессах.
+
+    Разбор строк тоже выполняется в рабочих процессах, родитель только
+    читает файл и записывает сообщения в исходном порядке.
+    """
+    with open(path, encoding='utf-8') as lines:
+        rows = iter_rows(lines, workers, chunk_size, compute_lines)
+        return write_messages((InfoMessage(*row).get_message()
+                               for row in rows), output, chunk_size)
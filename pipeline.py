@@ -0,0 +1,78 @@
+"""Потоковая обработка файлов с пакетами датчиков."""
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Tuple, Union
+
+from homework import read_package
+
+Number = Union[int, float]
+Package = Tuple[str, List[Number]]
+
+DEFAULT_CHUNK_SIZE: int = 1000  # количество сообщений в одной записи
+
+
+def _to_number(value: str) -> Number:
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def parse_record(line: str) -> Package:
+    """Разобрать строку вида `'RUN', [15000, 1, 75]` в пакет."""
+    record = line.strip().rstrip(',').strip()
+    if record.startswith('(') and record.endswith(')'):
+        record = record[1:-1]
+    workout_type, _, data = record.partition(',')
+    data = data.strip()
+    if not data.startswith('[') or not data.endswith(']'):
+        raise ValueError(f'Некорректная запись пакета: {line!r}')
+    return (workout_type.strip().strip('\'"'),
+            [_to_number(value) for value in data[1:-1].split(',')])
+
+
+def iter_packages(lines: Iterable[str]) -> Iterator[Package]:
+    """Построчно разобрать пакеты, пропуская пустые строки и комментарии."""
+    for line in lines:
+        stripped = line.strip()
+        if stripped and not stripped.startswith('#'):
+            yield parse_record(stripped)
+
+
+def iter_messages(packages: Iterable[Package]) -> Iterator[str]:
+    """Превратить поток пакетов в поток информационных сообщений."""
+    for workout_type, data in packages:
+        training = read_package(workout_type, data)
+        yield training.show_training_info().get_message()
+
+
+def write_messages(messages: Iterable[str], output: IO[str],
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Записать сообщения блоками по `chunk_size` строк.
+
+    Возвращает количество записанных сообщений.
+    """
+    if chunk_size < 1:
+        raise ValueError('Размер блока должен быть положительным.')
+    messages = iter(messages)
+    written = 0
+    while True:
+        chunk = list(islice(messages, chunk_size))
+        if not chunk:
+            return written
+        chunk.append('')
+        output.write('\n'.join(chunk))
+        written += len(chunk) - 1
+
+
+def process_stream(lines: Iterable[str], output: IO[str],
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Обработать поток строк с пакетами и записать отчёт в `output`."""
+    return write_messages(iter_messages(iter_packages(lines)), output,
+                          chunk_size)
+
+
+def process_file(path: str, output: IO[str],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Обработать файл с пакетами, не загружая его в память целиком."""
+    with open(path, encoding='utf-8') as lines:
+        return process_stream(lines, output, chunk_size)
@@ -0,0 +1,86 @@
+"""Пакетное формирование отчётов по результатам тренировок."""
+import json
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, Tuple
+
+from homework import InfoMessage
+
+# training_type, duration, distance, speed, calories
+Row = Tuple[str, float, float, float, float]
+
+COLUMNS: Tuple[str, ...] = ('training_type', 'duration', 'distance', 'speed',
+                            'calories')
+
+
+def message_rows(messages: Iterable[InfoMessage]) -> Iterator[Row]:
+    """Представить сообщения в виде кортежей значений полей."""
+    for message in messages:
+        yield (message.training_type, message.duration, message.distance,
+               message.speed, message.calories)
+
+
+def column_rows(training_types: Iterable[str], durations: Any,
+                distances: Any, speeds: Any, calories: Any) -> Iterator[Row]:
+    """Собрать строки из колонок, например из результатов `batch`."""
+    columns = [column.tolist() if hasattr(column, 'tolist') else column
+               for column in (training_types, durations, distances, speeds,
+                              calories)]
+    return zip(*columns)
+
+
+def render_text(rows: Iterable[Row]) -> str:
+    """Текстовый отчёт, совпадающий с выводом `InfoMessage.get_message`."""
+    lines = list(map(InfoMessage.MESSAGE.__mod__, rows))
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def render_csv(rows: Iterable[Row]) -> str:
+    """CSV с заголовком и значениями без округления."""
+    lines = [','.join(COLUMNS)]
+    lines.extend(map('%s,%r,%r,%r,%r'.__mod__, rows))
+    lines.append('')
+    return '\n'.join(lines)
+
+
+JSONL_TEMPLATE: str = ('{"training_type": "%s", "duration": %r, '
+                       '"distance": %r, "speed": %r, "calories": %r}')
+
+
+def render_jsonl(rows: Iterable[Row]) -> str:
+    """JSON Lines: один объект на тренировку.
+
+    Строки собираются по шаблону; если среди значений есть `inf` или
+    `nan`, блок кодируется через `json` (`Infinity`/`NaN`).
+    """
+    rows = list(rows)
+    lines = list(map(JSONL_TEMPLATE.__mod__, rows))
+    lines.append('')
+    text = '\n'.join(lines)
+    if 'inf' in text or 'nan' in text:
+        lines = [json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False)
+                 for row in rows]
+        lines.append('')
+        text = '\n'.join(lines)
+    return text
+
+
+FORMATS: Dict[str, Callable[[Iterable[Row]], str]] = {
+    'text': render_text,
+    'csv': render_csv,
+    'jsonl': render_jsonl,
+}
+
+
+def render(rows: Iterable[Row], fmt: str = 'text') -> str:
+    """Сформировать отчёт в заданном формате."""
+    try:
+        renderer = FORMATS[fmt]
+    except KeyError:
+        raise ValueError(f'Неизвестный формат отчёта "{fmt}".') from None
+    return renderer(rows)
+
+
+def write_report(rows: Iterable[Row], output: IO[str],
+                 fmt: str = 'text') -> None:
+    """Сформировать отчёт в одном буфере и записать его одним вызовом."""
+    output.write(render(rows, fmt))
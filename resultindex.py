@@ -0,0 +1,418 @@
+"""Индекс рассчитанных тренировок для запросов top-K и перцентилей.
+
+Для каждого вида тренировки (и, при заданном `period`, для каждого
+периода, например недели) хранятся:
+
+* min-кучи из `max_k` наибольших значений `distance`, `speed` и
+  `calories` - запрос top-K не зависит от числа тренировок;
+* потоковые квантильные скетчи `QuantileSketch` по тем же полям.
+
+`ShardedIndex` делит индекс на независимые шарды со своими блокировками,
+чтобы его можно было обновлять из нескольких потоков; индексы, собранные
+в разных процессах, объединяются через `merge`.
+"""
+import heapq
+import math
+import threading
+from itertools import count as counter
+from operator import itemgetter
+from typing import (Any, Dict, Hashable, Iterable, List, Optional, Sequence,
+                    Tuple)
+
+from report import Row
+
+# поле -> номер значения в `report.Row`
+METRICS: Dict[str, int] = {'distance': 2, 'speed': 3, 'calories': 4}
+DEFAULT_MAX_K: int = 100
+DEFAULT_RELATIVE_ACCURACY: float = 0.01
+MIN_VALUE: float = 1e-9  # значения меньше по модулю считаются нулём
+
+# (значение, порядковый номер, ключ); номер разрешает равенство значений
+Entry = Tuple[float, int, Hashable]
+GroupKey = Tuple[str, Optional[int]]  # вид тренировки, номер периода
+
+
+class QuantileSketch():
+    """Оценка квантилей с относительной погрешностью (по схеме DDSketch).
+
+    Значения раскладываются по корзинам с границами `gamma ** i`,
+    отрицательные - в отдельные корзины по модулю, поэтому оценка
+    любого квантиля отличается от точного значения не больше чем на
+    `relative_accuracy` от его модуля. Память и время запроса зависят
+    от разброса значений, а не от их количества. Бесконечности (например,
+    скорость при нулевой длительности из `batch.compute_batch`)
+    считаются отдельно и попадают в крайние квантили.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+                 ) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('Точность должна быть в интервале (0, 1).')
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero = 0
+        self.positive_infinity = 0
+        self.negative_infinity = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float) -> None:
+        """Учесть значение; `nan` пропускается."""
+        if MIN_VALUE < value < math.inf:
+            key = self._key(value)
+            self.positive[key] = self.positive.get(key, 0) + 1
+        elif -math.inf < value < -MIN_VALUE:
+            key = self._key(-value)
+            self.negative[key] = self.negative.get(key, 0) + 1
+        elif value == math.inf:
+            self.positive_infinity += 1
+        elif value == -math.inf:
+            self.negative_infinity += 1
+        elif value == value:
+            self.zero += 1
+        else:
+            return
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def add_array(self, values: Any) -> None:
+        """Учесть массив значений разом (нужен NumPy)."""
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return
+        infinite = np.isinf(values)
+        positive_infinity = int(np.count_nonzero(values[infinite] > 0))
+        self.positive_infinity += positive_infinity
+        self.negative_infinity += (int(np.count_nonzero(infinite))
+                                   - positive_infinity)
+        finite = values[~infinite]
+        for buckets, part in ((self.positive, finite[finite > MIN_VALUE]),
+                              (self.negative, -finite[finite < -MIN_VALUE])):
+            keys, counts = np.unique(
+                np.ceil(np.log(part) / self._log_gamma).astype(np.int64),
+                return_counts=True)
+            for key, key_count in zip(keys.tolist(), counts.tolist()):
+                buckets[key] = buckets.get(key, 0) + key_count
+        self.zero += int(np.count_nonzero(np.abs(finite) <= MIN_VALUE))
+        self.count += int(values.size)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Добавить значения другого скетча с той же точностью."""
+        if other.gamma != self.gamma:
+            raise ValueError('Объединять можно скетчи одинаковой точности.')
+        for buckets, other_buckets in ((self.positive, other.positive),
+                                       (self.negative, other.negative)):
+            for key, key_count in other_buckets.items():
+                buckets[key] = buckets.get(key, 0) + key_count
+        self.zero += other.zero
+        self.positive_infinity += other.positive_infinity
+        self.negative_infinity += other.negative_infinity
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, fraction: float) -> float:
+        """Оценка квантиля `fraction` от 0 до 1; для пустого - `nan`."""
+        if not 0 <= fraction <= 1:
+            raise ValueError('Квантиль должен быть от 0 до 1.')
+        if not self.count:
+            return math.nan
+        rank = fraction * (self.count - 1)
+        seen = self.negative_infinity
+        if seen > rank:
+            return -math.inf
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return max(self.min, -self._value(key))
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return min(self.max, self._value(key))
+        return self.max
+
+
+class _Group():
+    """Кучи и скетчи одного вида тренировки за один период."""
+
+    def __init__(self, max_k: int, relative_accuracy: float) -> None:
+        self.count = 0
+        self.heaps: Dict[str, List[Entry]] = {name: [] for name in METRICS}
+        self.sketches = {name: QuantileSketch(relative_accuracy)
+                         for name in METRICS}
+
+
+class WorkoutIndex():
+    """Индекс результатов по видам тренировок и периодам.
+
+    `max_k` - наибольший `k` в запросах top-K. С `period` (в секундах)
+    тренировки с `timestamp` учитываются ещё и по периодам, и запросы
+    можно ограничить периодом, в который попадает заданное время.
+    """
+
+    def __init__(self, max_k: int = DEFAULT_MAX_K,
+                 relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                 period: Optional[float] = None) -> None:
+        if max_k < 1:
+            raise ValueError('max_k должно быть положительным.')
+        self.max_k = max_k
+        self.relative_accuracy = relative_accuracy
+        self.period = period
+        self._groups: Dict[GroupKey, _Group] = {}
+        self._sequence = counter()
+
+    def __len__(self) -> int:
+        return sum(group.count for group in self._groups.values())
+
+    def _bucket(self, timestamp: Optional[float]) -> Optional[int]:
+        if self.period is None or timestamp is None:
+            return None
+        return int(timestamp // self.period)
+
+    def _group(self, training_type: str, bucket: Optional[int]) -> _Group:
+        group = self._groups.get((training_type, bucket))
+        if group is None:
+            group = self._groups[(training_type, bucket)] = _Group(
+                self.max_k, self.relative_accuracy)
+        return group
+
+    def _push(self, heap: List[Entry], value: float,
+              key: Hashable) -> None:
+        if len(heap) < self.max_k:
+            heapq.heappush(heap, (value, next(self._sequence), key))
+        elif value > heap[0][0]:
+            heapq.heapreplace(heap, (value, next(self._sequence), key))
+
+    def add(self, row: Row, key: Hashable = None,
+            timestamp: Optional[float] = None) -> None:
+        """Учесть строку `report.Row`; `key` возвращается в top-K."""
+        group = self._group(row[0], self._bucket(timestamp))
+        group.count += 1
+        for name, position in METRICS.items():
+            value = row[position]
+            if value == value:
+                self._push(group.heaps[name], value, key)
+                group.sketches[name].add(value)
+
+    def add_rows(self, rows: Iterable[Row]) -> None:
+        """Учесть строки без ключей и времени."""
+        for row in rows:
+            self.add(row)
+
+    def add_columns(self, training_types: Sequence[Any], distance: Any,
+                    speed: Any, calories: Any, keys: Any = None,
+                    timestamps: Any = None,
+                    dictionary: Optional[Sequence[str]] = None) -> None:
+        """Учесть колонки результатов, например из `batch.compute_batch`.
+
+        С `dictionary` в `training_types` передаются номера названий в
+        нём, как в `columnar.read_columns`. Строки группируются одной
+        сортировкой, скетчи обновляются векторно, а в кучи попадают
+        только `max_k` лучших значений каждой группы. Без `keys` ключом
+        служит номер строки в колонках.
+        """
+        import numpy as np
+
+        if dictionary is None:
+            names, codes = np.unique(np.asarray(training_types),
+                                     return_inverse=True)
+            dictionary = names.tolist()
+        else:
+            codes = np.asarray(training_types)
+        codes = codes.astype(np.int64).ravel()
+        if not codes.size:
+            return
+        columns = {'distance': np.asarray(distance, dtype=np.float64),
+                   'speed': np.asarray(speed, dtype=np.float64),
+                   'calories': np.asarray(calories, dtype=np.float64)}
+        keys = np.arange(codes.size) if keys is None else np.asarray(keys)
+        groups, first, span = codes, 0, 1
+        periodic = self.period is not None and timestamps is not None
+        if periodic:
+            buckets = np.floor_divide(np.asarray(timestamps, np.float64),
+                                      self.period).astype(np.int64)
+            first = int(buckets.min())
+            span = int(buckets.max()) - first + 1
+            groups = codes * span + (buckets - first)
+        if int(groups.max()) < 1 << 16:
+            # стабильная сортировка 16-битных чисел - поразрядная
+            groups = groups.astype(np.uint16)
+        order = np.argsort(groups, kind='stable')
+        groups = groups[order]
+        starts = np.flatnonzero(np.diff(groups)) + 1
+        bounds = zip([0, *starts.tolist()], [*starts.tolist(), codes.size])
+        keys = keys[order]
+        columns = {name: (column[order], bool(np.isnan(column).any()))
+                   for name, column in columns.items()}
+        for start, stop in bounds:
+            number = int(groups[start])
+            bucket = first + number % span if periodic else None
+            group = self._group(dictionary[number // span], bucket)
+            group.count += stop - start
+            for name, (column, has_nan) in columns.items():
+                values = column[start:stop]
+                values_keys = keys[start:stop]
+                if has_nan:
+                    valid = ~np.isnan(values)
+                    values, values_keys = values[valid], values_keys[valid]
+                group.sketches[name].add_array(values)
+                if values.size > self.max_k:
+                    best = np.argpartition(-values, self.max_k - 1)
+                    best = best[:self.max_k]
+                    values, values_keys = values[best], values_keys[best]
+                heap = group.heaps[name]
+                for value, key in zip(values.tolist(), values_keys.tolist()):
+                    self._push(heap, value, key)
+
+    def merge(self, other: 'WorkoutIndex') -> None:
+        """Добавить данные индекса, собранного отдельно."""
+        if (other.max_k, other.period) != (self.max_k, self.period):
+            raise ValueError('Объединять можно индексы с одинаковыми '
+                             'max_k и period.')
+        for (training_type, bucket), other_group in other._groups.items():
+            group = self._group(training_type, bucket)
+            group.count += other_group.count
+            for name in METRICS:
+                for value, _, key in other_group.heaps[name]:
+                    self._push(group.heaps[name], value, key)
+                group.sketches[name].merge(other_group.sketches[name])
+
+    def _select(self, training_type: Optional[str],
+                timestamp: Optional[float]) -> List[_Group]:
+        bucket = self._bucket(timestamp)
+        return [group for (group_type, group_bucket), group
+                in self._groups.items()
+                if training_type in (None, group_type)
+                and (timestamp is None or group_bucket == bucket)]
+
+    def top(self, metric: str, k: int = 10,
+            training_type: Optional[str] = None,
+            timestamp: Optional[float] = None
+            ) -> List[Tuple[float, Hashable]]:
+        """`k` наибольших значений поля: список `(значение, ключ)`.
+
+        Без `training_type` - по всем видам, с `timestamp` - только за
+        период, в который он попадает.
+        """
+        if metric not in METRICS:
+            raise ValueError(f'Неизвестное поле "{metric}".')
+        if not 0 < k <= self.max_k:
+            raise ValueError(f'k должно быть от 1 до {self.max_k}.')
+        entries = [entry for group in self._select(training_type, timestamp)
+                   for entry in group.heaps[metric]]
+        return [(value, key) for value, _, key
+                in heapq.nlargest(k, entries, key=itemgetter(0))]
+
+    def quantile(self, metric: str, fraction: float,
+                 training_type: Optional[str] = None,
+                 timestamp: Optional[float] = None) -> float:
+        """Оценка квантиля поля, например `0.95` для p95."""
+        if metric not in METRICS:
+            raise ValueError(f'Неизвестное поле "{metric}".')
+        sketch = QuantileSketch(self.relative_accuracy)
+        for group in self._select(training_type, timestamp):
+            sketch.merge(group.sketches[metric])
+        return sketch.quantile(fraction)
+
+    def count(self, training_type: Optional[str] = None,
+              timestamp: Optional[float] = None) -> int:
+        """Количество учтённых тренировок."""
+        return sum(group.count
+                   for group in self._select(training_type, timestamp))
+
+
+class ShardedIndex():
+    """Индекс из нескольких шардов для обновления из разных потоков.
+
+    Строка попадает в шард по `hash(key)`, без ключа - в шард `shard`
+    или по кругу. Запросы объединяют результаты всех шардов.
+    """
+
+    def __init__(self, shards: int = 4, **options: Any) -> None:
+        if shards < 1:
+            raise ValueError('Число шардов должно быть положительным.')
+        self.shards = [WorkoutIndex(**options) for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._next = counter()
+
+    def __len__(self) -> int:
+        return sum(map(len, self.shards))
+
+    def _shard(self, key: Hashable, shard: Optional[int]) -> int:
+        if shard is not None:
+            return shard % len(self.shards)
+        if key is not None:
+            return hash(key) % len(self.shards)
+        return next(self._next) % len(self.shards)
+
+    def add(self, row: Row, key: Hashable = None,
+            timestamp: Optional[float] = None,
+            shard: Optional[int] = None) -> None:
+        """Учесть строку в одном из шардов."""
+        number = self._shard(key, shard)
+        with self._locks[number]:
+            self.shards[number].add(row, key, timestamp)
+
+    def add_rows(self, rows: Iterable[Row],
+                 shard: Optional[int] = None) -> None:
+        """Учесть строки в одном шарде под одной блокировкой."""
+        number = self._shard(None, shard)
+        with self._locks[number]:
+            self.shards[number].add_rows(rows)
+
+    def add_columns(self, training_types: Sequence[Any], distance: Any,
+                    speed: Any, calories: Any, keys: Any = None,
+                    timestamps: Any = None,
+                    dictionary: Optional[Sequence[str]] = None,
+                    shard: Optional[int] = None) -> None:
+        """`WorkoutIndex.add_columns` в одном шарде под одной блокировкой."""
+        number = self._shard(None, shard)
+        with self._locks[number]:
+            self.shards[number].add_columns(training_types, distance, speed,
+                                            calories, keys, timestamps,
+                                            dictionary)
+
+    def merged(self) -> WorkoutIndex:
+        """Объединённая копия всех шардов."""
+        first = self.shards[0]
+        result = WorkoutIndex(first.max_k, first.relative_accuracy,
+                              first.period)
+        for lock, shard in zip(self._locks, self.shards):
+            with lock:
+                result.merge(shard)
+        return result
+
+    def top(self, metric: str, k: int = 10,
+            training_type: Optional[str] = None,
+            timestamp: Optional[float] = None
+            ) -> List[Tuple[float, Hashable]]:
+        """`WorkoutIndex.top` по всем шардам."""
+        return self.merged().top(metric, k, training_type, timestamp)
+
+    def quantile(self, metric: str, fraction: float,
+                 training_type: Optional[str] = None,
+                 timestamp: Optional[float] = None) -> float:
+        """`WorkoutIndex.quantile` по всем шардам."""
+        return self.merged().quantile(metric, fraction, training_type,
+                                      timestamp)
@@ -0,0 +1,180 @@
+"""Сервис приёма пакетов датчиков по TCP или Unix-сокету на asyncio.
+
+Протокол строковый: клиент присылает пакеты в текстовом формате
+`'RUN', [15000, 1, 75]` по одному в строке, сервер отвечает строкой
+`InfoMessage.get_message()` на каждый пакет в том же порядке. Если пакет
+не удалось обработать, ответ начинается с `ERROR: `.
+"""
+import asyncio
+from contextlib import suppress
+from typing import List, Optional, Tuple
+
+from homework import read_package
+from pipeline import parse_record
+
+ERROR_PREFIX: str = 'ERROR: '
+# ответ на запросы, оставшиеся без обработки при остановке обработчика
+STOPPED_RESPONSE: bytes = f'{ERROR_PREFIX}сервер остановлен\n'.encode()
+
+Request = Tuple[bytes, 'asyncio.Future[bytes]']
+
+
+def handle_line(line: bytes) -> bytes:
+    """Обработать одну строку запроса и вернуть строку ответа.
+
+    Любая ошибка пакета, включая `OverflowError` в расчёте, превращается
+    в ответ с `ERROR_PREFIX`, чтобы не остановить общий обработчик.
+    """
+    try:
+        workout_type, data = parse_record(line.decode('utf-8'))
+        message = read_package(workout_type, data).show_training_info()
+        response = message.get_message()
+    except Exception as error:
+        response = f'{ERROR_PREFIX}{error}'
+    return response.encode('utf-8') + b'\n'
+
+
+class PacketServer():
+    """Asyncio-сервер, обрабатывающий пакеты микропакетами.
+
+    Все соединения складывают запросы в общую ограниченную очередь, из
+    которой один обработчик забирает до `max_batch` запросов за раз.
+    Переполненная очередь приостанавливает чтение из сокетов, поэтому
+    медленная обработка не приводит к росту памяти.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765,
+                 path: Optional[str] = None, max_batch: int = 256,
+                 batch_delay: float = 0.0, queue_size: int = 4096,
+                 max_pending: int = 64) -> None:
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_batch = max_batch
+        self.batch_delay = batch_delay
+        self.queue_size = queue_size
+        self.max_pending = max_pending
+        self.processed = 0
+        self.batches = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._worker: Optional['asyncio.Task[None]'] = None
+        self._queue: Optional['asyncio.Queue[Request]'] = None
+
+    @property
+    def address(self) -> str:
+        """Адрес, на котором сервер принимает соединения."""
+        if self.path is not None:
+            return self.path
+        return f'{self.host}:{self.port}'
+
+    async def start(self) -> None:
+        """Открыть сокет и запустить обработчик микропакетов."""
+        self._queue = asyncio.Queue(self.queue_size)
+        self._worker = asyncio.create_task(self._process_batches())
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, self.path)
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Запустить сервер и обслуживать соединения до отмены."""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Закрыть сокет и остановить обработчик."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        pending: 'asyncio.Queue[Optional[asyncio.Future[bytes]]]' = (
+            asyncio.Queue(self.max_pending))
+        responder = asyncio.create_task(self._respond(pending, writer))
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                future = loop.create_future()
+                await self._queue.put((line, future))
+                await pending.put(future)
+        finally:
+            await pending.put(None)
+            await responder
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    async def _respond(pending: 'asyncio.Queue[Optional[asyncio.Future]]',
+                       writer: asyncio.StreamWriter) -> None:
+        # после разрыва соединения ответы дочитываются, но не пишутся,
+        # чтобы не заблокировать чтение запросов на полной очереди
+        connected = True
+        while True:
+            future = await pending.get()
+            if future is None:
+                return
+            response = await future
+            if connected:
+                writer.write(response)
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    connected = False
+
+    async def _process_batches(self) -> None:
+        queue = self._queue
+        batch: List[Request] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                if self.batch_delay and queue.empty():
+                    await asyncio.sleep(self.batch_delay)
+                while len(batch) < self.max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+                for line, future in batch:
+                    if future.done():
+                        continue
+                    try:
+                        response = handle_line(line)
+                    except Exception as error:
+                        response = f'{ERROR_PREFIX}{error}\n'.encode()
+                    future.set_result(response)
+                self.processed += len(batch)
+                self.batches += 1
+        finally:
+            # при остановке отвечаем на принятые запросы ошибкой, чтобы
+            # клиенты не ждали ответа вечно
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(STOPPED_RESPONSE)
+
+
+def serve(host: str = '127.0.0.1', port: int = 8765,
+          path: Optional[str] = None, **options: float) -> None:
+    """Запустить сервер в текущем потоке до прерывания."""
+    server = PacketServer(host, port, path, **options)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
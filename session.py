@@ -0,0 +1,134 @@
+"""Тренировки, собираемые из посекундных отсчётов датчиков.
+
+Новые устройства присылают во время тренировки отсчёты: время в секундах,
+число шагов или гребков с прошлого отсчёта и, для плавания, число
+пройденных бассейнов. `WorkoutSession` хранит только накопленные суммы,
+поэтому отсчёт учитывается за O(1), а `show_training_info` в любой момент
+считает показатели ядром `kernel` класса тренировки без обхода истории.
+"""
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from homework import WORKOUT_TYPES, InfoMessage, Training, get_constructor
+
+SECONDS_IN_HOUR: int = 3600
+# поля пакета, которые накапливаются из отсчётов, а не задаются при старте
+SAMPLE_FIELDS: Tuple[str, ...] = ('action', 'duration', 'count_pool')
+
+
+class WorkoutSession():
+    """Тренировка в процессе: суммы по отсчётам и постоянные параметры.
+
+    Постоянные поля пакета (`weight`, `height`, `length_pool`) задаются
+    при старте, `action` и `count_pool` накапливаются из отсчётов,
+    `duration` - время от первого до последнего отсчёта.
+    """
+    __slots__ = ('workout_type', 'training_class', 'params', 'action',
+                 'count_pool', 'started', 'last', 'samples')
+
+    def __init__(self, workout_type: str, weight: float,
+                 **params: float) -> None:
+        cls = WORKOUT_TYPES.get(workout_type)
+        if cls is None:
+            raise ValueError(f'Данный тип тренировки "{workout_type}"'
+                             ' не поддерживается.')
+        params['weight'] = weight
+        expected = [name for name in cls.FIELDS if name not in SAMPLE_FIELDS]
+        if sorted(params) != sorted(expected):
+            raise TypeError(f'Для тренировки "{workout_type}" нужны '
+                            f'параметры {", ".join(expected)}, получено '
+                            f'{", ".join(params)}.')
+        self.workout_type = workout_type
+        self.training_class = cls
+        self.params = params
+        self.action = 0
+        self.count_pool = 0
+        self.started: Optional[float] = None
+        self.last: Optional[float] = None
+        self.samples = 0
+
+    def add_sample(self, timestamp: float, action: int = 0,
+                   laps: int = 0) -> None:
+        """Учесть отсчёт: время в секундах, шаги или гребки, бассейны."""
+        if self.started is None:
+            self.started = self.last = timestamp
+        elif timestamp > self.last:
+            self.last = timestamp
+        elif timestamp < self.started:
+            self.started = timestamp
+        self.action += action
+        self.count_pool += laps
+        self.samples += 1
+
+    @property
+    def duration(self) -> float:
+        """Длительность в часах от первого до последнего отсчёта."""
+        if self.started is None:
+            return 0.0
+        return (self.last - self.started) / SECONDS_IN_HOUR
+
+    def package(self) -> List[Any]:
+        """Данные пакета для `read_package` по текущим суммам."""
+        values: Dict[str, Any] = dict(self.params, action=self.action,
+                                      duration=self.duration,
+                                      count_pool=self.count_pool)
+        return [values[name] for name in self.training_class.FIELDS]
+
+    def to_training(self) -> Training:
+        """Обычная тренировка с текущими суммами."""
+        return get_constructor(self.workout_type)(self.package())
+
+    def show_training_info(self) -> InfoMessage:
+        """Сообщение о тренировке на текущий момент.
+
+        Пока длительность нулевая, скорость и калории равны нулю.
+        """
+        cls = self.training_class
+        name = cls.__name__
+        if not self.duration:
+            if cls.uses_kernel:
+                distance = cls.kernel.distance(*self.package())
+            else:
+                distance = self.to_training().get_distance()
+            return InfoMessage(name, 0.0, distance, 0.0, 0.0)
+        if not cls.uses_kernel:
+            # показатели заданы методами, а не формулами ядра
+            return self.to_training().show_training_info()
+        distance, speed, calories = cls.kernel(*self.package())
+        return InfoMessage(name, self.duration, distance, speed, calories)
+
+
+class SessionStore():
+    """Одновременные сессии по идентификатору устройства или тренировки."""
+
+    def __init__(self) -> None:
+        self._sessions: Dict[Hashable, WorkoutSession] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._sessions)
+
+    def start(self, session_id: Hashable, workout_type: str, weight: float,
+              **params: float) -> WorkoutSession:
+        """Начать сессию; повторный старт заменяет прежнюю."""
+        session = self._sessions[session_id] = WorkoutSession(
+            workout_type, weight, **params)
+        return session
+
+    def add_sample(self, session_id: Hashable, timestamp: float,
+                   action: int = 0, laps: int = 0) -> None:
+        """Учесть отсчёт сессии."""
+        try:
+            session = self._sessions[session_id]
+        except KeyError:
+            raise KeyError(f'Сессия {session_id!r} не начата.') from None
+        session.add_sample(timestamp, action, laps)
+
+    def info(self, session_id: Hashable) -> InfoMessage:
+        """Сообщение о сессии на текущий момент."""
+        return self._sessions[session_id].show_training_info()
+
+    def finish(self, session_id: Hashable) -> InfoMessage:
+        """Завершить сессию и вернуть итоговое сообщение."""
+        return self._sessions.pop(session_id).show_training_info()
@@ -0,0 +1,164 @@
+"""Колоночный буфер результатов в разделяемой памяти для пула процессов.
+
+Вместо того чтобы возвращать родителю сериализованные `InfoMessage`,
+рабочие процессы подключаются к общему блоку `SharedMemory` по имени и
+записывают показатели прямо в колонки со своего смещения. Родитель
+читает и форматирует результаты из того же блока без копирования.
+
+Блок на `capacity` строк устроен так:
+
+=========== ======= ===============================================
+колонка     тип     содержимое
+=========== ======= ===============================================
+duration    float64 длительность, ч
+distance    float64 дистанция, км
+speed       float64 средняя скорость, км/ч
+calories    float64 потраченные калории
+code        uint8   вид тренировки - индекс в `TRAINING_TYPES`
+=========== ======= ===============================================
+
+Каждый процесс или поток пишет только в свой диапазон строк, поэтому
+блокировки не нужны: запись разных диапазонов не пересекается.
+"""
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from compact import WORKOUT_CODES
+from homework import WORKOUT_TYPES, InfoMessage, read_packages
+from report import Row
+
+COLUMNS: Tuple[str, ...] = ('duration', 'distance', 'speed', 'calories')
+# название вида тренировки по коду из колонки `code`
+TRAINING_TYPES: Tuple[str, ...] = tuple(WORKOUT_TYPES[code].__name__
+                                        for code in WORKOUT_CODES)
+ROW_SIZE: int = 8 * len(COLUMNS) + 1  # байт на строку
+
+Package = Tuple[str, List[Any]]
+
+_TYPE_CODES: Dict[str, int] = {name: code
+                               for code, name in enumerate(TRAINING_TYPES)}
+
+
+class ResultBuffer():
+    """Колонки результатов в блоке `SharedMemory`.
+
+    Без `name` создаёт новый блок, которым владеет этот объект и который
+    удаляется при `close`; с `name` подключается к существующему блоку.
+    Массивы из `as_numpy` ссылаются на общую память, поэтому до `close`
+    их нужно освободить.
+    """
+
+    def __init__(self, capacity: int, name: Optional[str] = None) -> None:
+        if capacity < 0:
+            raise ValueError('Размер буфера не может быть отрицательным.')
+        self.capacity = capacity
+        self._owner = name is None
+        if self._owner:
+            self._memory = SharedMemory(create=True,
+                                        size=max(1, capacity * ROW_SIZE))
+        else:
+            self._memory = SharedMemory(name)
+            if self._memory.size < capacity * ROW_SIZE:
+                self._memory.close()
+                raise ValueError(f'Блок {name} меньше {capacity} строк.')
+        buffer = self._memory.buf
+        width = capacity * 8
+        self._columns = [buffer[index * width:(index + 1) * width].cast('d')
+                         for index in range(len(COLUMNS))]
+        self._codes = buffer[len(COLUMNS) * width:
+                             len(COLUMNS) * width + capacity]
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> 'ResultBuffer':
+        """Подключиться к блоку, созданному в другом процессе."""
+        return cls(capacity, name)
+
+    @property
+    def name(self) -> str:
+        """Имя блока для подключения из других процессов."""
+        return self._memory.name
+
+    def __enter__(self) -> 'ResultBuffer':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.capacity
+
+    def write_rows(self, offset: int, rows: Sequence[Row]) -> int:
+        """Записать строки `report.Row` начиная с `offset`."""
+        count = len(rows)
+        if not 0 <= offset <= self.capacity - count:
+            raise IndexError('Строки не помещаются в буфер.')
+        if not count:
+            return 0
+        training_types, *values = zip(*rows)
+        try:
+            codes = bytes(map(_TYPE_CODES.__getitem__, training_types))
+        except KeyError as error:
+            raise ValueError(f'Неизвестный вид тренировки {error}.') from None
+        stop = offset + count
+        self._codes[offset:stop] = codes
+        for column, column_values in zip(self._columns, values):
+            column[offset:stop] = array('d', column_values)
+        return count
+
+    def write_packages(self, offset: int, packages: Sequence[Package]) -> int:
+        """Рассчитать показатели пакетов и записать их с `offset`."""
+        rows = []
+        for training in read_packages(packages):
+            info = training.show_training_info()
+            rows.append((info.training_type, info.duration, info.distance,
+                         info.speed, info.calories))
+        return self.write_rows(offset, rows)
+
+    def __getitem__(self, index: int) -> Row:
+        if not -self.capacity <= index < self.capacity:
+            raise IndexError('Номер строки вне буфера.')
+        index %= self.capacity
+        return (TRAINING_TYPES[self._codes[index]],
+                *(column[index] for column in self._columns))
+
+    def rows(self, start: int = 0,
+             stop: Optional[int] = None) -> Iterator[Row]:
+        """Строки `[start, stop)` в формате `report.Row`."""
+        names = map(TRAINING_TYPES.__getitem__, self._codes[start:stop])
+        return zip(names, *(column[start:stop] for column in self._columns))
+
+    def __iter__(self) -> Iterator[Row]:
+        return self.rows()
+
+    def iter_messages(self, start: int = 0,
+                      stop: Optional[int] = None) -> Iterator[str]:
+        """Сообщения `InfoMessage.get_message` для строк `[start, stop)`."""
+        return map(InfoMessage.MESSAGE.__mod__, self.rows(start, stop))
+
+    def as_numpy(self) -> Dict[str, Any]:
+        """Колонки в виде массивов NumPy поверх общей памяти."""
+        import numpy as np
+
+        arrays = {name: np.frombuffer(column, dtype=np.float64)
+                  for name, column in zip(COLUMNS, self._columns)}
+        arrays['code'] = np.frombuffer(self._codes, dtype=np.uint8)
+        return arrays
+
+    def close(self) -> None:
+        """Отключиться от блока; владелец также удаляет его."""
+        if self._memory.buf is None:
+            return
+        for view in (*self._columns, self._codes):
+            view.release()
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+def compute_into(name: str, capacity: int,
+                 chunk: Tuple[int, Sequence[Package]]) -> int:
+    """Задача рабочего процесса: рассчитать блок пакетов в общий буфер."""
+    offset, packages = chunk
+    with ResultBuffer.attach(name, capacity) as buffer:
+        return buffer.write_packages(offset, packages)
@@ -2,9 +2,13 @@ import sys
 from pathlib import Path
 from io import StringIO
 
+import pytest
+
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 sys.path.append(str(BASE_DIR))
 
+import homework  # noqa: E402
+
 
 class Capturing(list):
     """
@@ -25,3 +29,31 @@ class Capturing(list):
         self.extend(self._stringio.getvalue().splitlines())
         del self._stringio
         sys.stdout = self._stdout
+
+
+def main_output(packages):
+    """Вывод `homework.main` для каждого пакета, построчно."""
+    with Capturing() as output:
+        for workout_type, data in packages:
+            homework.main(homework.read_package(workout_type, data))
+    return output
+
+
+class CountingWriter(StringIO):
+    """Поток, считающий вызовы `write`."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def write(self, text):
+        self.calls += 1
+        return super().write(text)
+
+
+@pytest.fixture
+def shared_cache():
+    """Общий кэш показателей на два ключа на время теста."""
+    cache = homework.enable_shared_cache(maxsize=2)
+    yield cache
+    homework.disable_shared_cache()
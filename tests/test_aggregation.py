@@ -0,0 +1,74 @@
+import pytest
+
+import homework
+from aggregation import SECONDS_IN_DAY, Totals, WorkoutAggregator
+
+DAY = SECONDS_IN_DAY
+
+
+def info(workout_type, data):
+    return homework.read_package(workout_type, data).show_training_info()
+
+
+@pytest.fixture
+def aggregator():
+    aggregator = WorkoutAggregator(window_days=7)
+    aggregator.add('anna', 0 * DAY + 100, info('RUN', [15000, 1, 75]))
+    aggregator.add('anna', 0 * DAY + 200, info('RUN', [9000, 2, 75]))
+    aggregator.add('anna', 3 * DAY, info('SWM', [720, 1, 80, 25, 40]))
+    aggregator.add('anna', 9 * DAY, info('RUN', [1206, 12, 6]))
+    aggregator.add('boris', 9 * DAY, info('WLK', [9000, 1, 75, 180]))
+    return aggregator
+
+
+def test_daily_totals(aggregator):
+    first = info('RUN', [15000, 1, 75])
+    second = info('RUN', [9000, 2, 75])
+    totals = aggregator.daily('anna', 50, 'Running')
+    assert totals.count == 2
+    assert totals.distance == first.distance + second.distance
+    assert totals.calories == first.calories + second.calories
+    assert totals.mean_speed == pytest.approx(
+        (first.speed * 1 + second.speed * 2) / 3), (
+        'Средняя скорость должна взвешиваться по длительности.'
+    )
+
+
+def test_window_expires_old_days(aggregator):
+    assert aggregator.window('anna', 6 * DAY).count == 3
+    assert aggregator.window('anna', 9 * DAY).count == 2, (
+        'Тренировки старше окна не должны попадать в скользящие итоги.'
+    )
+    assert aggregator.window('anna', 9 * DAY, 1).count == 1
+    assert aggregator.total('anna').count == 4
+    assert aggregator.total('anna', 'Running').count == 3
+
+
+def test_late_workout_outside_window_counts_only_in_total(aggregator):
+    aggregator.add('anna', 1 * DAY, info('RUN', [100, 1, 70]))
+    assert aggregator.window('anna', 9 * DAY, training_type='Running'
+                             ).count == 1
+    assert aggregator.total('anna', 'Running').count == 4
+
+
+def test_unknown_user():
+    assert WorkoutAggregator().total('nobody') == Totals(0, 0.0, 0.0, 0.0,
+                                                         0.0)
+
+
+def test_invalid_period(aggregator):
+    with pytest.raises(ValueError):
+        aggregator.window('anna', 0, 8)
+
+
+def test_snapshot_roundtrip(aggregator, tmp_path):
+    path = str(tmp_path / 'state.json')
+    aggregator.save(path)
+    restored = WorkoutAggregator.load(path)
+    assert restored.last_timestamp == 9 * DAY
+    for user in ('anna', 'boris'):
+        assert restored.total(user) == aggregator.total(user)
+        assert (restored.window(user, 9 * DAY)
+                == aggregator.window(user, 9 * DAY))
+    restored.add('anna', 10 * DAY, info('RUN', [15000, 1, 75]))
+    assert restored.window('anna', 10 * DAY).count == 2
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import batch  # noqa: E402
+import homework  # noqa: E402
+
+
+def random_packages(count, seed=0):
+    rnd = random.Random(seed)
+    packages = []
+    for _ in range(count):
+        workout_type = rnd.choice(['SWM', 'WLK', 'RUN'])
+        data = [rnd.randint(1, 40000), rnd.choice([1, 1.5, 2, 0.75]),
+                rnd.randint(40, 120)]
+        if workout_type == 'WLK':
+            data.append(rnd.randint(140, 210))
+        elif workout_type == 'SWM':
+            data.extend([rnd.randint(10, 50), rnd.randint(1, 80)])
+        packages.append((workout_type, data))
+    return packages
+
+
+@pytest.mark.parametrize('packages', [
+    [('SWM', [720, 1, 80, 25, 40]),
+     ('RUN', [15000, 1, 75]),
+     ('WLK', [9000, 1, 75, 180])],
+    random_packages(2000),
+])
+def test_compute_batch_matches_scalar(packages):
+    result = batch.compute_batch(*batch.packages_to_columns(packages))
+    for index, (workout_type, data) in enumerate(packages):
+        training = homework.read_package(workout_type, data)
+        expected = (training.get_distance(), training.get_mean_speed(),
+                    training.get_spent_calories())
+        actual = (float(result.distance[index]), float(result.speed[index]),
+                  float(result.calories[index]))
+        assert actual == expected, (
+            'Пакетный расчёт должен побитово совпадать со скалярным '
+            f'для пакета {workout_type} {data}.'
+        )
+
+
+def test_compute_batch_unknown_type():
+    columns = batch.packages_to_columns([('RUN', [15000, 1, 75]),
+                                         ('BOX', [1, 1, 1])])
+    with pytest.raises(ValueError):
+        batch.compute_batch(*columns)
+
+
+@pytest.mark.parametrize('package', [
+    ('SWM', [720, 1, 80]),
+    ('RUN', [15000, 1, 75, 180, 3]),
+])
+def test_packages_to_columns_wrong_arity(package):
+    with pytest.raises(TypeError):
+        batch.packages_to_columns([('RUN', [15000, 1, 75]), package])
+
+
+def test_packages_to_columns_width_follows_fields(monkeypatch):
+    class Triathlon(homework.Training):
+        FIELDS = homework.Training.FIELDS + ('swim', 'bike', 'run')
+
+    monkeypatch.setitem(homework.WORKOUT_TYPES, 'TRI', Triathlon)
+    columns = batch.packages_to_columns([('RUN', [15000, 1, 75]),
+                                         ('TRI', [1, 2, 3, 4, 5, 6])])
+    assert len(columns) == 1 + 6, (
+        'Колонок полей должно быть столько, сколько полей у самой '
+        'длинной тренировки.'
+    )
+    assert [column[0] for column in columns[1:]] == [15000, 1, 75, 0, 0, 0]
+
+
+def test_compute_batch_empty():
+    result = batch.compute_batch([], [], [], [])
+    assert result.distance.shape == (0,)
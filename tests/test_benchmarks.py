@@ -0,0 +1,46 @@
+import json
+
+from benchmarks import suite
+
+
+def test_run_suite_covers_all_workouts():
+    results = suite.run_suite(sizes=[5], repeat=1)
+    for workout_type in ('SWM', 'WLK', 'RUN'):
+        for case in ('construct', 'get_spent_calories', 'get_message',
+                     'main'):
+            assert f'{workout_type}/{case}/5' in results, (
+                'Набор бенчмарков должен покрывать все виды тренировок.'
+            )
+    assert all(value > 0 for value in results.values())
+
+
+def test_compare_flags_slowdowns():
+    baseline = {'RUN/main/10': 1.0, 'SWM/main/10': 1.0}
+    current = {'RUN/main/10': 1.05, 'SWM/main/10': 1.5, 'WLK/main/10': 9.0}
+    assert suite.compare(current, baseline, 0.1) == [
+        ('SWM/main/10', 1.0, 1.5)
+    ]
+
+
+def test_main_writes_results_and_compares(tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    output = tmp_path / 'results.json'
+    assert suite.main(['--sizes', '3', '--repeat', '1',
+                       '--output', str(baseline)]) == 0
+    data = json.loads(baseline.read_text(encoding='utf-8'))
+    data['results'] = {name: value / 1000
+                       for name, value in data['results'].items()}
+    baseline.write_text(json.dumps(data), encoding='utf-8')
+    assert suite.main(['--sizes', '3', '--repeat', '1',
+                       '--output', str(output),
+                       '--compare', str(baseline)]) == 1
+
+
+def test_metric_case_times_only_the_method(monkeypatch):
+    case = suite._metric_case([('RUN', [15000, 1, 75])], 'get_distance')
+
+    def forbidden(packages):
+        raise AssertionError('read_packages внутри замера')
+
+    monkeypatch.setattr(suite.homework, 'read_packages', forbidden)
+    case()
@@ -0,0 +1,84 @@
+import pytest
+
+import binformat
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1.5, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = str(tmp_path / 'packages.bin')
+    assert binformat.write_packages(path, PACKAGES * 3000) == 12000
+    return path
+
+
+def test_record_layout():
+    assert binformat.RECORD.size == 24
+    assert binformat.HEADER.size == 16
+
+
+def test_reader_roundtrip(archive):
+    with binformat.PacketReader(archive) as reader:
+        assert len(reader) == 12000
+        assert reader[1] == ('RUN', [15000, 1.0, 75])
+        assert reader[-1] == ('RUN', [1206, 12.0, 6])
+        for (workout_type, data), expected in zip(reader, PACKAGES * 3000):
+            message = homework.read_package(workout_type, data)
+            assert (message.show_training_info().get_message()
+                    == homework.read_package(*expected)
+                    .show_training_info().get_message()), (
+                'Пакеты из архива должны давать те же сообщения.'
+            )
+
+
+def test_reader_index_error(archive):
+    with binformat.PacketReader(archive) as reader:
+        with pytest.raises(IndexError):
+            reader[12000]
+
+
+def test_numpy_view_is_zero_copy(archive):
+    pytest.importorskip('numpy')
+    reader = binformat.PacketReader(archive)
+    records = reader.as_numpy()
+    assert not records.flags.owndata, (
+        'Массив записей должен ссылаться на отображённый файл.'
+    )
+    assert records['action'][1] == 15000
+    del records
+    reader.close()
+
+
+def test_compute_matches_scalar(archive):
+    pytest.importorskip('numpy')
+    with binformat.PacketReader(archive) as reader:
+        result = reader.compute(0, len(PACKAGES))
+    for index, package in enumerate(PACKAGES):
+        training = homework.read_package(*package)
+        assert result.calories[index] == training.get_spent_calories()
+        assert result.distance[index] == training.get_distance()
+
+
+@pytest.mark.parametrize('package, error', [
+    (('BOX', [1, 1, 1]), ValueError),
+    (('RUN', [1, 1, 1, 1]), TypeError),
+    (('RUN', [1, 1, 75.5]), ValueError),
+    (('WLK', [1, 1, 75, 70000]), ValueError),
+])
+def test_writer_rejects_invalid(tmp_path, package, error):
+    with binformat.PacketWriter(str(tmp_path / 'bad.bin')) as writer:
+        with pytest.raises(error):
+            writer.write(*package)
+
+
+def test_reader_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'foreign.bin'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        binformat.PacketReader(str(path))
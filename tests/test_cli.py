@@ -0,0 +1,102 @@
+import json
+import subprocess
+import sys
+
+import pytest
+from conftest import BASE_DIR, main_output
+
+import cli
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+# допустимое время импорта `cli` и обработки текстового файла, секунды
+COLD_START_BUDGET = 0.3
+HEAVY_MODULES = ('numpy', 'asyncio', 'concurrent.futures', 'multiprocessing')
+
+COLD_START = '''
+import sys
+import time
+
+start = time.perf_counter()
+import cli
+code = cli.main(['process', sys.argv[1], '-o', sys.argv[2]])
+elapsed = time.perf_counter() - start
+print(elapsed, code, *[name for name in sys.argv[3:] if name in sys.modules])
+'''
+
+
+@pytest.fixture
+def packages_file(tmp_path):
+    path = tmp_path / 'packages.txt'
+    path.write_text(''.join(f'{workout_type!r}, {data!r}\n'
+                            for workout_type, data in PACKAGES),
+                    encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('options', [[], ['--workers', '2']])
+def test_process_text_matches_main(packages_file, options, capsys):
+    assert cli.main(['process', packages_file, *options]) == 0
+    assert capsys.readouterr().out.splitlines() == main_output(PACKAGES), (
+        'Подкоманда `process` должна выводить то же, что и `main`.'
+    )
+
+
+def test_process_jsonl_to_file(packages_file, tmp_path):
+    output = tmp_path / 'report.jsonl'
+    assert cli.main(['process', packages_file, '-f', 'jsonl',
+                     '-o', str(output)]) == 0
+    lines = output.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['training_type'] for line in lines] == [
+        'Swimming', 'Running', 'SportsWalking']
+
+
+def test_process_columnar_requires_output(packages_file):
+    with pytest.raises(SystemExit):
+        cli.main(['process', packages_file, '-f', 'columnar'])
+
+
+@pytest.mark.parametrize('line, message', [
+    ("'XXX', [1, 2, 3]\n", 'XXX'),
+    ("'WLK', [9000, 1e-300, 75, 180]\n", 'Ошибка'),
+])
+def test_process_reports_bad_packet(tmp_path, capsys, line, message):
+    path = tmp_path / 'bad.txt'
+    path.write_text(line, encoding='utf-8')
+    assert cli.main(['process', str(path)]) == 1
+    assert message in capsys.readouterr().err
+
+
+def test_process_reports_missing_file(tmp_path, capsys):
+    path = tmp_path / 'missing.txt'
+    assert cli.main(['process', str(path)]) == 1
+    assert 'missing.txt' in capsys.readouterr().err, (
+        'Отсутствующий файл должен сообщаться как ошибка, без трассировки.'
+    )
+
+
+def test_bench_unknown_name(capsys):
+    assert cli.main(['bench', 'missing']) == 2
+    assert 'suite' in capsys.readouterr().err
+
+
+def test_cold_start_text_path(packages_file, tmp_path):
+    timings = []
+    for _ in range(3):
+        result = subprocess.run(
+            [sys.executable, '-c', COLD_START, packages_file,
+             str(tmp_path / 'out.txt'), *HEAVY_MODULES],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True)
+        elapsed, code, *loaded = result.stdout.split()
+        assert code == '0'
+        assert loaded == [], (
+            f'Текстовая обработка не должна импортировать {loaded}.'
+        )
+        timings.append(float(elapsed))
+    assert min(timings) < COLD_START_BUDGET, (
+        f'Холодный старт {min(timings):.3f} с превышает бюджет '
+        f'{COLD_START_BUDGET} с.'
+    )
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+import columnar
+import parallel
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [420, 4, 20, 42]),
+] * 3
+ROWS = parallel.compute_rows(PACKAGES)
+
+
+def test_npy_roundtrip(tmp_path):
+    np = pytest.importorskip('numpy')
+    path = str(tmp_path / 'results')
+    written = columnar.write_columns(path, iter(ROWS), row_group_size=4,
+                                     backend='npy')
+    assert written == len(ROWS)
+    columns = columnar.read_columns(path)
+    types = [columns.dictionary[code] for code in columns.training_type]
+    assert types == [row[0] for row in ROWS], (
+        'Вид тренировки должен восстанавливаться по словарному коду.'
+    )
+    for index, name in enumerate(columnar.VALUE_COLUMNS, start=1):
+        np.testing.assert_array_equal(getattr(columns, name),
+                                      [row[index] for row in ROWS])
+    assert isinstance(columns.calories, np.memmap), (
+        'Колонки `npy` должны читаться через отображение в память.'
+    )
+
+
+def test_npy_metadata_row_groups(tmp_path):
+    path = tmp_path / 'results'
+    with columnar.ColumnarWriter(str(path), row_group_size=4,
+                                 backend='npy') as writer:
+        for row in ROWS:
+            writer.write_row(row)
+    metadata = json.loads((path / columnar.METADATA_FILE).read_text())
+    assert metadata['rows'] == len(ROWS)
+    assert metadata['row_groups'] == [4, 4, 4, 3], (
+        'Строки должны записываться группами по `row_group_size`.'
+    )
+    header = (path / 'duration.npy').read_bytes()[:columnar.NPY_HEADER_SIZE]
+    assert header.startswith(columnar.NPY_MAGIC)
+    assert header.endswith(b'\n')
+    assert b"'shape': (15,)" in header
+
+
+def test_empty_npy_export(tmp_path):
+    np = pytest.importorskip('numpy')
+    path = str(tmp_path / 'empty')
+    assert columnar.write_columns(path, [], backend='npy') == 0
+    assert np.load(f'{path}/calories.npy').shape == (0,)
+
+
+def test_unknown_training_type(tmp_path):
+    writer = columnar.ColumnarWriter(str(tmp_path / 'bad'), backend='npy')
+    writer.write_row(('Cycling', 1.0, 2.0, 3.0, 4.0))
+    with pytest.raises(ValueError):
+        writer.flush()
+
+
+def test_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        columnar.ColumnarWriter(str(tmp_path / 'x'), backend='parquet')
+
+
+def test_arrow_roundtrip(tmp_path):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'results.arrow')
+    columnar.write_columns(path, ROWS, row_group_size=4, backend='arrow')
+    columns = columnar.read_columns(path)
+    assert [columns.dictionary[code]
+            for code in columns.training_type] == [row[0] for row in ROWS]
+    assert list(columns.calories) == [row[4] for row in ROWS]
@@ -0,0 +1,62 @@
+import pytest
+
+import compact
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+@pytest.mark.parametrize('workout_type, data', PACKAGES)
+def test_compact_training_matches_homework(workout_type, data):
+    classes = {'SWM': compact.Swimming, 'WLK': compact.SportsWalking,
+               'RUN': compact.Running}
+    training = classes[workout_type](*data)
+    assert not hasattr(training, '__dict__'), (
+        'Компактные классы тренировок должны использовать `__slots__`.'
+    )
+    expected = homework.read_package(workout_type, data).show_training_info()
+    info = training.show_training_info()
+    assert not hasattr(info, '__dict__')
+    assert info.get_message() == expected.get_message()
+
+
+def test_training_batch_roundtrip():
+    batch = compact.TrainingBatch(PACKAGES)
+    assert len(batch) == len(PACKAGES)
+    assert batch.nbytes == len(PACKAGES) * (1 + 5 * 8)
+    for index, (workout_type, data) in enumerate(PACKAGES):
+        expected = homework.read_package(workout_type, data)
+        assert (batch[index].show_training_info().get_message()
+                == expected.show_training_info().get_message())
+
+
+def test_training_batch_unknown_type():
+    with pytest.raises(ValueError):
+        compact.TrainingBatch([('BOX', [1, 1, 1])])
+
+
+@pytest.mark.parametrize('package', [
+    ('SWM', [720, 1, 80]),
+    ('RUN', [15000, 1, 75, 180, 3]),
+    ('WLK', [9000, 1, 75]),
+])
+def test_training_batch_wrong_arity(package):
+    batch = compact.TrainingBatch()
+    with pytest.raises(TypeError):
+        batch.append(*package)
+    assert len(batch) == 0, (
+        'Пакет с неверным числом полей не должен попадать в хранилище.'
+    )
+
+
+def test_training_batch_compute():
+    pytest.importorskip('numpy')
+    result = compact.TrainingBatch(PACKAGES).compute()
+    for index, (workout_type, data) in enumerate(PACKAGES):
+        training = homework.read_package(workout_type, data)
+        assert result.calories[index] == training.get_spent_calories()
@@ -0,0 +1,90 @@
+import pytest
+
+import dedup
+import homework
+
+
+class FakeClock():
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_duplicate_returns_cached_message(monkeypatch):
+    cache = dedup.DedupCache()
+    first = cache.get_message('RUN', [15000, 1, 75], 'watch-1', 100)
+    monkeypatch.setattr(dedup, 'read_package', None)
+    second = cache.get_message('RUN', [15000, 1, 75], 'watch-1', 100)
+    assert second is first, (
+        'Для повторного пакета должно возвращаться сохранённое сообщение '
+        'без нового расчёта.'
+    )
+    assert first == homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info()
+    assert cache.info()['hits'] == 1
+    assert cache.info()['hit_rate'] == 0.5
+
+
+@pytest.mark.parametrize('packet', [
+    ('RUN', [15000, 1, 76], 'watch-1', 100),
+    ('RUN', [15000, 1, 75], 'watch-2', 100),
+    ('RUN', [15000, 1, 75], 'watch-1', 101),
+])
+def test_different_packets_are_not_duplicates(packet):
+    cache = dedup.DedupCache()
+    cache.get_message('RUN', [15000, 1, 75], 'watch-1', 100)
+    cache.get_message(*packet)
+    assert cache.info()['misses'] == 2, (
+        'Пакеты с другими данными, устройством или временем должны '
+        'рассчитываться заново.'
+    )
+
+
+def test_lru_eviction():
+    cache = dedup.DedupCache(maxsize=2)
+    for timestamp in (1, 2, 1, 3, 2):
+        cache.get_message('RUN', [15000, 1, 75], 'watch', timestamp)
+    info = cache.info()
+    assert (info['hits'], info['misses'], info['evicted']) == (1, 4, 2), (
+        'Должны вытесняться давно не встречавшиеся пакеты.'
+    )
+    assert len(cache) == 2
+
+
+def test_window_expiry():
+    clock = FakeClock()
+    cache = dedup.DedupCache(window=10, clock=clock)
+    cache.get_message('RUN', [15000, 1, 75], 'watch', 1)
+    clock.now = 5
+    cache.get_message('RUN', [15000, 1, 75], 'watch', 1)
+    clock.now = 14
+    cache.get_message('RUN', [15000, 1, 75], 'watch', 1)
+    clock.now = 30
+    cache.get_message('WLK', [9000, 1, 75, 180], 'watch', 2)
+    info = cache.info()
+    assert (info['hits'], info['expired'], info['size']) == (2, 1, 1), (
+        'Пакеты, не встречавшиеся дольше окна, должны забываться.'
+    )
+
+
+def test_iter_messages_keeps_order():
+    packets = [
+        ('SWM', [720, 1, 80, 25, 40], 'a', 1),
+        ('RUN', [15000, 1, 75], 'b', 1),
+        ('SWM', [720, 1, 80, 25, 40], 'a', 1),
+    ]
+    cache = dedup.DedupCache()
+    messages = list(cache.iter_messages(packets))
+    assert [message.training_type for message in messages] == [
+        'Swimming', 'Running', 'Swimming']
+    assert messages[0] is messages[2]
+    assert cache.info()['memory_bytes'] > 0
+
+
+def test_invalid_packet_is_not_cached():
+    cache = dedup.DedupCache()
+    with pytest.raises(ValueError):
+        cache.get_message('XXX', [1, 2, 3])
+    assert len(cache) == 0
@@ -0,0 +1,97 @@
+import io
+
+import pytest
+
+import homework
+import instrumentation
+import pipeline
+
+LINES = [
+    "'SWM', [720, 1, 80, 25, 40]\n",
+    "'RUN', [15000, 1, 75]\n",
+    "'RUN', [1206, 12, 6]\n",
+    "'WLK', [9000, 1, 75, 180]\n",
+]
+
+
+@pytest.fixture
+def instrumented():
+    instrumentation.reset()
+    with instrumentation.instrumented():
+        yield
+    instrumentation.reset()
+
+
+def test_disabled_by_default():
+    assert not instrumentation.is_enabled()
+    assert homework.InfoMessage.get_message.__module__ == 'homework'
+
+
+def test_disable_restores_originals():
+    originals = (pipeline.parse_record, dict(homework._CONSTRUCTORS),
+                 homework.Training.get_metrics,
+                 homework.InfoMessage.get_message,
+                 homework.ConstructorRegistry.__missing__)
+    with instrumentation.instrumented():
+        assert instrumentation.is_enabled()
+        assert pipeline.parse_record is not originals[0]
+    assert (pipeline.parse_record, dict(homework._CONSTRUCTORS),
+            homework.Training.get_metrics,
+            homework.InfoMessage.get_message,
+            homework.ConstructorRegistry.__missing__) == originals, (
+        'После выключения должны восстанавливаться исходные функции.'
+    )
+
+
+def test_snapshot_counts_stages(instrumented):
+    pipeline.process_stream(LINES, io.StringIO())
+    stages = instrumentation.snapshot()['stages']
+    for stage in ('parse', 'dispatch', 'metrics', 'format'):
+        assert stages[stage]['Running']['count'] == 2, (
+            f'Этап {stage} должен учитываться по видам тренировок.'
+        )
+        assert stages[stage]['Swimming']['count'] == 1
+        assert stages[stage]['SportsWalking']['count'] == 1
+    entry = stages['dispatch']['Running']
+    assert 0 < entry['p50'] <= entry['p99']
+    assert entry['total_seconds'] > 0
+
+
+def test_metrics_stage_survives_kernel_rebuild(monkeypatch, instrumented):
+    homework.Running(15000, 1, 75).show_training_info()
+    monkeypatch.setattr(homework.Running, 'CALORIE_COEF', 25)
+    info = homework.Running(15000, 1, 75).show_training_info()
+    assert info.calories == 677.25
+    entry = instrumentation.snapshot()['stages']['metrics']['Running']
+    assert entry['count'] == 2, (
+        'Этап metrics должен учитываться и после пересборки ядра.'
+    )
+    assert entry['total_seconds'] > 0
+
+
+def test_disable_keeps_rebuilt_kernel(monkeypatch):
+    with instrumentation.instrumented():
+        monkeypatch.setattr(homework.Running, 'CALORIE_COEF', 25)
+        homework.Running.build_kernel()
+    instrumentation.reset()
+    assert homework.Running(15000, 1, 75).get_spent_calories() == 677.25, (
+        'Выключение инструментовки не должно возвращать устаревшее ядро.'
+    )
+
+
+def test_rejected_packets(instrumented):
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            homework.read_package('BOX', [1, 1, 1])
+    assert instrumentation.snapshot()['rejected'] == {'BOX': 3}
+
+
+def test_to_prometheus(instrumented):
+    pipeline.process_stream(LINES[:1], io.StringIO())
+    with pytest.raises(ValueError):
+        homework.read_package('B"X', [1, 1, 1])
+    text = instrumentation.to_prometheus()
+    assert ('fitness_stage_seconds_count{stage="format",'
+            'workout="Swimming"} 1') in text
+    assert 'quantile="0.99"' in text
+    assert 'fitness_rejected_packets_total{workout_type="B\\"X"} 1' in text
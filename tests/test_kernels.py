@@ -0,0 +1,283 @@
+import random
+
+import pytest
+
+import compact
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [420, 4, 20]),
+    ('WLK', [1206, 12, 6, 12]),
+    ('SWM', [1206, 1.5, 6, 12, 6]),
+]
+
+
+def reference_metrics(training):
+    """Расчёт через атрибуты класса, как до появления ядер."""
+    cls = training.__class__
+    distance = training.action * cls.LEN_STEP / cls.M_IN_KM
+    if cls is homework.Swimming:
+        speed = ((training.length_pool * training.count_pool) / cls.M_IN_KM
+                 / training.duration)
+        calories = ((speed + cls.PHYSICAL_ACTIVITY_COEF)
+                    * cls.CALORIE_COEF * training.weight)
+    else:
+        speed = distance / training.duration
+    if cls is homework.Running:
+        calories = ((cls.PHYSICAL_ACTIVITY_COEF * speed - cls.CALORIE_COEF)
+                    * training.weight / cls.M_IN_KM * training.duration
+                    * cls.HOUR_IN_MIN)
+    elif cls is homework.SportsWalking:
+        calories = ((cls.ACTIVITY_LEVEL_COEF * training.weight
+                    + (speed**2 // training.height)
+                    * cls.TRAINING_COEF * training.weight)
+                    * training.duration * cls.HOUR_IN_MIN)
+    return distance, speed, calories
+
+
+def random_packages(count):
+    rnd = random.Random(1)
+    for _ in range(count):
+        workout_type = rnd.choice(('SWM', 'WLK', 'RUN'))
+        data = [rnd.randint(1, 40000), rnd.uniform(0.1, 5),
+                rnd.randint(40, 120)]
+        if workout_type == 'WLK':
+            data.append(rnd.randint(140, 210))
+        elif workout_type == 'SWM':
+            data.extend([rnd.choice((25, 50)), rnd.randint(1, 80)])
+        yield workout_type, data
+
+
+@pytest.mark.parametrize('workout_type, data', PACKAGES)
+def test_kernel_matches_reference(workout_type, data):
+    training = homework.read_package(workout_type, data)
+    expected = reference_metrics(training)
+    assert training.kernel(*data) == expected, (
+        'Ядро должно побитово совпадать с расчётом через атрибуты.'
+    )
+    assert (training.get_distance(), training.get_mean_speed(),
+            training.get_spent_calories()) == expected
+
+
+def test_kernel_matches_reference_random():
+    for workout_type, data in random_packages(500):
+        training = homework.read_package(workout_type, data)
+        assert training.kernel(*data) == reference_metrics(training), (
+            f'Ядро расходится с расчётом через атрибуты для {data}.'
+        )
+
+
+@pytest.mark.parametrize('cls', [homework.Running, homework.SportsWalking,
+                                 homework.Swimming])
+def test_constants_are_folded(cls):
+    assert 'COEF' not in cls.kernel.source
+    assert 'M_IN_KM' not in cls.kernel.source, (
+        'Константы класса должны подставляться в ядро значениями.'
+    )
+
+
+def test_kernel_rebuilt_for_subclass():
+    class FastRunning(homework.Running):
+        CALORIE_COEF = 10
+
+    assert FastRunning.kernel is not homework.Running.kernel
+    running = homework.Running(15000, 1, 75)
+    fast = FastRunning(15000, 1, 75)
+    assert (fast.get_spent_calories() - running.get_spent_calories()
+            == pytest.approx(10 * 75 / 1000 * 60)), (
+        'Переопределённые коэффициенты должны попадать в ядро подкласса.'
+    )
+
+
+def test_kernel_follows_class_change(monkeypatch):
+    class Walking(homework.SportsWalking):
+        pass
+
+    monkeypatch.setattr(Walking, 'TRAINING_COEF', 0.0)
+    walking = Walking(9000, 1, 75, 1)
+    assert walking.get_spent_calories() == 0.035 * 75 * 60, (
+        'Смена коэффициента класса должна пересобирать ядро.'
+    )
+
+
+def test_kernel_follows_base_class_change(monkeypatch):
+    running = homework.Running(15000, 1, 75)
+    assert running.get_spent_calories() == 699.75
+    monkeypatch.setattr(homework.Running, 'CALORIE_COEF', 25)
+    assert homework.Running(15000, 1, 75).get_spent_calories() == 677.25
+    assert running.get_spent_calories() == 677.25
+    monkeypatch.undo()
+    assert running.get_spent_calories() == 699.75
+
+
+def test_compute_batch_follows_class_change(monkeypatch):
+    pytest.importorskip('numpy')
+    from batch import compute_batch
+
+    monkeypatch.setattr(homework.Running, 'CALORIE_COEF', 25)
+    assert compute_batch(['RUN'], [15000], [1], [75]).calories[0] == 677.25
+
+
+@pytest.mark.parametrize('name, value, expected', [
+    ('LEN_STEP', 1.0, (15.0, 15.0, 1125.0)),
+    ('CALORIE_COEF', 25, (9.75, 9.75, 677.25)),
+])
+def test_instance_constant_override(name, value, expected):
+    running = homework.Running(15000, 1, 75)
+    setattr(running, name, value)
+    assert running.get_metrics() == expected, (
+        'Константа, переопределённая в экземпляре, должна учитываться.'
+    )
+    computed = homework.Running(15000, 1, 75)
+    computed.show_training_info()
+    setattr(computed, name, value)
+    assert computed.get_metrics() == expected, (
+        'Переопределение константы должно сбрасывать запомненные '
+        'показатели.'
+    )
+    delattr(computed, name)
+    assert computed.get_metrics() == (9.75, 9.75, 699.75)
+
+
+def test_metrics_share_one_evaluation(monkeypatch):
+    calls = []
+    evaluate = homework.Running._evaluate
+
+    def counting_evaluate(self):
+        calls.append(self)
+        return evaluate(self)
+
+    monkeypatch.setattr(homework.Running, '_evaluate', counting_evaluate)
+    homework.Running(15000, 1, 75).show_training_info()
+    assert len(calls) == 1, (
+        'Дистанция, скорость и калории должны считаться за один проход.'
+    )
+
+
+def test_kernel_accepts_numpy_arrays():
+    np = pytest.importorskip('numpy')
+    packages = [package for package in random_packages(100)
+                if package[0] == 'WLK']
+    columns = [np.array(column, dtype=np.float64)
+               for column in zip(*(data for _, data in packages))]
+    distance, speed, calories = homework.SportsWalking.kernel(*columns)
+    for index, (_, data) in enumerate(packages):
+        assert (distance[index], speed[index],
+                calories[index]) == homework.SportsWalking.kernel(*data)
+
+
+class Cycling(homework.Training):
+    """Тренировка с переопределённой дистанцией без формулы ядра."""
+
+    def get_distance(self):
+        return self.action * 2.0 / self.M_IN_KM
+
+    def get_spent_calories(self):
+        return self.get_mean_speed() * self.weight
+
+
+class SwimmingLaps(homework.Swimming):
+    """Плавание со скоростью по гребкам, заданной методом."""
+
+    def get_mean_speed(self):
+        return self.get_distance() / self.duration
+
+
+@pytest.mark.parametrize('cls, data, expected', [
+    (Cycling, [1000, 1, 70], (2.0, 2.0, 140.0)),
+    (SwimmingLaps, [1000, 2, 80, 25, 40], (1.38, 0.69, (0.69 + 1.1) * 160)),
+])
+def test_overridden_metric_uses_method_chain(cls, data, expected):
+    training = cls(*data)
+    assert not cls.uses_kernel
+    info = training.show_training_info()
+    assert (info.distance, info.speed, info.calories) == pytest.approx(
+        expected), (
+        'Переопределённый без формулы метод должен использоваться '
+        'остальными показателями, как в цепочке методов.'
+    )
+
+
+def test_override_with_formula_uses_kernel():
+    class LongStepRunning(homework.Running):
+        DISTANCE_FORMULA = 'action * 2.0 / M_IN_KM'
+
+    assert LongStepRunning.uses_kernel
+    training = LongStepRunning(1000, 1, 70)
+    assert training.get_mean_speed() == training.get_distance() == 2.0
+
+
+def test_method_override_of_kernel_class_uses_method():
+    class LongStepRunning(homework.Running):
+        def get_distance(self):
+            return self.action * 2.0 / self.M_IN_KM
+
+    assert not LongStepRunning.uses_kernel
+    training = LongStepRunning(1000, 1, 70)
+    expected = (18 * 2.0 - 20) * 70 / 1000 * 60
+    assert training.get_metrics() == (2.0, 2.0, expected), (
+        'Переопределённый метод должен использоваться вместо формулы '
+        'родителя.'
+    )
+
+
+def test_methods_follow_formulas():
+    for workout_type, data in random_packages(200):
+        training = homework.read_package(workout_type, data)
+        kernel = training.kernel
+        expected = kernel(*data)
+        for functions in (kernel.methods, kernel.inlined):
+            assert tuple(function(training)
+                         for function in functions) == expected, (
+                'Функции показателей и ядро собираются из одних формул.'
+            )
+        assert kernel.evaluate(training) == expected
+
+
+def test_build_kernel_invalidates_caches(monkeypatch, shared_cache):
+    class Walking(homework.SportsWalking):
+        pass
+
+    walking = Walking(9000, 1, 75, 1)
+    before = walking.get_spent_calories()
+    monkeypatch.setattr(Walking, 'TRAINING_COEF', 0.0)
+    Walking.build_kernel()
+    assert walking.get_spent_calories() != before, (
+        'Пересборка ядра должна сбрасывать кэш показателей экземпляра.'
+    )
+    assert Walking(9000, 1, 75, 1).get_spent_calories() == 0.035 * 75 * 60, (
+        'Пересборка ядра должна сбрасывать общий кэш показателей.'
+    )
+
+
+def test_build_kernel_rebuilds_subclasses(monkeypatch):
+    class Walking(homework.SportsWalking):
+        pass
+
+    class SlowWalking(Walking):
+        pass
+
+    kernel = SlowWalking.kernel
+    monkeypatch.setattr(Walking, 'TRAINING_COEF', 0.0)
+    Walking.build_kernel()
+    assert SlowWalking.kernel is not kernel
+    assert SlowWalking(9000, 1, 75, 1).get_spent_calories() == 0.035 * 75 * 60
+
+
+def test_compact_uses_current_kernel(monkeypatch):
+    calls = []
+    kernel = homework.Running.kernel
+
+    def counting_kernel(*fields):
+        calls.append(fields)
+        return kernel(*fields)
+
+    monkeypatch.setattr(homework.Running, 'kernel',
+                        staticmethod(counting_kernel))
+    compact.Running(15000, 1, 75).show_training_info()
+    assert len(calls) == 1, (
+        'Компактные тренировки должны брать ядро из homework при расчёте.'
+    )
@@ -0,0 +1,66 @@
+import dataclasses
+
+import pytest
+
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+@pytest.mark.parametrize('workout_type, data', PACKAGES)
+def test_lazy_message_matches_eager(workout_type, data):
+    training = homework.read_package(workout_type, data)
+    eager = training.show_training_info()
+    lazy = homework.read_package(workout_type, data).show_lazy_training_info()
+    assert isinstance(lazy, homework.InfoMessage)
+    assert lazy.get_message() == eager.get_message(), (
+        'Ленивое сообщение должно совпадать с `show_training_info`.'
+    )
+    assert dataclasses.astuple(lazy) == dataclasses.astuple(eager)
+
+
+def test_lazy_message_equals_eager():
+    training = homework.Running(15000, 1, 75)
+    lazy = training.show_lazy_training_info()
+    eager = training.show_training_info()
+    assert lazy == eager and eager == lazy, (
+        'Ленивое сообщение должно быть равно `show_training_info`.'
+    )
+    assert lazy == training.show_lazy_training_info()
+    assert lazy != homework.Running(15000, 2, 75).show_training_info()
+    assert lazy != dataclasses.astuple(eager)
+
+
+def test_lazy_message_computes_only_requested_fields(monkeypatch):
+    training = homework.read_package('SWM', [720, 1, 80, 25, 40])
+
+    def fail():
+        raise AssertionError('Калории не должны рассчитываться.')
+
+    monkeypatch.setattr(training, 'get_spent_calories', fail)
+    lazy = training.show_lazy_training_info()
+    assert lazy.distance == training.get_distance()
+    assert lazy.training_type == 'Swimming'
+    assert lazy.duration == 1
+    assert 'calories' not in vars(lazy), (
+        'Поле `calories` должно считаться только при обращении.'
+    )
+
+
+def test_lazy_message_caches_fields():
+    training = homework.Running(15000, 1, 75)
+    lazy = training.show_lazy_training_info()
+    calories = lazy.calories
+    training.weight = 90
+    assert lazy.calories == calories
+    assert 'calories' in vars(lazy)
+
+
+def test_lazy_message_unknown_attribute():
+    lazy = homework.Running(15000, 1, 75).show_lazy_training_info()
+    with pytest.raises(AttributeError):
+        lazy.pace
@@ -0,0 +1,74 @@
+import pytest
+
+import homework
+
+
+def test_field_descriptors_are_respected():
+    class HeavyRunning(homework.Running):
+        @property
+        def weight(self):
+            return self._weight
+
+        @weight.setter
+        def weight(self, value):
+            self._weight = value * 2
+
+    running = HeavyRunning(15000, 1, 75)
+    assert running.weight == 150
+    expected = homework.Running(15000, 1, 150)
+    assert (running.get_spent_calories()
+            == expected.get_spent_calories()), (
+        'Показатели должны читать поля через свойства подклассов.'
+    )
+    running.weight = 40
+    assert running.get_spent_calories() == homework.Running(
+        15000, 1, 80).get_spent_calories()
+
+
+@pytest.mark.parametrize('field, value', [
+    ('action', 9000),
+    ('duration', 2),
+    ('weight', 80),
+])
+def test_metrics_follow_field_change(field, value):
+    running = homework.Running(15000, 1, 75)
+    running.get_spent_calories()
+    setattr(running, field, value)
+    expected = homework.Running(
+        **{'action': 15000, 'duration': 1, 'weight': 75, field: value})
+    assert (running.get_spent_calories()
+            == expected.get_spent_calories()), (
+        'Показатели должны пересчитываться при изменении полей.'
+    )
+
+
+def test_metrics_follow_subclass_field_change():
+    swimming = homework.Swimming(720, 1, 80, 25, 40)
+    assert swimming.get_mean_speed() == 1.0
+    swimming.count_pool = 80
+    assert swimming.get_mean_speed() == 2.0
+
+
+def test_shared_cache_hits(shared_cache):
+    first = homework.Running(15000, 1, 75).show_training_info()
+    second = homework.Running(15000, 1, 75).show_training_info()
+    assert first == second
+    assert homework.shared_cache_info() == {
+        'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 2
+    }, 'Одинаковые пакеты должны попадать в общий кэш.'
+
+
+def test_shared_cache_evicts_least_recent(shared_cache):
+    for data in ([1, 1, 1], [2, 1, 1], [1, 1, 1], [3, 1, 1], [2, 1, 1]):
+        homework.Running(*data).get_distance()
+    assert shared_cache.info()['hits'] == 1
+    assert len(shared_cache) == 2
+
+
+def test_shared_cache_disabled_by_default():
+    assert homework.shared_cache_info() is None
+
+
+def test_shared_cache_invalid_size():
+    with pytest.raises(ValueError):
+        homework.MetricsCache(0)
@@ -0,0 +1,41 @@
+import io
+
+import pytest
+from conftest import main_output
+
+import parallel
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [420, 4, 20, 42]),
+] * 7
+
+
+def test_compute_rows_are_compact():
+    rows = parallel.compute_rows(PACKAGES[:3])
+    assert rows[0] == ('Swimming', 1, 0.9935999999999999, 1.0, 336.0), (
+        'Рабочие процессы должны возвращать кортежи с показателями.'
+    )
+
+
+@pytest.mark.parametrize('workers, chunk_size', [(1, 1), (2, 3), (2, 100)])
+def test_iter_messages_matches_main(workers, chunk_size):
+    messages = list(parallel.iter_messages(PACKAGES, workers, chunk_size))
+    assert messages == main_output(PACKAGES), (
+        'Параллельная обработка должна сохранять порядок и формат `main`.'
+    )
+
+
+def test_process_file(tmp_path):
+    path = tmp_path / 'packages.txt'
+    path.write_text(''.join(f'{workout_type!r}, {data!r}\n'
+                            for workout_type, data in PACKAGES),
+                    encoding='utf-8')
+    output = io.StringIO()
+    written = parallel.process_file(str(path), output, workers=2,
+                                    chunk_size=4)
+    assert written == len(PACKAGES)
+    assert output.getvalue().splitlines() == main_output(PACKAGES)
@@ -0,0 +1,69 @@
+import io
+
+import pytest
+from conftest import CountingWriter, main_output
+
+import pipeline
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+LINES = [
+    "'SWM', [720, 1, 80, 25, 40]\n",
+    '("RUN", [15000, 1, 75]),\n',
+    '\n',
+    '# комментарий\n',
+    "'WLK', [9000, 1.0, 75, 180]\n",
+    "'RUN', [1206, 12, 6]",
+]
+
+
+@pytest.mark.parametrize('line, expected', [
+    ("'SWM', [720, 1, 80, 25, 40]", ('SWM', [720, 1, 80, 25, 40])),
+    ("('RUN', [15000, 1.5, 75]),", ('RUN', [15000, 1.5, 75])),
+    ('"WLK", [9000, 1, 75, 180]', ('WLK', [9000, 1, 75, 180])),
+])
+def test_parse_record(line, expected):
+    assert pipeline.parse_record(line) == expected, (
+        'Функция `parse_record` должна возвращать код тренировки '
+        'и список показаний датчиков.'
+    )
+
+
+def test_parse_record_invalid():
+    with pytest.raises(ValueError):
+        pipeline.parse_record("'RUN' 15000, 1, 75")
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 1000])
+def test_process_stream_matches_main(chunk_size):
+    output = io.StringIO()
+    written = pipeline.process_stream(iter(LINES), output, chunk_size)
+    assert written == len(PACKAGES)
+    assert output.getvalue().splitlines() == main_output(PACKAGES), (
+        'Потоковая обработка должна выводить то же, что и `main`.'
+    )
+
+
+def test_write_messages_in_chunks():
+    output = CountingWriter()
+    pipeline.write_messages((str(i) for i in range(10)), output, 4)
+    assert output.calls == 3, 'Сообщения должны записываться блоками.'
+    assert output.getvalue() == ''.join(f'{i}\n' for i in range(10))
+
+
+def test_write_messages_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        pipeline.write_messages([], io.StringIO(), 0)
+
+
+def test_process_file(tmp_path):
+    path = tmp_path / 'packages.txt'
+    path.write_text(''.join(LINES), encoding='utf-8')
+    output = io.StringIO()
+    pipeline.process_file(str(path), output)
+    assert output.getvalue().splitlines() == main_output(PACKAGES)
@@ -0,0 +1,87 @@
+import pytest
+
+import homework
+
+
+@pytest.fixture
+def cycling():
+    @homework.register_workout('BIK')
+    class Cycling(homework.Training):
+        LEN_STEP = 5.5
+
+        def get_spent_calories(self):
+            return self.weight * self.duration
+
+    yield Cycling
+    del homework.WORKOUT_TYPES['BIK']
+    del homework._CONSTRUCTORS['BIK']
+
+
+def test_builtin_workouts_registered():
+    assert homework.WORKOUT_TYPES == {
+        'SWM': homework.Swimming,
+        'WLK': homework.SportsWalking,
+        'RUN': homework.Running,
+    }, 'Встроенные тренировки должны быть зарегистрированы в реестре.'
+
+
+def test_register_workout(cycling):
+    training = homework.read_package('BIK', [1000, 2, 70])
+    assert isinstance(training, cycling), (
+        'Зарегистрированный декоратором класс должен создаваться '
+        '`read_package`.'
+    )
+    assert training.show_training_info().calories == 140
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [15000, 1]),
+    ('WLK', [9000, 1, 75]),
+    ('SWM', [720, 1, 80, 25, 40, 1]),
+])
+def test_read_package_wrong_arity(workout_type, data):
+    with pytest.raises(TypeError):
+        homework.read_package(workout_type, data)
+
+
+def test_read_package_accepts_generator():
+    data = (value for value in [15000, 1, 75])
+    assert homework.read_package('RUN', data).show_training_info() == (
+        homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+    ), 'Пакет из генератора должен читаться так же, как список.'
+    with pytest.raises(TypeError, match='получено 2'):
+        homework.read_package('RUN', iter([15000, 1]))
+
+
+def test_get_constructor():
+    construct = homework.get_constructor('WLK')
+    assert isinstance(construct([9000, 1, 75, 180]), homework.SportsWalking)
+    with pytest.raises(ValueError):
+        homework.get_constructor('BOX')
+
+
+def test_read_packages():
+    packages = [('SWM', [720, 1, 80, 25, 40]), ('RUN', [15000, 1, 75])]
+    trainings = homework.read_packages(packages)
+    assert [type(training) for training in trainings] == [
+        homework.Swimming, homework.Running
+    ]
+
+
+def test_read_packages_unknown_type():
+    with pytest.raises(ValueError, match='BOX'):
+        homework.read_packages([('RUN', [15000, 1, 75]), ('BOX', [1, 1, 1])])
+
+
+def test_register_workout_checks_fields():
+    class Rowing(homework.Training):
+        def __init__(self, action, duration, weight, strokes):
+            super().__init__(action, duration, weight)
+            self.strokes = strokes
+
+    with pytest.raises(TypeError, match='FIELDS'):
+        homework.register_workout('ROW')(Rowing)
+    assert 'ROW' not in homework.WORKOUT_TYPES, (
+        'Класс с параметрами, не указанными в FIELDS, не должен '
+        'регистрироваться.'
+    )
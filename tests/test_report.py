@@ -0,0 +1,78 @@
+import json
+import math
+
+import pytest
+from conftest import CountingWriter
+
+import homework
+import report
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [9000, 1.5, 75, 180]),
+]
+
+
+@pytest.fixture
+def messages():
+    return [homework.read_package(*package).show_training_info()
+            for package in PACKAGES]
+
+
+def test_render_text_matches_get_message(messages):
+    expected = ''.join(message.get_message() + '\n' for message in messages)
+    assert report.render_text(report.message_rows(messages)) == expected, (
+        'Текстовый отчёт должен совпадать с `InfoMessage.get_message`.'
+    )
+
+
+@pytest.mark.parametrize('value', [0.0005, -0.0, 1e300, math.inf, 2.5])
+def test_render_text_float_formatting(value):
+    message = homework.InfoMessage('Running', value, value, value, value)
+    rows = report.message_rows([message])
+    assert report.render_text(rows) == message.get_message() + '\n'
+
+
+def test_column_rows(messages):
+    np = pytest.importorskip('numpy')
+    columns = list(zip(*report.message_rows(messages)))
+    rows = report.column_rows(np.array(columns[0]),
+                              *(np.array(column) for column in columns[1:]))
+    assert report.render_text(rows) == report.render_text(
+        report.message_rows(messages))
+
+
+def test_render_csv(messages):
+    lines = report.render_csv(report.message_rows(messages)).splitlines()
+    assert lines[0] == 'training_type,duration,distance,speed,calories'
+    assert lines[1] == 'Swimming,1,0.9935999999999999,1.0,336.0', (
+        'CSV должен содержать значения без округления.'
+    )
+
+
+def test_render_jsonl(messages):
+    lines = report.render_jsonl(report.message_rows(messages)).splitlines()
+    assert [json.loads(line) for line in lines][1] == {
+        'training_type': 'Running', 'duration': 12,
+        'distance': 0.7838999999999999, 'speed': 0.065325,
+        'calories': -81.32032799999999,
+    }
+
+
+@pytest.mark.parametrize('fmt', ['text', 'csv', 'jsonl'])
+def test_write_report_single_write(messages, fmt):
+    output = CountingWriter()
+    report.write_report(report.message_rows(messages), output, fmt)
+    assert output.calls == 1, 'Отчёт должен записываться одним вызовом.'
+
+
+def test_render_unknown_format(messages):
+    with pytest.raises(ValueError):
+        report.render(report.message_rows(messages), 'xml')
+
+
+def test_render_jsonl_non_finite():
+    rows = [('Running', 1, math.inf, math.nan, 1.0)]
+    line = report.render_jsonl(rows).strip()
+    assert line == json.dumps(dict(zip(report.COLUMNS, rows[0])))
@@ -0,0 +1,267 @@
+import math
+import random
+import threading
+
+import pytest
+
+import resultindex
+
+TYPES = ('Running', 'SportsWalking', 'Swimming')
+
+
+def make_rows(count, seed=0):
+    rnd = random.Random(seed)
+    return [(rnd.choice(TYPES), 1.0, rnd.uniform(0, 20),
+             rnd.uniform(0.5, 15), rnd.uniform(-50, 900))
+            for _ in range(count)]
+
+
+def exact_quantile(values, fraction):
+    values = sorted(values)
+    return values[int(fraction * (len(values) - 1))]
+
+
+@pytest.mark.parametrize('low, high', [(0.001, 1000), (-500, -1), (-50, 900)])
+@pytest.mark.parametrize('fraction', [0, 0.25, 0.5, 0.95, 0.99, 1])
+def test_sketch_relative_accuracy(low, high, fraction):
+    rnd = random.Random(1)
+    values = [rnd.uniform(low, high) for _ in range(5000)]
+    sketch = resultindex.QuantileSketch(0.01)
+    for value in values:
+        sketch.add(value)
+    expected = exact_quantile(values, fraction)
+    assert abs(sketch.quantile(fraction) - expected) <= (
+        0.01 * abs(expected) + 1e-12), (
+        'Оценка квантиля должна отличаться от точной не больше чем на '
+        'относительную погрешность скетча.'
+    )
+
+
+def test_sketch_zero_empty_and_merge():
+    sketch = resultindex.QuantileSketch()
+    assert sketch.quantile(0.5) != sketch.quantile(0.5), (
+        'Для пустого скетча квантиль должен быть nan.'
+    )
+    for value in (0.0, 0.0, 0.0, 5.0):
+        sketch.add(value)
+    sketch.add(float('nan'))
+    assert sketch.count == 4
+    assert sketch.quantile(0.5) == 0.0
+    other = resultindex.QuantileSketch()
+    for value in (5.0,) * 6:
+        other.add(value)
+    sketch.merge(other)
+    assert sketch.count == 10
+    assert sketch.quantile(0.5) == pytest.approx(5.0, rel=0.01)
+    with pytest.raises(ValueError):
+        sketch.merge(resultindex.QuantileSketch(0.05))
+    with pytest.raises(ValueError):
+        sketch.quantile(1.5)
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+def test_sketch_counts_infinities(vectorized):
+    values = [1.0, 2.0, 3.0, math.inf, -math.inf, math.inf]
+    sketch = resultindex.QuantileSketch()
+    if vectorized:
+        sketch.add_array(pytest.importorskip('numpy').array(values))
+    else:
+        for value in values:
+            sketch.add(value)
+    assert sketch.count == 6
+    assert sketch.quantile(0) == -math.inf
+    assert sketch.quantile(1) == math.inf, (
+        'Бесконечные значения должны попадать в крайние квантили.'
+    )
+    assert sketch.quantile(0.4) == pytest.approx(2.0, rel=0.01)
+    other = resultindex.QuantileSketch()
+    other.merge(sketch)
+    assert other.quantile(1) == math.inf
+
+
+def test_add_columns_with_zero_duration():
+    pytest.importorskip('numpy')
+    batch = pytest.importorskip('batch')
+    with pytest.warns(RuntimeWarning):
+        result = batch.compute_batch(['RUN', 'RUN', 'RUN'],
+                                     [15000, 9000, 1000], [1, 0, 2],
+                                     [75, 75, 75])
+    index = resultindex.WorkoutIndex()
+    index.add_columns(['Running'] * 3, *result)
+    assert index.top('speed', 1) == [(math.inf, 1)]
+    assert index.quantile('speed', 1.0) == math.inf
+    assert index.quantile('speed', 0.0) == pytest.approx(
+        result.speed[2], rel=0.01)
+
+
+def test_sketch_add_array_matches_add():
+    np = pytest.importorskip('numpy')
+    values = [row[4] for row in make_rows(3000)] + [0.0]
+    sketch = resultindex.QuantileSketch()
+    for value in values:
+        sketch.add(value)
+    vectorized = resultindex.QuantileSketch()
+    vectorized.add_array(np.array(values + [float('nan')]))
+    assert vectorized.count == sketch.count
+    assert (vectorized.min, vectorized.max) == (sketch.min, sketch.max)
+    for fraction in (0.1, 0.5, 0.9):
+        assert vectorized.quantile(fraction) == pytest.approx(
+            sketch.quantile(fraction), rel=0.021)
+
+
+@pytest.mark.parametrize('metric, position', resultindex.METRICS.items())
+@pytest.mark.parametrize('training_type', [None, *TYPES])
+def test_top_matches_sorting(metric, position, training_type):
+    rows = make_rows(2000)
+    index = resultindex.WorkoutIndex(max_k=50)
+    for number, row in enumerate(rows):
+        index.add(row, key=number)
+    expected = sorted(((row[position], number)
+                       for number, row in enumerate(rows)
+                       if training_type in (None, row[0])),
+                      reverse=True)[:20]
+    assert index.top(metric, 20, training_type) == expected, (
+        'top-K должен совпадать с сортировкой всех результатов.'
+    )
+
+
+def test_quantile_and_count_by_type():
+    rows = make_rows(4000)
+    index = resultindex.WorkoutIndex()
+    index.add_rows(rows)
+    assert len(index) == 4000
+    speeds = [row[3] for row in rows if row[0] == 'Swimming']
+    assert index.count('Swimming') == len(speeds)
+    assert index.quantile('speed', 0.95, 'Swimming') == pytest.approx(
+        exact_quantile(speeds, 0.95), rel=0.01)
+    assert math.isnan(index.quantile('speed', 0.5, 'Unknown'))
+
+
+def test_period_queries():
+    week = 7 * 24 * 3600
+    index = resultindex.WorkoutIndex(period=week)
+    index.add(('Running', 1.0, 5.0, 5.0, 300.0), 'old', timestamp=10)
+    index.add(('Running', 1.0, 5.0, 5.0, 100.0), 'new', timestamp=week + 10)
+    index.add(('Running', 1.0, 5.0, 5.0, 50.0), 'newer', timestamp=week + 20)
+    assert index.top('calories', 5, 'Running', timestamp=week + 100) == [
+        (100.0, 'new'), (50.0, 'newer')], (
+        'С timestamp top-K должен учитывать только его период.'
+    )
+    assert index.top('calories', 1, 'Running') == [(300.0, 'old')]
+    assert index.count('Running', timestamp=5) == 1
+
+
+@pytest.mark.parametrize('arguments', [
+    {'metric': 'pulse'},
+    {'metric': 'speed', 'k': 0},
+    {'metric': 'speed', 'k': 101},
+])
+def test_top_rejects_bad_arguments(arguments):
+    with pytest.raises(ValueError):
+        resultindex.WorkoutIndex().top(**arguments)
+
+
+def test_merge_equals_single_index():
+    rows = make_rows(3000)
+    single = resultindex.WorkoutIndex()
+    first, second = resultindex.WorkoutIndex(), resultindex.WorkoutIndex()
+    for number, row in enumerate(rows):
+        single.add(row, number)
+        (first if number % 2 else second).add(row, number)
+    first.merge(second)
+    assert len(first) == len(single)
+    assert first.top('calories', 100) == single.top('calories', 100)
+    assert first.quantile('distance', 0.9) == single.quantile(
+        'distance', 0.9), (
+        'Объединение индексов должно давать те же ответы, что и один индекс.'
+    )
+    with pytest.raises(ValueError):
+        first.merge(resultindex.WorkoutIndex(max_k=10))
+
+
+def test_add_columns_matches_add():
+    np = pytest.importorskip('numpy')
+    rows = make_rows(5000)
+    timestamps = np.arange(len(rows)) * 60.0
+    by_rows = resultindex.WorkoutIndex(period=3600 * 24)
+    for number, row in enumerate(rows):
+        by_rows.add(row, number, timestamps[number])
+    by_columns = resultindex.WorkoutIndex(period=3600 * 24)
+    types, _, distance, speed, calories = zip(*rows)
+    by_columns.add_columns(types, distance, speed, calories,
+                           timestamps=timestamps)
+    assert len(by_columns) == len(by_rows)
+    for training_type in TYPES:
+        for timestamp in (None, 0, 3600 * 24 * 2):
+            assert by_columns.top('speed', 100, training_type,
+                                  timestamp) == by_rows.top(
+                'speed', 100, training_type, timestamp), (
+                'Колонки и строки должны давать одинаковый top-K.'
+            )
+        assert by_columns.quantile('calories', 0.5, training_type) == (
+            pytest.approx(by_rows.quantile('calories', 0.5, training_type),
+                          rel=0.021))
+
+
+def test_sharded_index_from_threads():
+    rows = make_rows(8000)
+    index = resultindex.ShardedIndex(shards=4, max_k=10)
+    single = resultindex.WorkoutIndex(max_k=10)
+    for number, row in enumerate(rows):
+        single.add(row, number)
+
+    def worker(start):
+        for number in range(start, len(rows), 4):
+            index.add(rows[number], key=number)
+
+    threads = [threading.Thread(target=worker, args=(start,))
+               for start in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(index) == len(rows)
+    assert all(len(shard) for shard in index.shards), (
+        'Строки должны распределяться по всем шардам.'
+    )
+    assert index.top('distance', 10, 'Running') == single.top(
+        'distance', 10, 'Running')
+    assert index.quantile('speed', 0.5) == single.quantile('speed', 0.5)
+
+
+def test_add_columns_with_dictionary_codes():
+    np = pytest.importorskip('numpy')
+    rows = make_rows(1000)
+    by_names = resultindex.WorkoutIndex()
+    types, _, distance, speed, calories = zip(*rows)
+    by_names.add_columns(types, distance, speed, calories)
+    by_codes = resultindex.WorkoutIndex()
+    codes = np.array([TYPES.index(name) for name in types], dtype=np.uint8)
+    by_codes.add_columns(codes, distance, speed, calories,
+                         dictionary=TYPES)
+    for training_type in TYPES:
+        assert by_codes.top('calories', 10, training_type) == by_names.top(
+            'calories', 10, training_type), (
+            'Коды со словарём должны давать те же группы, что и названия.'
+        )
+        assert by_codes.count(training_type) == by_names.count(training_type)
+
+
+def test_sharded_index_add_columns():
+    pytest.importorskip('numpy')
+    rows = make_rows(3000)
+    types, _, distance, speed, calories = zip(*rows)
+    index = resultindex.ShardedIndex(shards=3)
+    for start in range(0, len(rows), 1000):
+        stop = start + 1000
+        index.add_columns(types[start:stop], distance[start:stop],
+                          speed[start:stop], calories[start:stop],
+                          keys=range(start, stop))
+    single = resultindex.WorkoutIndex()
+    single.add_columns(types, distance, speed, calories)
+    assert all(len(shard) == 1000 for shard in index.shards), (
+        'Колонки должны распределяться по шардам.'
+    )
+    assert index.top('calories', 50, 'Running') == single.top(
+        'calories', 50, 'Running')
+    assert index.quantile('speed', 0.5) == single.quantile('speed', 0.5)
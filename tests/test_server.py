@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+import homework
+import server
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+LINES = [f'{workout_type!r}, {data!r}\n'.encode()
+         for workout_type, data in PACKAGES]
+EXPECTED = [homework.read_package(*package).show_training_info().get_message()
+            for package in PACKAGES]
+
+
+async def exchange(packet_server, lines):
+    if packet_server.path is not None:
+        reader, writer = await asyncio.open_unix_connection(
+            packet_server.path)
+    else:
+        reader, writer = await asyncio.open_connection(
+            packet_server.host, packet_server.port)
+    writer.writelines(lines)
+    await writer.drain()
+    writer.write_eof()
+    responses = [line.decode().rstrip('\n') async for line in reader]
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+
+def run_with_server(scenario, **options):
+    async def main():
+        packet_server = server.PacketServer(port=0, **options)
+        await packet_server.start()
+        try:
+            return await scenario(packet_server)
+        finally:
+            await packet_server.close()
+
+    return asyncio.run(main())
+
+
+def test_handle_line():
+    assert server.handle_line(LINES[0]) == EXPECTED[0].encode() + b'\n'
+    assert server.handle_line(b"'BOX', [1, 1, 1]\n").startswith(b'ERROR: ')
+
+
+def test_server_responses_in_order():
+    responses = run_with_server(lambda srv: exchange(srv, LINES * 20),
+                                max_batch=8)
+    assert responses == EXPECTED * 20, (
+        'Сервер должен отвечать сообщениями `get_message` в порядке пакетов.'
+    )
+
+
+def test_server_many_connections_are_batched():
+    async def scenario(packet_server):
+        results = await asyncio.gather(
+            *(exchange(packet_server, LINES) for _ in range(50)))
+        return results, packet_server
+
+    results, packet_server = run_with_server(scenario, batch_delay=0.001)
+    assert all(result == EXPECTED for result in results)
+    assert packet_server.processed == 150
+    assert packet_server.batches < packet_server.processed, (
+        'Пакеты разных соединений должны обрабатываться микропакетами.'
+    )
+
+
+@pytest.mark.parametrize('line', [
+    b"'BOX', [1, 1, 1]\n",
+    b"'RUN', [1, 0, 75]\n",
+    b"'RUN', [1, 1]\n",
+    b"'WLK', [9000, 1e-300, 75, 180]\n",
+    b'garbage\n',
+])
+def test_server_reports_errors(line):
+    responses = run_with_server(lambda srv: exchange(srv, [line, LINES[1]]))
+    assert responses[0].startswith(server.ERROR_PREFIX)
+    assert responses[1] == EXPECTED[1]
+
+
+def test_unix_socket_server(tmp_path):
+    path = str(tmp_path / 'packets.sock')
+    responses = run_with_server(lambda srv: exchange(srv, LINES), path=path)
+    assert responses == EXPECTED
+
+
+def test_handle_line_overflow():
+    response = server.handle_line(b"'WLK', [9000, 1e-300, 75, 180]\n")
+    assert response.startswith(server.ERROR_PREFIX.encode()), (
+        'Переполнение в расчёте должно превращаться в ответ с ошибкой.'
+    )
+
+
+def test_worker_survives_handler_error(monkeypatch):
+    handle_line = server.handle_line
+
+    def flaky_handle_line(line):
+        if line == LINES[0]:
+            raise RuntimeError('сбой обработчика')
+        return handle_line(line)
+
+    monkeypatch.setattr(server, 'handle_line', flaky_handle_line)
+    responses = run_with_server(lambda srv: exchange(srv, LINES))
+    assert responses[0] == f'{server.ERROR_PREFIX}сбой обработчика'
+    assert responses[1:] == EXPECTED[1:], (
+        'Ошибка одного пакета не должна останавливать обработчик.'
+    )
+
+
+def test_stopped_worker_answers_pending_requests():
+    async def scenario(packet_server):
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in LINES]
+        for line, future in zip(LINES, futures):
+            packet_server._queue.put_nowait((line, future))
+        await packet_server.close()
+        return futures
+
+    futures = run_with_server(scenario)
+    assert [future.result() for future in futures] == (
+        [server.STOPPED_RESPONSE] * len(LINES)), (
+        'При остановке обработчика принятые запросы должны получить '
+        'ответ с ошибкой.'
+    )
@@ -0,0 +1,98 @@
+import pytest
+
+import homework
+import session
+
+
+def run_session(workout_type, samples, **params):
+    workout = session.WorkoutSession(workout_type, **params)
+    for sample in samples:
+        workout.add_sample(*sample)
+    return workout
+
+
+@pytest.mark.parametrize('workout_type, params, samples', [
+    ('RUN', {'weight': 75}, [(0, 3), (1, 3), (2, 2), (3600, 14992)]),
+    ('WLK', {'weight': 75, 'height': 180}, [(10, 100), (1810, 8900)]),
+    ('SWM', {'weight': 80, 'length_pool': 25},
+     [(0, 0, 0), (1800, 400, 20), (3600, 320, 20)]),
+])
+def test_session_matches_training(workout_type, params, samples):
+    workout = run_session(workout_type, samples, **params)
+    expected = homework.read_package(
+        workout_type, workout.package()).show_training_info()
+    assert workout.show_training_info() == expected, (
+        'Сообщение сессии должно совпадать с `show_training_info` '
+        'тренировки с теми же суммами.'
+    )
+
+
+def test_swimming_package_from_samples():
+    workout = run_session('SWM', [(0, 0, 0), (1800, 400, 20),
+                                  (3600, 320, 20)],
+                          weight=80, length_pool=25)
+    assert workout.package() == [720, 1.0, 80, 25, 40]
+    assert workout.show_training_info() == homework.read_package(
+        'SWM', [720, 1, 80, 25, 40]).show_training_info()
+
+
+def test_info_is_available_at_any_moment():
+    workout = session.WorkoutSession('RUN', weight=75)
+    assert workout.show_training_info().calories == 0.0
+    workout.add_sample(0, 650)
+    info = workout.show_training_info()
+    assert (info.duration, info.distance) == (0.0, 0.65 * 650 / 1000)
+    workout.add_sample(1800, 650)
+    assert workout.show_training_info().duration == 0.5
+
+
+def test_out_of_order_samples():
+    workout = run_session('RUN', [(100, 1), (50, 1), (3650, 1), (70, 1)],
+                          weight=75)
+    assert (workout.action, workout.duration) == (4, 1.0)
+
+
+@pytest.mark.parametrize('workout_type, params, error', [
+    ('XXX', {'weight': 75}, ValueError),
+    ('WLK', {'weight': 75}, TypeError),
+    ('RUN', {'weight': 75, 'height': 180}, TypeError),
+])
+def test_invalid_session(workout_type, params, error):
+    with pytest.raises(error):
+        session.WorkoutSession(workout_type, **params)
+
+
+def test_session_store():
+    store = session.SessionStore()
+    store.start('a', 'RUN', 75)
+    store.start('b', 'WLK', 75, height=180)
+    for timestamp in range(0, 3601, 60):
+        store.add_sample('a', timestamp, 250)
+        store.add_sample('b', timestamp, 150)
+    assert len(store) == 2
+    assert store.info('a').training_type == 'Running'
+    assert store.finish('b').distance == 150 * 61 * 0.65 / 1000
+    assert list(store) == ['a']
+    with pytest.raises(KeyError):
+        store.add_sample('b', 0, 1)
+
+
+@pytest.fixture
+def long_step_running():
+    @homework.register_workout('LRN')
+    class LongStepRunning(homework.Running):
+        DISTANCE_FORMULA = 'action * 2.0 / M_IN_KM'
+
+    yield LongStepRunning
+    del homework.WORKOUT_TYPES['LRN']
+    del homework._CONSTRUCTORS['LRN']
+
+
+def test_zero_duration_uses_class_distance(long_step_running):
+    workout = session.WorkoutSession('LRN', 75)
+    workout.add_sample(0, action=1000)
+    first = workout.show_training_info().distance
+    workout.add_sample(60)
+    assert first == workout.show_training_info().distance == 2.0, (
+        'Дистанция до второго отсчёта должна считаться по формуле класса.'
+    )
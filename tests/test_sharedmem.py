@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from conftest import main_output
+
+import parallel
+import sharedmem
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [420, 4, 20, 42]),
+] * 7
+
+
+def test_write_and_read_rows():
+    rows = parallel.compute_rows(PACKAGES)
+    with sharedmem.ResultBuffer(len(rows)) as buffer:
+        assert buffer.write_rows(0, rows) == len(rows)
+        assert list(buffer) == rows, (
+            'Строки из буфера должны совпадать с записанными.'
+        )
+        assert buffer[-1] == rows[-1]
+        assert list(buffer.iter_messages()) == main_output(PACKAGES), (
+            'Сообщения из буфера должны совпадать с выводом `main`.'
+        )
+
+
+def test_attach_by_name_sees_writes():
+    with sharedmem.ResultBuffer(len(PACKAGES)) as owner:
+        sharedmem.compute_into(owner.name, owner.capacity, (5, PACKAGES[5:]))
+        sharedmem.compute_into(owner.name, owner.capacity, (0, PACKAGES[:5]))
+        assert list(owner) == parallel.compute_rows(PACKAGES), (
+            'Записи подключённого по имени буфера должны быть видны '
+            'владельцу.'
+        )
+
+
+def test_threads_write_disjoint_ranges():
+    chunks = [(offset, PACKAGES[offset:offset + 3])
+              for offset in range(0, len(PACKAGES), 3)]
+    with sharedmem.ResultBuffer(len(PACKAGES)) as buffer:
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(lambda chunk: buffer.write_packages(*chunk),
+                              chunks))
+        assert list(buffer) == parallel.compute_rows(PACKAGES)
+
+
+@pytest.mark.parametrize('offset, count', [(-1, 1), (0, 3), (2, 1)])
+def test_write_out_of_range(offset, count):
+    rows = parallel.compute_rows(PACKAGES[:count])
+    with sharedmem.ResultBuffer(2) as buffer:
+        with pytest.raises(IndexError):
+            buffer.write_rows(offset, rows)
+
+
+def test_unknown_training_type():
+    with sharedmem.ResultBuffer(1) as buffer:
+        with pytest.raises(ValueError):
+            buffer.write_rows(0, [('Cycling', 1.0, 2.0, 3.0, 4.0)])
+
+
+@pytest.mark.parametrize('workers, chunk_size', [(1, 100), (2, 4)])
+def test_compute_shared_matches_main(workers, chunk_size):
+    buffer = parallel.compute_shared(PACKAGES, workers, chunk_size)
+    try:
+        assert list(buffer.iter_messages()) == main_output(PACKAGES), (
+            'Параллельный расчёт в общую память должен сохранять порядок '
+            'и формат `main`.'
+        )
+    finally:
+        buffer.close()
+
+
+def test_as_numpy_is_view():
+    np = pytest.importorskip('numpy')
+    rows = parallel.compute_rows(PACKAGES[:3])
+    with sharedmem.ResultBuffer(3) as buffer:
+        buffer.write_rows(0, rows)
+        arrays = buffer.as_numpy()
+        np.testing.assert_array_equal(arrays['calories'],
+                                      [row[4] for row in rows])
+        arrays['calories'][0] = 1.5
+        assert buffer[0][4] == 1.5, (
+            'Массивы NumPy должны ссылаться на общую память без копии.'
+        )
+        assert [sharedmem.TRAINING_TYPES[code]
+                for code in arrays['code']] == [row[0] for row in rows]
+        del arrays
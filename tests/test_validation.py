@@ -0,0 +1,79 @@
+import pytest
+
+import homework
+
+np = pytest.importorskip('numpy')
+validation = pytest.importorskip('validation')
+
+VALID = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1.5, 75, 180]),
+]
+
+
+@pytest.mark.parametrize('package, reason', [
+    (('BOX', [1, 1, 1]), validation.UNKNOWN_TYPE),
+    (('RUN', [15000, 1]), validation.WRONG_ARITY),
+    (('SWM', [720, 1, 80, 25]), validation.WRONG_ARITY),
+    (('RUN', [15000, 0, 75]), validation.NON_POSITIVE_DURATION),
+    (('RUN', [15000, -1, 75]), validation.NON_POSITIVE_DURATION),
+    (('RUN', [15000, 1, 0]), validation.NON_POSITIVE_WEIGHT),
+    (('WLK', [9000, 1, 75, 0]), validation.NON_POSITIVE_HEIGHT),
+    (('SWM', [720, 1, 80, 0, 40]), validation.NON_POSITIVE_POOL_LENGTH),
+    (('RUN', [15000, 1, 900]), validation.OUT_OF_RANGE),
+    (('RUN', [-5, 1, 75]), validation.OUT_OF_RANGE),
+    (('WLK', [9000, 1e-300, 75, 180]), validation.OUT_OF_RANGE),
+    (('RUN', [15000, 1 / 7200, 75]), validation.OUT_OF_RANGE),
+    (('RUN', [15000, float('nan'), 75]), validation.INVALID_NUMBER),
+    (('RUN', ['15000', 1, 75]), validation.INVALID_NUMBER),
+    (('RUN', [15000, None, 75]), validation.INVALID_NUMBER),
+    (('RUN', [True, 1, 75]), validation.INVALID_NUMBER),
+    (('RUN', None), validation.WRONG_ARITY),
+    (('RUN', [10**400, 1, 75]), validation.INVALID_NUMBER),
+    (('RUN',), validation.WRONG_ARITY),
+    (('RUN', [15000, 1, 75], 'extra'), validation.WRONG_ARITY),
+    (None, validation.WRONG_ARITY),
+])
+def test_validate_rejects(package, reason):
+    result = validation.validate(VALID + [package] + VALID)
+    assert result.valid == VALID + VALID, (
+        'Корректные пакеты должны проходить проверку.'
+    )
+    assert result.rejected == [validation.Rejected(3, package, reason)], (
+        f'Пакет {package} должен быть отклонён с причиной {reason}.'
+    )
+
+
+def test_valid_packages_do_not_raise():
+    packages = VALID * 100 + [('RUN', [1, 0, 1]), ('WLK', [1, 1, 1, 0])]
+    result = validation.validate(packages)
+    assert len(result.valid) == 300
+    for training in homework.read_packages(result.valid):
+        training.show_training_info()
+    assert [validation.REASONS[code] for code in result.reasons[-2:]] == [
+        validation.NON_POSITIVE_DURATION, validation.NON_POSITIVE_HEIGHT
+    ]
+
+
+def test_packages_at_limits_do_not_raise():
+    shortest = validation.MIN_DURATION
+    packages = [
+        ('RUN', [1_000_000, shortest, 500]),
+        ('WLK', [1_000_000, shortest, 500, 1e-9]),
+        ('SWM', [1_000_000, shortest, 500, 1000, 10_000]),
+    ]
+    result = validation.validate(packages)
+    assert result.valid == packages
+    for training in homework.read_packages(result.valid):
+        training.show_training_info()
+
+
+def test_custom_limits():
+    result = validation.validate(VALID, limits={'weight': (0, 78)})
+    assert [rejected.index for rejected in result.rejected] == [0]
+
+
+def test_validate_empty():
+    result = validation.validate([])
+    assert result.valid == [] and result.rejected == []
@@ -0,0 +1,169 @@
+"""Пакетная предварительная проверка пакетов датчиков на NumPy.
+
+Вместо того чтобы ловить `TypeError`, `ZeroDivisionError` и `ValueError`
+для каждого пакета по отдельности, `validate` проверяет весь блок сразу
+и разделяет его на корректные пакеты и отклонённые с кодом причины.
+Корректные пакеты можно без перехвата исключений передавать в
+`read_package` / `read_packages`.
+"""
+import numbers
+from itertools import chain
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+
+from homework import WORKOUT_TYPES
+
+Package = Tuple[str, List[Any]]
+
+OK = 'ok'
+UNKNOWN_TYPE = 'unknown_type'
+WRONG_ARITY = 'wrong_arity'
+INVALID_NUMBER = 'invalid_number'
+NON_POSITIVE_DURATION = 'non_positive_duration'
+NON_POSITIVE_WEIGHT = 'non_positive_weight'
+NON_POSITIVE_HEIGHT = 'non_positive_height'
+NON_POSITIVE_POOL_LENGTH = 'non_positive_pool_length'
+OUT_OF_RANGE = 'out_of_range'
+
+# номер причины в массиве `ValidationResult.reasons` - индекс в кортеже
+REASONS: Tuple[str, ...] = (
+    OK, UNKNOWN_TYPE, WRONG_ARITY, INVALID_NUMBER, NON_POSITIVE_DURATION,
+    NON_POSITIVE_WEIGHT, NON_POSITIVE_HEIGHT, NON_POSITIVE_POOL_LENGTH,
+    OUT_OF_RANGE,
+)
+# поля, на которые делят формулы, и причина отказа при значении <= 0
+POSITIVE_FIELDS: Dict[str, str] = {
+    'duration': NON_POSITIVE_DURATION,
+    'weight': NON_POSITIVE_WEIGHT,
+    'height': NON_POSITIVE_HEIGHT,
+    'length_pool': NON_POSITIVE_POOL_LENGTH,
+}
+MIN_DURATION: float = 1 / 3600  # одна секунда в часах
+# допустимые значения полей (включительно); с ограниченными действиями и
+# длительностью не меньше секунды скорость в формулах не переполняется
+FIELD_LIMITS: Dict[str, Tuple[float, float]] = {
+    'action': (0, 1_000_000),
+    'duration': (MIN_DURATION, 48),
+    'weight': (0, 500),
+    'height': (0, 300),
+    'length_pool': (0, 1000),
+    'count_pool': (0, 10_000),
+}
+
+
+class Rejected(NamedTuple):
+    """Отклонённый пакет: номер во входном блоке, пакет и причина."""
+    index: int
+    package: Any
+    reason: str
+
+
+class ValidationResult(NamedTuple):
+    """Результат проверки блока пакетов."""
+    valid: List[Package]
+    rejected: List[Rejected]
+    reasons: np.ndarray  # номер причины из `REASONS` для каждого пакета
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def _lengths(datas: List[Any]) -> np.ndarray:
+    try:
+        return np.fromiter(map(len, datas), dtype=np.intp, count=len(datas))
+    except TypeError:
+        return np.array([len(data) if hasattr(data, '__len__') else -1
+                         for data in datas], dtype=np.intp)
+
+
+def _to_matrix(rows: List[Any], reasons: np.ndarray) -> np.ndarray:
+    """Перевести пакеты одной длины в матрицу, отметив нечисловые."""
+    width = len(rows[0])
+    values = list(chain.from_iterable(rows))
+    if set(map(type, values)) <= {int, float}:
+        try:
+            return np.array(values, dtype=np.float64).reshape(-1, width)
+        except OverflowError:
+            pass  # целое вне диапазона float64 - ищем его построчно
+    # медленный путь: только для блоков с нечисловыми значениями
+    matrix = np.empty((len(rows), width), dtype=np.float64)
+    for position, row in enumerate(rows):
+        if all(map(_is_number, row)):
+            try:
+                matrix[position] = row
+                continue
+            except OverflowError:
+                pass
+        matrix[position] = np.nan
+        reasons[position] = REASONS.index(INVALID_NUMBER)
+    return matrix
+
+
+def _check_fields(matrix: np.ndarray, fields: Tuple[str, ...],
+                  reasons: np.ndarray,
+                  limits: Dict[str, Tuple[float, float]]) -> None:
+    def reject(mask: np.ndarray, reason: str) -> None:
+        reasons[mask & (reasons == 0)] = REASONS.index(reason)
+
+    for column, name in enumerate(fields):
+        values = matrix[:, column]
+        reject(~np.isfinite(values), INVALID_NUMBER)
+        if name in POSITIVE_FIELDS:
+            reject(values <= 0, POSITIVE_FIELDS[name])
+        if name in limits:
+            low, high = limits[name]
+            reject((values < low) | (values > high), OUT_OF_RANGE)
+
+
+def validate(packages: Iterable[Package],
+             limits: Dict[str, Tuple[float, float]] = FIELD_LIMITS
+             ) -> ValidationResult:
+    """Проверить блок пакетов и разделить его на корректные и отклонённые.
+
+    Для каждого пакета определяется первая найденная причина отказа:
+    пакет не пара `(код, данные)`, неизвестный код, неверное число полей,
+    нечисловое, бесконечное или не помещающееся во float64 значение,
+    нулевые или отрицательные длительность, вес, рост и длина бассейна,
+    значения вне `limits`. Исключения не выбрасываются.
+    """
+    packages = list(packages)
+    size = len(packages)
+    reasons = np.zeros(size, dtype=np.uint8)
+    if not size:
+        return ValidationResult([], [], reasons)
+    # пакет - пара (код, данные); остальное отклоняется как WRONG_ARITY
+    paired = _lengths(packages) == 2
+    pairs = packages
+    if not paired.all():
+        reasons[~paired] = REASONS.index(WRONG_ARITY)
+        pairs = [package if ok else ('', None)
+                 for package, ok in zip(packages, paired.tolist())]
+    codes_column, datas = zip(*pairs)
+    workout_types = np.array(codes_column, dtype=str)
+
+    codes, inverse = np.unique(workout_types, return_inverse=True)
+    classes = [WORKOUT_TYPES.get(code) for code in codes]
+    arities = np.array([-1 if cls is None else len(cls.FIELDS)
+                        for cls in classes], dtype=np.intp)
+    expected = arities[inverse]
+    reasons[(reasons == 0) & (expected < 0)] = REASONS.index(UNKNOWN_TYPE)
+    reasons[(reasons == 0)
+            & (_lengths(datas) != expected)] = REASONS.index(WRONG_ARITY)
+
+    for position, cls in enumerate(classes):
+        if cls is None:
+            continue
+        index = np.flatnonzero((inverse == position) & (reasons == 0))
+        if not index.size:
+            continue
+        group_reasons = reasons[index]
+        matrix = _to_matrix([datas[row] for row in index], group_reasons)
+        _check_fields(matrix, cls.FIELDS, group_reasons, limits)
+        reasons[index] = group_reasons
+
+    valid = [packages[row] for row in np.flatnonzero(reasons == 0)]
+    rejected = [Rejected(row, packages[row], REASONS[reasons[row]])
+                for row in np.flatnonzero(reasons).tolist()]
+    return ValidationResult(valid, rejected, reasons)